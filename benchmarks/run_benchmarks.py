@@ -0,0 +1,527 @@
+#!/usr/bin/env python
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmark the EPM data clients against the SNMP server and agent
+simulators.
+
+No network is used; the agent simulator listens on localhost. The results
+are written as JSON, so runs can be compared over time.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import types
+import typing
+from unittest.mock import patch
+
+from lsst.ts import epm
+from lsst.ts.xml.component_info import ComponentInfo
+
+DEVICE_TYPES = ["pdu", "scheiderPm5xxx", "xups"]
+
+# The directory with the captures of real devices.
+CAPTURE_DIR = pathlib.Path(__file__).parents[1] / "tests" / "data" / "snmp"
+
+
+class TelemetryTopic:
+    """Telemetry topic that only counts the samples written to it.
+
+    Parameters
+    ----------
+    component_info : `ComponentInfo`
+        The component info derived from the EPM XML files.
+    device_type : `str`
+        The type of SNMP device.
+    """
+
+    def __init__(self, component_info: ComponentInfo, device_type: str) -> None:
+        self.topic_info = component_info.topics[f"tel_{device_type}"]
+        self.num_written = 0
+
+    async def set_write(self, **kwargs: typing.Any) -> None:
+        self.num_written += 1
+
+
+def make_config(device_type: str, **kwargs: typing.Any) -> types.SimpleNamespace:
+    """Make the configuration of a data client, with all defaults applied.
+
+    Parameters
+    ----------
+    device_type : `str`
+        The type of SNMP device.
+    **kwargs : `typing.Any`
+        Configuration items that override the defaults.
+
+    Returns
+    -------
+    types.SimpleNamespace
+        The configuration.
+    """
+    config = dict(
+        host="localhost",
+        device_name=f"Benchmark {device_type}",
+        device_type=device_type,
+        poll_interval=0.0,
+        timing_summary_interval=0.0,
+    )
+    config.update(kwargs)
+    return epm.make_data_client_config(epm.SnmpDataClient, **config)
+
+
+def make_topics(component_info: ComponentInfo) -> types.SimpleNamespace:
+    """Make the telemetry topics of all device types.
+
+    Parameters
+    ----------
+    component_info : `ComponentInfo`
+        The component info derived from the EPM XML files.
+
+    Returns
+    -------
+    types.SimpleNamespace
+        The telemetry topics.
+    """
+    return types.SimpleNamespace(
+        **{
+            f"tel_{device_type}": TelemetryTopic(component_info, device_type)
+            for device_type in DEVICE_TYPES
+        }
+    )
+
+
+def time_call(func: typing.Callable[[], typing.Any], repeat: int) -> dict[str, float]:
+    """Time a function call a number of times.
+
+    Parameters
+    ----------
+    func : `typing.Callable`
+        The function to call.
+    repeat : `int`
+        The number of calls.
+
+    Returns
+    -------
+    dict[str, float]
+        The minimum, median and maximum duration [s] of the calls.
+    """
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start_time)
+    return {
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "max": max(durations),
+    }
+
+
+def benchmark_mib_tree_holder(repeat: int) -> dict[str, typing.Any]:
+    """Measure how long it takes to build the MIB tree.
+
+    Parameters
+    ----------
+    repeat : `int`
+        The number of times each build is timed.
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The durations [s] of parsing the MIB files of all device types and of
+        each device type, and of loading all of them from the cache.
+    """
+    results: dict[str, typing.Any] = {
+        "parse_all": time_call(lambda: epm.MibTreeHolder(use_cache=False), repeat)
+    }
+    for device_type in DEVICE_TYPES:
+        results[f"parse_{device_type}"] = time_call(
+            lambda: epm.MibTreeHolder(device_types=[device_type], use_cache=False),
+            repeat,
+        )
+    with tempfile.TemporaryDirectory() as cache_dir, patch.dict(
+        os.environ, {"TS_EPM_CACHE_DIR": cache_dir}
+    ):
+        epm.MibTreeHolder()
+        results["load_all_from_cache"] = time_call(epm.MibTreeHolder, repeat)
+    return results
+
+
+async def benchmark_polls(
+    component_info: ComponentInfo, num_polls: int
+) -> dict[str, typing.Any]:
+    """Measure the number of polls per second of each device type and read
+    mode.
+
+    Parameters
+    ----------
+    component_info : `ComponentInfo`
+        The component info derived from the EPM XML files.
+    num_polls : `int`
+        The number of polls to time.
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The polls per second and the stage timings, by read mode and device
+        type.
+    """
+    results: dict[str, typing.Any] = {}
+    for read_mode in ["get", "walk"]:
+        results[read_mode] = {}
+        for device_type in DEVICE_TYPES:
+            data_client = epm.SnmpDataClient(
+                config=make_config(device_type, read_mode=read_mode),
+                topics=make_topics(component_info),
+                log=logging.getLogger(),
+                simulation_mode=1,
+            )
+            await data_client.setup_reading()
+            # The first poll discovers the OIDs to get.
+            await data_client.read_data()
+            data_client.poll_timings.reset()
+
+            start_time = time.perf_counter()
+            for _ in range(num_polls):
+                await data_client.read_data()
+            duration = time.perf_counter() - start_time
+            await data_client.disconnect()
+
+            results[read_mode][device_type] = {
+                "polls_per_second": num_polls / duration,
+                "stage_timings": data_client.get_timing_statistics(),
+            }
+    return results
+
+
+async def benchmark_agent_polls(
+    component_info: ComponentInfo, num_polls: int
+) -> dict[str, typing.Any]:
+    """Measure the number of polls per second of each device type over UDP,
+    against a `SnmpAgentSimulator` on localhost.
+
+    Parameters
+    ----------
+    component_info : `ComponentInfo`
+        The component info derived from the EPM XML files.
+    num_polls : `int`
+        The number of polls to time.
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The polls per second, the number of requests per poll and the stage
+        timings, by read mode and device type.
+    """
+    results: dict[str, typing.Any] = {}
+    for read_mode in ["get", "walk"]:
+        results[read_mode] = {}
+        for device_type in DEVICE_TYPES:
+            snmp_agent_simulator = epm.SnmpAgentSimulator(
+                log=logging.getLogger(), device_type=device_type
+            )
+            await snmp_agent_simulator.start()
+            host, port = snmp_agent_simulator.address
+            data_client = epm.SnmpDataClient(
+                config=make_config(
+                    device_type,
+                    host=host,
+                    port=port,
+                    snmp_transport="asyncio",
+                    read_mode=read_mode,
+                ),
+                topics=make_topics(component_info),
+                log=logging.getLogger(),
+                snmp_transport=epm.SnmpTransport(log=logging.getLogger()),
+            )
+            await data_client.setup_reading()
+            await data_client.read_data()
+            data_client.poll_timings.reset()
+            num_requests = snmp_agent_simulator.num_requests
+
+            start_time = time.perf_counter()
+            for _ in range(num_polls):
+                await data_client.read_data()
+            duration = time.perf_counter() - start_time
+            await data_client.disconnect()
+            data_client.snmp_transport.close()
+            snmp_agent_simulator.close()
+
+            results[read_mode][device_type] = {
+                "polls_per_second": num_polls / duration,
+                "requests_per_poll": (snmp_agent_simulator.num_requests - num_requests)
+                / num_polls,
+                "stage_timings": data_client.get_timing_statistics(),
+            }
+    return results
+
+
+async def benchmark_replay(
+    component_info: ComponentInfo, num_polls: int
+) -> dict[str, typing.Any]:
+    """Measure the number of polls per second of each device type when
+    replaying the captures of real devices as fast as possible.
+
+    Parameters
+    ----------
+    component_info : `ComponentInfo`
+        The component info derived from the EPM XML files.
+    num_polls : `int`
+        The number of polls to time.
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The polls per second and the stage timings, by device type.
+    """
+    results: dict[str, typing.Any] = {}
+    for device_type in DEVICE_TYPES:
+        data_client = epm.SnmpDataClient(
+            config=make_config(
+                device_type,
+                replay_file=str(CAPTURE_DIR / f"{device_type}_output.txt"),
+                replay_speed=0.0,
+            ),
+            topics=make_topics(component_info),
+            log=logging.getLogger(),
+        )
+        await data_client.setup_reading()
+        await data_client.read_data()
+        data_client.poll_timings.reset()
+
+        start_time = time.perf_counter()
+        for _ in range(num_polls):
+            await data_client.read_data()
+        duration = time.perf_counter() - start_time
+        await data_client.disconnect()
+
+        results[device_type] = {
+            "polls_per_second": num_polls / duration,
+            "stage_timings": data_client.get_timing_statistics(),
+        }
+    return results
+
+
+async def benchmark_decode(
+    component_info: ComponentInfo, repeat: int
+) -> dict[str, typing.Any]:
+    """Measure the cost of decoding the var binds of a walk.
+
+    Parameters
+    ----------
+    component_info : `ComponentInfo`
+        The component info derived from the EPM XML files.
+    repeat : `int`
+        The number of times the decode is timed.
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The number of var binds and the median duration [s] per var bind of
+        storing them and of executing the telemetry plan, by device type.
+    """
+    results: dict[str, typing.Any] = {}
+    for device_type in DEVICE_TYPES:
+        data_client = epm.SnmpDataClient(
+            config=make_config(device_type, read_mode="walk"),
+            topics=make_topics(component_info),
+            log=logging.getLogger(),
+            simulation_mode=1,
+        )
+        await data_client.setup_reading()
+        responses = [
+            response
+            async for response in data_client.walk(
+                data_client.address,
+                data_client.config.snmp_community,
+                0,
+                data_client.walk_oid,
+            )
+        ]
+        num_var_binds = sum(len(response[3]) for response in responses)
+
+        def process_responses() -> None:
+            data_client.clear_snmp_result()
+            for response in responses:
+                data_client.process_snmp_response(*response)
+
+        process_timing = time_call(process_responses, repeat)
+        plan_timing = time_call(data_client.execute_telemetry_plan, repeat)
+        await data_client.disconnect()
+
+        results[device_type] = {
+            "num_var_binds": num_var_binds,
+            "process_seconds_per_var_bind": process_timing["median"] / num_var_binds,
+            "decode_seconds_per_var_bind": plan_timing["median"] / num_var_binds,
+        }
+    return results
+
+
+async def benchmark_scaling(
+    component_info: ComponentInfo, max_num_clients: int, num_polls: int
+) -> dict[str, typing.Any]:
+    """Measure how the throughput scales with the number of devices that are
+    polled concurrently by a `SnmpMultiDataClient`.
+
+    Parameters
+    ----------
+    component_info : `ComponentInfo`
+        The component info derived from the EPM XML files.
+    max_num_clients : `int`
+        The maximum number of devices. The number of devices is doubled from
+        1 up to this number.
+    num_polls : `int`
+        The number of polls of all devices to time.
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The polls of all devices per second, and the device polls per second,
+        by number of devices.
+    """
+    multi_config_schema = epm.SnmpMultiDataClient.get_config_schema()
+    results: dict[str, typing.Any] = {}
+    num_clients = 1
+    while num_clients <= max_num_clients:
+        config = {
+            name: item["default"]
+            for name, item in multi_config_schema["properties"].items()
+            if "default" in item
+        }
+        config.update(
+            poll_interval=0.0,
+            timing_summary_interval=0.0,
+            devices=[
+                dict(
+                    host="localhost",
+                    port=161,
+                    device_name=f"Device{i}",
+                    device_type=DEVICE_TYPES[i % len(DEVICE_TYPES)],
+                    snmp_community="public",
+                )
+                for i in range(num_clients)
+            ],
+        )
+        multi_data_client = epm.SnmpMultiDataClient(
+            config=types.SimpleNamespace(**config),
+            topics=make_topics(component_info),
+            log=logging.getLogger(),
+            simulation_mode=1,
+        )
+        await multi_data_client.setup_reading()
+        await multi_data_client.read_data()
+
+        start_time = time.perf_counter()
+        for _ in range(num_polls):
+            await multi_data_client.read_data()
+        duration = time.perf_counter() - start_time
+        await multi_data_client.disconnect()
+
+        results[str(num_clients)] = {
+            "polls_per_second": num_polls / duration,
+            "device_polls_per_second": num_polls * num_clients / duration,
+        }
+        num_clients *= 2
+    return results
+
+
+async def run_benchmarks(args: argparse.Namespace) -> dict[str, typing.Any]:
+    """Run all benchmarks.
+
+    Parameters
+    ----------
+    args : `argparse.Namespace`
+        The command line arguments.
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The metadata of the run and the results of each benchmark.
+    """
+    component_info = ComponentInfo(name="EPM", topic_subname="")
+    return {
+        "metadata": {
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts_epm_version": epm.__version__,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "mib_tree_holder": benchmark_mib_tree_holder(args.repeat),
+        "polls": await benchmark_polls(component_info, args.num_polls),
+        "agent_polls": await benchmark_agent_polls(component_info, args.num_polls),
+        "replay": await benchmark_replay(component_info, args.num_polls),
+        "decode": await benchmark_decode(component_info, args.repeat),
+        "scaling": await benchmark_scaling(
+            component_info, args.max_num_clients, args.num_polls
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="The JSON file to write the results to. Defaults to stdout.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="The number of times each timed call is repeated.",
+    )
+    parser.add_argument(
+        "--num-polls",
+        type=int,
+        default=50,
+        help="The number of polls to time.",
+    )
+    parser.add_argument(
+        "--max-num-clients",
+        type=int,
+        default=64,
+        help="The maximum number of concurrently polled devices.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run_benchmarks(args))
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,9 +31,21 @@ else:
     except ImportError:
         __version__ = "?"
 
+from .circuit_breaker import *
 from .config_schema import *
+from .deadband_filter import *
 from .epm_csc import *
+from .field_group_scheduler import *
 from .mib_tree_holder import *
+from .poll_scheduler import *
+from .poll_timings import *
+from .sample_window import *
+from .snmp_agent_simulator import *
+from .snmp_capture import *
 from .snmp_data_client import *
+from .snmp_engine_pool import *
+from .snmp_multi_data_client import *
 from .snmp_server_simulator import *
+from .snmp_transport import *
+from .testutils import *
 from .utils import *
@@ -0,0 +1,151 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = ["CircuitBreaker", "CircuitBreakerState"]
+
+import enum
+import random
+import time
+
+
+class CircuitBreakerState(enum.StrEnum):
+    """The state of a `CircuitBreaker`."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Keep track of the health of a device and hold off requests to a device
+    that doesn't respond.
+
+    The circuit breaker starts closed, in which case all requests are allowed.
+    After ``failure_threshold`` consecutive failures it opens, in which case
+    no requests are allowed for a backoff time. After that it is half open and
+    allows a single probe request. If the probe succeeds, the circuit breaker
+    closes again. If the probe fails, it opens again with a backoff time that
+    is twice as long, up to ``max_backoff``. A random jitter is applied to each
+    backoff time, so devices that failed at the same time aren't probed at the
+    same time.
+
+    Parameters
+    ----------
+    failure_threshold : `int`
+        The number of consecutive failures after which the circuit breaker
+        opens.
+    min_backoff : `float`
+        The backoff time [s] after the circuit breaker opened first.
+    max_backoff : `float`
+        The maximum backoff time [s].
+    jitter : `float`, optional
+        The maximum random deviation of each backoff time, as a fraction of
+        the backoff time.
+
+    Raises
+    ------
+    ValueError
+        In case ``min_backoff`` isn't positive or ``max_backoff`` is less than
+        ``min_backoff``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        min_backoff: float,
+        max_backoff: float,
+        jitter: float = 0.0,
+    ) -> None:
+        if min_backoff <= 0:
+            raise ValueError(f"{min_backoff=} must be positive.")
+        if max_backoff < min_backoff:
+            raise ValueError(f"{max_backoff=} must be at least {min_backoff=}.")
+
+        self.failure_threshold = failure_threshold
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+        self.state = CircuitBreakerState.CLOSED
+        self.num_failures = 0
+        # The backoff time [s] without jitter and the monotonic time at which
+        # the next probe is allowed, while the circuit breaker is open.
+        self.backoff = 0.0
+        self.probe_time: float | None = None
+
+    def allow_request(self, timestamp: float | None = None) -> bool:
+        """Determine whether a request is allowed.
+
+        If the circuit breaker is open and the backoff time has passed, it
+        becomes half open and the request is allowed as a probe.
+
+        Parameters
+        ----------
+        timestamp : `float` | None, optional
+            The monotonic time [s], or None (the default) for the current time.
+
+        Returns
+        -------
+        bool
+            True if the request is allowed, False otherwise.
+        """
+        if self.state == CircuitBreakerState.OPEN:
+            if timestamp is None:
+                timestamp = time.monotonic()
+            assert self.probe_time is not None
+            if timestamp < self.probe_time:
+                return False
+            self.state = CircuitBreakerState.HALF_OPEN
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request, which closes the circuit breaker."""
+        self.state = CircuitBreakerState.CLOSED
+        self.num_failures = 0
+        self.backoff = 0.0
+        self.probe_time = None
+
+    def record_failure(self, timestamp: float | None = None) -> None:
+        """Record a failed request, which may open the circuit breaker.
+
+        Parameters
+        ----------
+        timestamp : `float` | None, optional
+            The monotonic time [s], or None (the default) for the current time.
+        """
+        self.num_failures += 1
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self.backoff = min(2 * self.backoff, self.max_backoff)
+        elif (
+            self.state == CircuitBreakerState.CLOSED
+            and self.num_failures >= self.failure_threshold
+        ):
+            self.backoff = self.min_backoff
+        else:
+            return
+
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self.state = CircuitBreakerState.OPEN
+        self.probe_time = timestamp + self.backoff * (
+            1 + random.uniform(-self.jitter, self.jitter)
+        )
@@ -0,0 +1,185 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["DeadbandFilter"]
+
+import math
+import time
+import typing
+
+
+class DeadbandFilter:
+    """Decide whether telemetry needs to be published, based on how much the
+    telemetry items changed since they were published last.
+
+    A numeric telemetry item changed if the difference with the last
+    published value is larger than both its absolute deadband and its
+    relative deadband times the absolute last published value. An array
+    changed if any of its elements changed. Other telemetry items, like
+    strings, changed if they are not equal to the last published value.
+
+    Parameters
+    ----------
+    max_silence : `float`
+        The maximum amount of time [s] between publishing, even if nothing
+        changed.
+    absolute_deadband : `float`, optional
+        The default absolute deadband of all numeric telemetry items.
+    relative_deadband : `float`, optional
+        The default relative deadband of all numeric telemetry items.
+    deadbands : `dict`[`str`, `dict`[`str`, `float`]] | None, optional
+        The deadbands of individual telemetry items, by name, as a dict with
+        optional "absolute" and "relative" keys that override the defaults.
+    """
+
+    def __init__(
+        self,
+        max_silence: float,
+        absolute_deadband: float = 0.0,
+        relative_deadband: float = 0.0,
+        deadbands: dict[str, dict[str, float]] | None = None,
+    ) -> None:
+        self.max_silence = max_silence
+        self.absolute_deadband = absolute_deadband
+        self.relative_deadband = relative_deadband
+        self.deadbands: dict[str, tuple[float, float]] = {
+            name: (
+                deadband.get("absolute", absolute_deadband),
+                deadband.get("relative", relative_deadband),
+            )
+            for name, deadband in (deadbands or {}).items()
+        }
+
+        self.published_values: dict[str, typing.Any] = {}
+        self.publish_time: float | None = None
+        self.num_published = 0
+        self.num_suppressed = 0
+
+    def should_publish(
+        self, telemetry_dict: dict[str, typing.Any], timestamp: float | None = None
+    ) -> bool:
+        """Determine whether the telemetry needs to be published.
+
+        If so, the telemetry is remembered as the last published telemetry.
+
+        Parameters
+        ----------
+        telemetry_dict : `dict`[`str`, `typing.Any`]
+            The telemetry items and their values.
+        timestamp : `float` | None, optional
+            The monotonic time [s] of the telemetry, or None (the default) for
+            the current time.
+
+        Returns
+        -------
+        bool
+            True if the telemetry needs to be published, False otherwise.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        if (
+            self.publish_time is None
+            or timestamp - self.publish_time >= self.max_silence
+            or telemetry_dict.keys() != self.published_values.keys()
+            or any(
+                self.has_changed(name, value) for name, value in telemetry_dict.items()
+            )
+        ):
+            self.published_values = {
+                name: list(value) if isinstance(value, list) else value
+                for name, value in telemetry_dict.items()
+            }
+            self.publish_time = timestamp
+            self.num_published += 1
+            return True
+
+        self.num_suppressed += 1
+        return False
+
+    def has_changed(self, name: str, value: typing.Any) -> bool:
+        """Determine whether a telemetry item changed by more than its
+        deadband since it was published last.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the telemetry item.
+        value : `typing.Any`
+            The value of the telemetry item.
+
+        Returns
+        -------
+        bool
+            True if the telemetry item changed, False otherwise.
+        """
+        published_value = self.published_values[name]
+        absolute_deadband, relative_deadband = self.deadbands.get(
+            name, (self.absolute_deadband, self.relative_deadband)
+        )
+        if isinstance(value, list):
+            return len(value) != len(published_value) or any(
+                self._has_value_changed(
+                    element, published_element, absolute_deadband, relative_deadband
+                )
+                for element, published_element in zip(value, published_value)
+            )
+        return self._has_value_changed(
+            value, published_value, absolute_deadband, relative_deadband
+        )
+
+    def _has_value_changed(
+        self,
+        value: typing.Any,
+        published_value: typing.Any,
+        absolute_deadband: float,
+        relative_deadband: float,
+    ) -> bool:
+        """Determine whether a single value changed by more than the
+        deadbands.
+
+        Parameters
+        ----------
+        value : `typing.Any`
+            The value.
+        published_value : `typing.Any`
+            The last published value.
+        absolute_deadband : `float`
+            The absolute deadband.
+        relative_deadband : `float`
+            The relative deadband.
+
+        Returns
+        -------
+        bool
+            True if the value changed, False otherwise.
+        """
+        if not (_is_number(value) and _is_number(published_value)):
+            return value != published_value
+        if math.isnan(value) or math.isnan(published_value):
+            return math.isnan(value) != math.isnan(published_value)
+        deadband = max(absolute_deadband, relative_deadband * abs(published_value))
+        return abs(value - published_value) > deadband
+
+
+def _is_number(value: typing.Any) -> bool:
+    """Determine whether a value is an int or a float, but not a bool."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,120 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = ["FieldGroupScheduler"]
+
+import time
+import typing
+
+
+class FieldGroupScheduler:
+    """Decide which groups of telemetry items are due to be polled.
+
+    Each group has its own interval. A group with an interval of 0 holds
+    static telemetry items, which are never due and only are read when the
+    whole device subtree is read. Telemetry items that are not in any group
+    are read every poll.
+
+    Parameters
+    ----------
+    field_groups : `dict`[`str`, `dict`[`str`, `typing.Any`]]
+        The groups, by name, as a dict with an "interval" key, the time [s]
+        between polls of the group, and an "items" key, the names of the
+        telemetry items in the group.
+    tolerance : `float`, optional
+        The amount of time [s] by which a group may be polled early, to allow
+        for the jitter of the poll times.
+
+    Raises
+    ------
+    ValueError
+        In case a telemetry item is in more than one group.
+    """
+
+    def __init__(
+        self, field_groups: dict[str, dict[str, typing.Any]], tolerance: float = 0.0
+    ) -> None:
+        self.tolerance = tolerance
+        self.intervals: dict[str, float] = {
+            name: field_group["interval"] for name, field_group in field_groups.items()
+        }
+        # The group of each telemetry item, by telemetry item name.
+        self.groups: dict[str, str] = {}
+        for name, field_group in field_groups.items():
+            for item in field_group["items"]:
+                if item in self.groups:
+                    raise ValueError(
+                        f"Telemetry item {item!r} is in field groups "
+                        f"{self.groups[item]!r} and {name!r}."
+                    )
+                self.groups[item] = name
+
+        self.poll_times: dict[str, float] = {}
+
+    @property
+    def group_names(self) -> frozenset[str]:
+        """The names of all groups."""
+        return frozenset(self.intervals)
+
+    def get_due_groups(self, timestamp: float | None = None) -> frozenset[str]:
+        """Get the groups that are due to be polled.
+
+        Parameters
+        ----------
+        timestamp : `float` | None, optional
+            The monotonic time [s] of the poll, or None (the default) for the
+            current time.
+
+        Returns
+        -------
+        frozenset[str]
+            The names of the groups that are due.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        return frozenset(
+            name
+            for name, interval in self.intervals.items()
+            if interval > 0
+            and (
+                name not in self.poll_times
+                or timestamp - self.poll_times[name] >= interval - self.tolerance
+            )
+        )
+
+    def record_poll(
+        self, group_names: typing.Iterable[str], timestamp: float | None = None
+    ) -> None:
+        """Record that groups were polled.
+
+        Parameters
+        ----------
+        group_names : `typing.Iterable`[`str`]
+            The names of the groups that were polled.
+        timestamp : `float` | None, optional
+            The monotonic time [s] of the poll, or None (the default) for the
+            current time.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        for name in group_names:
+            self.poll_times[name] = timestamp
@@ -19,14 +19,25 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["MibTreeHolder"]
-
+__all__ = [
+    "DEVICE_TYPE_MIB_FILES",
+    "MIB_CACHE_DIR_ENV_VAR",
+    "MibTreeHolder",
+    "get_mib_cache_dir",
+    "get_shared_mib_tree_holder",
+]
+
+import bisect
+import hashlib
+import json
 import logging
+import os
 import pathlib
 import re
+import tempfile
 import typing
 
-from .utils import MibTreeElement, MibTreeElementType
+from .utils import MibTreeElement, MibTreeElementType, intern_oid
 
 # SNMP-related constants.
 MODULE_IDENTITY = r"^(\w+) +MODULE-IDENTITY$"
@@ -38,6 +49,36 @@ INDEX = r"INDEX +\{ ?(\w+) ?\}"
 
 DATA_DIR = pathlib.Path(__file__).parent / "data"
 
+# Cache-related constants. Increase the version whenever the parsing or the
+# format of the cache files changes, so existing caches no longer are used.
+MIB_CACHE_VERSION = 3
+MIB_CACHE_DIR_ENV_VAR = "TS_EPM_CACHE_DIR"
+
+# The MIB files needed for each device type, in the order in which they need
+# to be parsed.
+DEVICE_TYPE_MIB_FILES = {
+    "pdu": ["mib_synV4.mib"],
+    "scheiderPm5xxx": ["SchneiderPM55xx_V01_13.mib"],
+    "xups": ["eaton-oids.mib", "eaton-xups.mib"],
+}
+
+
+def get_mib_cache_dir() -> pathlib.Path:
+    """Get the directory for the MIB tree cache files.
+
+    This is the directory in the TS_EPM_CACHE_DIR environment variable if
+    set, or the ts_epm directory in the user cache directory otherwise.
+
+    Returns
+    -------
+    pathlib.Path
+        The cache directory.
+    """
+    if MIB_CACHE_DIR_ENV_VAR in os.environ:
+        return pathlib.Path(os.environ[MIB_CACHE_DIR_ENV_VAR])
+    cache_home = os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")
+    return pathlib.Path(cache_home) / "ts_epm"
+
 
 class MibTreeHolder:
     """Holder of information in an MIB tree.
@@ -46,20 +87,383 @@ class MibTreeHolder:
     managing the entities in a communication network, in this case SNMP or
     Simple Network Management Protocol. The information can be represented as a
     tree, hence the name of the class.
+
+    Only the MIB files of the requested device types are parsed, and more
+    device types can be loaded later with `load_device_type`. Parsing the MIB
+    files is relatively slow, so the resulting tree is cached in a file in the
+    directory returned by `get_mib_cache_dir`. The name of the file contains
+    a hash of the contents of the loaded MIB files, so the tree only is parsed
+    again if an MIB file changes.
+
+    Besides by name in `mib_tree`, the elements can be looked up by OID with
+    `get_element` and, for instance OIDs, with `match_oid`. The children of
+    each element are kept sorted by OID, so a subtree can be walked in
+    lexicographic order with `iter_subtree` without scanning the whole tree.
+    `get_next_element` gets the element that follows any OID in lexicographic
+    order.
+
+    Parameters
+    ----------
+    device_types : `typing.Iterable`[`str`] | None, optional
+        The types of device to load the MIB files for, or None (the default)
+        to load the MIB files of all device types.
+    use_cache : `bool`, optional
+        Load the tree from, and save it to, the cache (True, the default) or
+        always parse the MIB files (False)?
+
+    Raises
+    ------
+    ValueError
+        In case a device type is unknown.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        device_types: typing.Iterable[str] | None = None,
+        use_cache: bool = True,
+    ) -> None:
         self.log = logging.getLogger(type(self).__name__)
+        self.use_cache = use_cache
         self._line_num = 0
         self.mib_tree: dict[str, MibTreeElement] = {}
+        # The elements of the MIB tree by OID, including the elements that are
+        # shadowed in mib_tree by an element with the same name.
+        self.oid_index: dict[tuple[int, ...], MibTreeElement] = {}
+        # The children of the elements of the MIB tree, sorted by OID, by
+        # the OID of the parent.
+        self.children: dict[tuple[int, ...], list[MibTreeElement]] = {}
+        # The OIDs of all elements, in lexicographic order.
+        self.sorted_oids: list[tuple[int, ...]] = []
 
         # In some cases a module is defined before its parent. In such cases
         # this is used to keep track of modules that need to be added as soon
         # as the parent is added.
         self.pending_modules: dict[str, typing.Tuple[str, str]] = {}
 
+        # The names of the MIB files that have been loaded, in load order.
+        self.loaded_mib_files: list[str] = []
+
         self._add_default_elements()
-        self._add_mib_elements()
+        self._update_indexes()
+        if device_types is None:
+            self.load_all_device_types()
+        else:
+            for device_type in device_types:
+                self.load_device_type(device_type)
+
+    def load_device_type(self, device_type: str) -> None:
+        """Load the MIB files of a device type, if not loaded yet.
+
+        Parameters
+        ----------
+        device_type : `str`
+            The type of device.
+
+        Raises
+        ------
+        ValueError
+            In case the device type is unknown.
+        """
+        if device_type not in DEVICE_TYPE_MIB_FILES:
+            raise ValueError(f"Unknown device type {device_type!r}.")
+        self._load_mib_files(
+            [DATA_DIR / filename for filename in DEVICE_TYPE_MIB_FILES[device_type]]
+        )
+
+    def load_all_device_types(self) -> None:
+        """Load all MIB files that are not loaded yet."""
+        self._load_mib_files(sorted(DATA_DIR.glob("*.mib")))
+
+    def _load_mib_files(self, mib_files: list[pathlib.Path]) -> None:
+        """Load the MIB files that are not loaded yet, from the cache if
+        possible.
+
+        Parameters
+        ----------
+        mib_files : `list`[`pathlib.Path`]
+            The MIB files.
+        """
+        new_mib_files = [f for f in mib_files if f.name not in self.loaded_mib_files]
+        if not new_mib_files:
+            return
+
+        all_mib_files = [
+            DATA_DIR / filename for filename in self.loaded_mib_files
+        ] + new_mib_files
+        cache_file = self._get_cache_file(all_mib_files) if self.use_cache else None
+        if cache_file is None or not self._load_cache(cache_file):
+            self._add_mib_elements(new_mib_files)
+            if cache_file is not None:
+                self._save_cache(cache_file)
+        # Only mark the MIB files as loaded once they were parsed, so they
+        # are parsed again if that failed.
+        self.loaded_mib_files += [f.name for f in new_mib_files]
+        self._update_indexes()
+
+    def get_element(self, oid: tuple[int, ...]) -> MibTreeElement | None:
+        """Get the MIB element with the provided OID.
+
+        Parameters
+        ----------
+        oid : `tuple`[`int`, ...]
+            The OID of the element.
+
+        Returns
+        -------
+        MibTreeElement | None
+            The element, or None if no element has the OID.
+        """
+        return self.oid_index.get(oid)
+
+    def match_oid(
+        self, oid: tuple[int, ...]
+    ) -> tuple[MibTreeElement, tuple[int, ...]] | None:
+        """Get the MIB element with the longest OID that is a prefix of the
+        provided OID.
+
+        For an instance OID this is the object of the instance, and the rest
+        of the OID is the index of the instance, for instance ``(0,)`` for a
+        scalar object or the row index for a table column.
+
+        Parameters
+        ----------
+        oid : `tuple`[`int`, ...]
+            The OID.
+
+        Returns
+        -------
+        tuple[MibTreeElement, tuple[int, ...]] | None
+            The element and the rest of the OID, or None if the OID isn't in
+            the MIB tree.
+        """
+        for length in range(len(oid), 0, -1):
+            elt = self.oid_index.get(oid[:length])
+            if elt is not None:
+                return elt, oid[length:]
+        return None
+
+    def get_children(self, elt: MibTreeElement) -> list[MibTreeElement]:
+        """Get the children of a MIB element.
+
+        Parameters
+        ----------
+        elt : `MibTreeElement`
+            The element.
+
+        Returns
+        -------
+        list[MibTreeElement]
+            The children, sorted by OID. The list must not be modified.
+        """
+        return self.children.get(elt.oid_tuple, [])
+
+    def iter_subtree(self, elt: MibTreeElement) -> typing.Iterator[MibTreeElement]:
+        """Iterate over the subtree of a MIB element in lexicographic OID
+        order, starting with the element itself.
+
+        The subtree is walked lazily, so only the elements that are iterated
+        over are visited.
+
+        Parameters
+        ----------
+        elt : `MibTreeElement`
+            The root of the subtree.
+
+        Yields
+        ------
+        MibTreeElement
+            The elements of the subtree.
+        """
+        stack = [elt]
+        while stack:
+            elt = stack.pop()
+            yield elt
+            stack.extend(reversed(self.children.get(elt.oid_tuple, [])))
+
+    def get_next_element(self, oid: tuple[int, ...]) -> MibTreeElement | None:
+        """Get the MIB element that follows the provided OID in lexicographic
+        order, like an SNMP GETNEXT request does.
+
+        Parameters
+        ----------
+        oid : `tuple`[`int`, ...]
+            The OID, which doesn't need to be in the MIB tree.
+
+        Returns
+        -------
+        MibTreeElement | None
+            The next element, or None if there is none.
+        """
+        i = bisect.bisect_right(self.sorted_oids, oid)
+        return (
+            self.oid_index[self.sorted_oids[i]] if i < len(self.sorted_oids) else None
+        )
+
+    def _update_indexes(self) -> None:
+        """Index all elements of the MIB tree by OID and by parent.
+
+        This includes the elements that are shadowed in `mib_tree` by an
+        element with the same name, see `_get_all_elements`.
+        """
+        self.oid_index = self._get_all_elements()
+        self.sorted_oids = sorted(self.oid_index)
+        self.children = {}
+        for oid in self.sorted_oids:
+            parent = self.oid_index[oid].parent
+            if parent is not None:
+                self.children.setdefault(parent.oid_tuple, []).append(
+                    self.oid_index[oid]
+                )
+
+    def _get_cache_file(self, mib_files: list[pathlib.Path]) -> pathlib.Path:
+        """Get the cache file for the contents of the provided MIB files.
+
+        Parameters
+        ----------
+        mib_files : `list`[`pathlib.Path`]
+            The MIB files.
+
+        Returns
+        -------
+        pathlib.Path
+            The cache file.
+        """
+        mib_hash = hashlib.sha256(f"{MIB_CACHE_VERSION}".encode())
+        for filename in mib_files:
+            mib_hash.update(filename.name.encode())
+            mib_hash.update(filename.read_bytes())
+        return get_mib_cache_dir() / f"mib_tree_{mib_hash.hexdigest()}.json"
+
+    def _load_cache(self, cache_file: pathlib.Path) -> bool:
+        """Load the MIB tree from a cache file.
+
+        The cache file is JSON with the fields of all elements, parents
+        before children, and the OID of each element in `mib_tree` by name.
+        It only contains data, so a cache file that was tampered with cannot
+        execute code.
+
+        The elements that already are in the tree are kept and `mib_tree` is
+        updated in place, so users of the tree keep valid references when
+        more MIB files are loaded from the cache later on.
+
+        Parameters
+        ----------
+        cache_file : `pathlib.Path`
+            The cache file.
+
+        Returns
+        -------
+        bool
+            True if the MIB tree was loaded, False if the cache file doesn't
+            exist or cannot be read.
+        """
+        try:
+            with open(cache_file, "r") as f:
+                cache = json.load(f)
+            existing_elements = self._get_all_elements()
+            elements: dict[tuple[int, ...], MibTreeElement] = {}
+            for name, description, oid, parent_oid, elt_type, index in cache[
+                "elements"
+            ]:
+                oid_tuple = intern_oid(oid)
+                existing_element = existing_elements.get(oid_tuple)
+                if existing_element is not None and existing_element.name == name:
+                    elements[oid_tuple] = existing_element
+                    continue
+                elements[oid_tuple] = MibTreeElement(
+                    name=name,
+                    description=description,
+                    oid_tuple=oid_tuple,
+                    parent=None if parent_oid is None else elements[tuple(parent_oid)],
+                    type=MibTreeElementType(elt_type),
+                    index=index,
+                )
+            mib_tree = {
+                name: elements[tuple(oid)] for name, oid in cache["mib_tree"].items()
+            }
+            pending_modules = {
+                name: (parent, oid)
+                for name, (parent, oid) in cache["pending_modules"].items()
+            }
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.log.warning(f"Could not load MIB cache {cache_file}: {e!r}.")
+            return False
+        self.mib_tree.clear()
+        self.mib_tree.update(mib_tree)
+        self.pending_modules = pending_modules
+        self.log.debug(f"Loaded MIB tree from {cache_file}.")
+        return True
+
+    def _save_cache(self, cache_file: pathlib.Path) -> None:
+        """Save the MIB tree to a cache file.
+
+        The file is written under a temporary name first and then renamed, so
+        a concurrent reader never sees a partially written file. Failing to
+        save the cache only is logged.
+
+        Parameters
+        ----------
+        cache_file : `pathlib.Path`
+            The cache file.
+        """
+        elements = sorted(
+            self._get_all_elements().values(),
+            key=lambda elt: (len(elt.oid_tuple), elt.oid_tuple),
+        )
+        cache = {
+            "elements": [
+                [
+                    elt.name,
+                    elt.description,
+                    elt.oid_tuple,
+                    None if elt.parent is None else elt.parent.oid_tuple,
+                    elt.type,
+                    elt.index,
+                ]
+                for elt in elements
+            ],
+            "mib_tree": {name: elt.oid_tuple for name, elt in self.mib_tree.items()},
+            "pending_modules": self.pending_modules,
+        }
+        temp_file: str | None = None
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=cache_file.parent, suffix=".tmp", delete=False
+            ) as f:
+                temp_file = f.name
+                json.dump(cache, f)
+            os.replace(temp_file, cache_file)
+            temp_file = None
+        except Exception as e:
+            self.log.warning(f"Could not save MIB cache {cache_file}: {e!r}.")
+            return
+        finally:
+            if temp_file is not None:
+                pathlib.Path(temp_file).unlink(missing_ok=True)
+        self.log.debug(f"Saved MIB tree to {cache_file}.")
+
+    def _get_all_elements(self) -> dict[tuple[int, ...], MibTreeElement]:
+        """Get all elements of the MIB tree by OID.
+
+        Besides the elements in `mib_tree`, this includes their ancestors,
+        since an element may be shadowed in `mib_tree` by an element with the
+        same name from another MIB file and still have children.
+
+        Returns
+        -------
+        dict[tuple[int, ...], MibTreeElement]
+            The elements by OID.
+        """
+        elements: dict[tuple[int, ...], MibTreeElement] = {}
+        elt: MibTreeElement | None
+        for elt in self.mib_tree.values():
+            while elt is not None and elt.oid_tuple not in elements:
+                elements[elt.oid_tuple] = elt
+                elt = elt.parent
+        return elements
 
     def _add_default_elements(self) -> None:
         """Add the default MIB elements.
@@ -70,35 +474,35 @@ class MibTreeHolder:
         snmp = MibTreeElement(
             name="snmp",
             description="snmp",
-            oid="1.3.6.1",
+            oid_tuple=(1, 3, 6, 1),
             parent=None,
             type=MibTreeElementType.BRANCH,
         )
         system = MibTreeElement(
             name="system",
             description="system",
-            oid="1.3.6.1.2",
+            oid_tuple=(1, 3, 6, 1, 2),
             parent=snmp,
             type=MibTreeElementType.BRANCH,
         )
         sys_descr = MibTreeElement(
             name="sysDescr",
             description="System Description.",
-            oid="1.3.6.1.2.1.1.1",
+            oid_tuple=(1, 3, 6, 1, 2, 1, 1, 1),
             parent=system,
             type=MibTreeElementType.BRANCH,
         )
         private = MibTreeElement(
             name="private",
             description="private",
-            oid="1.3.6.1.4",
+            oid_tuple=(1, 3, 6, 1, 4),
             parent=snmp,
             type=MibTreeElementType.BRANCH,
         )
         enterprises = MibTreeElement(
             name="enterprises",
             description="enterprises",
-            oid="1.3.6.1.4.1",
+            oid_tuple=(1, 3, 6, 1, 4, 1),
             parent=private,
             type=MibTreeElementType.BRANCH,
         )
@@ -108,10 +512,16 @@ class MibTreeHolder:
         self.mib_tree[private.name] = private
         self.mib_tree[enterprises.name] = enterprises
 
-    def _add_mib_elements(self) -> None:
+    def _add_mib_elements(self, mib_files: list[pathlib.Path]) -> None:
         """Loop over the MIB files and add their contents as a tree
-        structure."""
-        for filename in sorted(DATA_DIR.glob("*.mib")):
+        structure.
+
+        Parameters
+        ----------
+        mib_files : `list`[`pathlib.Path`]
+            The MIB files.
+        """
+        for filename in mib_files:
             self.log.debug(f"Processing {filename}.")
             with open(filename) as f:
                 lines = f.readlines()
@@ -159,7 +569,7 @@ class MibTreeHolder:
             self.mib_tree[name] = MibTreeElement(
                 name=name,
                 description=name,
-                oid=f"{parent.oid}.{oid}",
+                oid_tuple=parent.oid_tuple + (int(oid),),
                 parent=parent,
                 type=MibTreeElementType.BRANCH,
             )
@@ -189,7 +599,7 @@ class MibTreeHolder:
         self.mib_tree[name] = MibTreeElement(
             name=name,
             description=name,
-            oid=f"{parent.oid}.{obj_id_match.group(3)}",
+            oid_tuple=parent.oid_tuple + (int(obj_id_match.group(3)),),
             parent=parent,
             type=MibTreeElementType.BRANCH,
         )
@@ -200,7 +610,7 @@ class MibTreeHolder:
             self.mib_tree[branch_name] = MibTreeElement(
                 name=branch_name,
                 description=branch_name,
-                oid=f"{parent.oid}.{oid}",
+                oid_tuple=parent.oid_tuple + (int(oid),),
                 parent=parent,
                 type=MibTreeElementType.BRANCH,
             )
@@ -291,8 +701,45 @@ class MibTreeHolder:
         self.mib_tree[name] = MibTreeElement(
             name=name,
             description=description,
-            oid=f"{parent.oid}.{oid}",
+            oid_tuple=parent.oid_tuple + (int(oid),),
             parent=parent,
             type=MibTreeElementType.LEAF,
             index=index,
         )
+
+
+# The MIB tree holder shared by all users in this process.
+_shared_mib_tree_holder: MibTreeHolder | None = None
+
+
+def get_shared_mib_tree_holder(device_type: str | None = None) -> MibTreeHolder:
+    """Get the MIB tree holder shared by all users in this process.
+
+    The MIB files needed for the device type are parsed, or loaded from the
+    cache, the first time the device type is requested. The tree is shared,
+    so it must be treated as read-only.
+
+    Parameters
+    ----------
+    device_type : `str` | None, optional
+        The type of device to load the MIB files for, or None (the default) to
+        load the MIB files of all device types.
+
+    Returns
+    -------
+    MibTreeHolder
+        The shared MIB tree holder.
+
+    Raises
+    ------
+    ValueError
+        In case the device type is unknown.
+    """
+    global _shared_mib_tree_holder
+    if _shared_mib_tree_holder is None:
+        _shared_mib_tree_holder = MibTreeHolder(device_types=[])
+    if device_type is None:
+        _shared_mib_tree_holder.load_all_device_types()
+    else:
+        _shared_mib_tree_holder.load_device_type(device_type)
+    return _shared_mib_tree_holder
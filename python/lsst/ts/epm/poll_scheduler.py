@@ -0,0 +1,161 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["PollScheduler"]
+
+import asyncio
+import logging
+import math
+
+
+class PollScheduler:
+    """Schedule polls at a fixed rate.
+
+    The ticks are scheduled at fixed multiples of the interval after the first
+    tick, using the monotonic clock of the asyncio loop, so the time a poll
+    takes doesn't make the rate drift. If a poll takes longer than the
+    interval, the next tick starts right away and all other ticks that were
+    missed are skipped, so polls never queue up.
+
+    Parameters
+    ----------
+    interval : `float`
+        The time [s] between ticks. If 0, ticks are never delayed.
+    log : `logging.Logger`
+        Logger.
+
+    Attributes
+    ----------
+    num_ticks : `int`
+        The number of ticks so far.
+    num_overruns : `int`
+        The number of ticks that started late because the previous poll took
+        longer than the interval.
+    num_skipped_ticks : `int`
+        The number of ticks that were skipped because of overruns.
+    lateness : `float`
+        The time [s] between the scheduled and the actual start of the last
+        tick.
+    max_lateness : `float`
+        The maximum lateness [s] so far.
+    total_lateness : `float`
+        The sum of the lateness [s] of all ticks so far.
+    """
+
+    def __init__(self, interval: float, log: logging.Logger) -> None:
+        self.interval = interval
+        self.log = log.getChild(type(self).__name__)
+
+        self.next_tick_time: float | None = None
+        self.num_ticks = 0
+        self.num_overruns = 0
+        self.num_skipped_ticks = 0
+        self.lateness = 0.0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+
+    @property
+    def deadline(self) -> float | None:
+        """The loop time [s] at which the poll of the current tick needs to
+        be done, or None if the polls have no deadline."""
+        return self.next_tick_time if self.interval > 0 else None
+
+    @property
+    def mean_lateness(self) -> float:
+        """The mean lateness [s] of the ticks so far."""
+        return self.total_lateness / self.num_ticks if self.num_ticks > 0 else 0.0
+
+    async def wait_for_next_tick(self) -> None:
+        """Wait until the next tick is due.
+
+        The first call returns immediately and defines the start of the
+        schedule.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.next_tick_time is None or self.interval <= 0:
+            self.next_tick_time = now
+        elif now > self.next_tick_time:
+            overrun = now - self.next_tick_time
+            num_missed_ticks = math.floor(overrun / self.interval)
+            self.num_overruns += 1
+            self.num_skipped_ticks += num_missed_ticks
+            self.next_tick_time += num_missed_ticks * self.interval
+            self.log.debug(
+                f"Poll overrun by {overrun:0.3f} s. Skipping "
+                f"{num_missed_ticks} tick(s)."
+            )
+        else:
+            await asyncio.sleep(self.next_tick_time - now)
+            now = loop.time()
+
+        self.lateness = max(0.0, now - self.next_tick_time)
+        self.max_lateness = max(self.max_lateness, self.lateness)
+        self.total_lateness += self.lateness
+        self.num_ticks += 1
+        self.next_tick_time += self.interval
+
+    def get_statistics(self) -> dict[str, float]:
+        """Get the overrun and lateness statistics of the ticks so far.
+
+        Returns
+        -------
+        dict[str, float]
+            The number of ticks, overruns and skipped ticks, and the mean and
+            maximum lateness [s].
+        """
+        return {
+            "count": self.num_ticks,
+            "overruns": self.num_overruns,
+            "skipped": self.num_skipped_ticks,
+            "mean_lateness": self.mean_lateness,
+            "max_lateness": self.max_lateness,
+        }
+
+    def format_summary(self) -> str:
+        """Format the statistics of the ticks as a single line of text.
+
+        Returns
+        -------
+        str
+            The summary, with the lateness in milliseconds.
+        """
+        return (
+            f"ticks={self.num_ticks}, overruns={self.num_overruns}, "
+            f"skipped ticks={self.num_skipped_ticks}, "
+            f"mean lateness={self.mean_lateness * 1000:0.2f} ms, "
+            f"max lateness={self.max_lateness * 1000:0.2f} ms"
+        )
+
+    def restart(self) -> None:
+        """Restart the schedule at the next tick, for instance after a
+        reconnect, and keep the statistics."""
+        self.next_tick_time = None
+
+    def reset(self) -> None:
+        """Restart the schedule at the next tick and clear the statistics."""
+        self.restart()
+        self.num_ticks = 0
+        self.num_overruns = 0
+        self.num_skipped_ticks = 0
+        self.lateness = 0.0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
@@ -0,0 +1,345 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "DEFAULT_TIMING_BUCKETS",
+    "PROMETHEUS_FILE_MODE",
+    "PollTimings",
+    "TimingHistogram",
+    "format_prometheus",
+    "report_poll_timings",
+    "write_prometheus_file",
+]
+
+import bisect
+import contextlib
+import logging
+import math
+import os
+import pathlib
+import tempfile
+import time
+import typing
+
+# The upper bounds [s] of the histogram buckets, which cover everything from
+# decoding a small reply to a poll that times out a few times.
+DEFAULT_TIMING_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# The permissions of the Prometheus file, which is read by a scraper that may
+# run as another user.
+PROMETHEUS_FILE_MODE = 0o644
+
+# The percentiles in the statistics and log summaries.
+PERCENTILES = (50, 90, 99)
+
+PROMETHEUS_METRIC_NAME = "ts_epm_poll_stage_seconds"
+
+
+class TimingHistogram:
+    """Histogram of durations with fixed buckets.
+
+    Parameters
+    ----------
+    buckets : `typing.Sequence`[`float`], optional
+        The increasing upper bounds [s] of the buckets. An extra bucket
+        without upper bound is added.
+    """
+
+    def __init__(
+        self, buckets: typing.Sequence[float] = DEFAULT_TIMING_BUCKETS
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add a duration.
+
+        Parameters
+        ----------
+        duration : `float`
+            The duration [s].
+        """
+        self.bucket_counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.sum += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+    @property
+    def mean(self) -> float:
+        """The mean duration [s], or NaN if there are no durations."""
+        return self.sum / self.count if self.count > 0 else math.nan
+
+    def percentile(self, percentile: float) -> float:
+        """Estimate a percentile of the durations.
+
+        The duration is interpolated linearly within the bucket that contains
+        the percentile, and limited to the minimum and maximum duration.
+
+        Parameters
+        ----------
+        percentile : `float`
+            The percentile, between 0 and 100.
+
+        Returns
+        -------
+        float
+            The estimated duration [s], or NaN if there are no durations.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = percentile / 100 * self.count
+        cumulative_count = 0
+        for i, bucket_count in enumerate(self.bucket_counts):
+            if bucket_count > 0 and cumulative_count + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                fraction = (rank - cumulative_count) / bucket_count
+                duration = lower + (upper - lower) * fraction
+                return min(max(duration, self.min), self.max)
+            cumulative_count += bucket_count
+        return self.max
+
+    def reset(self) -> None:
+        """Remove all durations."""
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+
+class PollTimings:
+    """Timing histograms of the stages of the polls of a device.
+
+    Parameters
+    ----------
+    device_name : `str`
+        The name of the device.
+    buckets : `typing.Sequence`[`float`], optional
+        The increasing upper bounds [s] of the histogram buckets.
+    """
+
+    def __init__(
+        self, device_name: str, buckets: typing.Sequence[float] = DEFAULT_TIMING_BUCKETS
+    ) -> None:
+        self.device_name = device_name
+        self.buckets = tuple(buckets)
+        self.histograms: dict[str, TimingHistogram] = {}
+
+    @contextlib.contextmanager
+    def time_stage(self, stage: str) -> typing.Iterator[None]:
+        """Time the code in the context and add the duration to the histogram
+        of the stage.
+
+        Parameters
+        ----------
+        stage : `str`
+            The name of the stage.
+        """
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(stage, time.monotonic() - start_time)
+
+    def add(self, stage: str, duration: float) -> None:
+        """Add the duration of a stage.
+
+        Parameters
+        ----------
+        stage : `str`
+            The name of the stage.
+        duration : `float`
+            The duration [s].
+        """
+        if stage not in self.histograms:
+            self.histograms[stage] = TimingHistogram(self.buckets)
+        self.histograms[stage].add(duration)
+
+    def get_statistics(self) -> dict[str, dict[str, float]]:
+        """Get the statistics of each stage.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            The count and the mean, percentile and maximum durations [s] of
+            each stage, by stage name.
+        """
+        statistics: dict[str, dict[str, float]] = {}
+        for stage, histogram in self.histograms.items():
+            statistics[stage] = {"count": histogram.count, "mean": histogram.mean}
+            for percentile in PERCENTILES:
+                statistics[stage][f"p{percentile}"] = histogram.percentile(percentile)
+            statistics[stage]["max"] = histogram.max
+        return statistics
+
+    def format_summary(self) -> str:
+        """Format the statistics of each stage as a single line of text.
+
+        Returns
+        -------
+        str
+            The summary, with the durations in milliseconds.
+        """
+        stage_summaries = []
+        for stage, statistics in self.get_statistics().items():
+            durations = ", ".join(
+                f"{key}={value * 1000:0.2f}"
+                for key, value in statistics.items()
+                if key != "count"
+            )
+            stage_summaries.append(
+                f"{stage}: count={statistics['count']}, {durations} ms"
+            )
+        return f"{self.device_name} poll timings: " + "; ".join(stage_summaries)
+
+    def reset(self) -> None:
+        """Remove all durations."""
+        self.histograms.clear()
+
+
+def format_prometheus(poll_timings: typing.Iterable[PollTimings]) -> str:
+    """Format poll timings as a histogram in the Prometheus text format.
+
+    Parameters
+    ----------
+    poll_timings : `typing.Iterable`[`PollTimings`]
+        The poll timings of one or more devices.
+
+    Returns
+    -------
+    str
+        The text.
+    """
+    lines = [
+        f"# HELP {PROMETHEUS_METRIC_NAME} Duration of the stages of the SNMP polls.",
+        f"# TYPE {PROMETHEUS_METRIC_NAME} histogram",
+    ]
+    for device_poll_timings in poll_timings:
+        for stage, histogram in device_poll_timings.histograms.items():
+            labels = (
+                f'device="{_escape_label_value(device_poll_timings.device_name)}",'
+                f'stage="{_escape_label_value(stage)}"'
+            )
+            cumulative_count = 0
+            for bucket, bucket_count in zip(
+                histogram.buckets + (math.inf,), histogram.bucket_counts
+            ):
+                cumulative_count += bucket_count
+                upper_bound = "+Inf" if bucket == math.inf else repr(bucket)
+                lines.append(
+                    f'{PROMETHEUS_METRIC_NAME}_bucket{{{labels},le="{upper_bound}"}} '
+                    f"{cumulative_count}"
+                )
+            lines.append(f"{PROMETHEUS_METRIC_NAME}_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(
+                f"{PROMETHEUS_METRIC_NAME}_count{{{labels}}} {histogram.count}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_file(
+    path: str | pathlib.Path,
+    poll_timings: typing.Iterable[PollTimings],
+    log: logging.Logger,
+) -> None:
+    """Write poll timings to a file in the Prometheus text format.
+
+    The file is replaced atomically, so a scraper never reads a partially
+    written file, for instance by the node exporter textfile collector.
+
+    Parameters
+    ----------
+    path : `str` | `pathlib.Path`
+        The path of the file.
+    poll_timings : `typing.Iterable`[`PollTimings`]
+        The poll timings of one or more devices.
+    log : `logging.Logger`
+        Logger.
+    """
+    path = pathlib.Path(path)
+    temp_file: str | None = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, prefix=f".{path.name}.", delete=False
+        ) as f:
+            temp_file = f.name
+            f.write(format_prometheus(poll_timings))
+        # The temporary file only is readable by the owner.
+        os.chmod(temp_file, PROMETHEUS_FILE_MODE)
+        os.replace(temp_file, path)
+        temp_file = None
+    except OSError as e:
+        log.warning(f"Could not write poll timings to {path}: {e!r}.")
+    finally:
+        if temp_file is not None:
+            pathlib.Path(temp_file).unlink(missing_ok=True)
+
+
+def report_poll_timings(
+    poll_timings: typing.Iterable[PollTimings],
+    log: logging.Logger,
+    prometheus_file: str = "",
+) -> None:
+    """Log a summary of poll timings and write them to a Prometheus file.
+
+    Parameters
+    ----------
+    poll_timings : `typing.Iterable`[`PollTimings`]
+        The poll timings of one or more devices.
+    log : `logging.Logger`
+        Logger.
+    prometheus_file : `str`, optional
+        The path of the file to write the poll timings to in the Prometheus
+        text format, or an empty string (the default) to not write them.
+    """
+    poll_timings = list(poll_timings)
+    for device_poll_timings in poll_timings:
+        log.info(device_poll_timings.format_summary())
+    if prometheus_file:
+        write_prometheus_file(prometheus_file, poll_timings, log)
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
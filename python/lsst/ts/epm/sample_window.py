@@ -0,0 +1,121 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = ["WINDOW_STATISTICS", "SampleWindow"]
+
+import typing
+import warnings
+
+import numpy as np
+
+# The statistics of the samples in a window.
+WINDOW_STATISTICS = ("min", "max", "mean")
+
+
+class SampleWindow:
+    """Ring buffer with the last samples of numeric telemetry items, which
+    computes the minimum, maximum and mean of each item over the samples.
+
+    Each sample is stored as a row of a 2D array, with a column per scalar
+    telemetry item and per element of an array telemetry item, so the
+    statistics are computed for all telemetry items at once. NaN values are
+    ignored, as are the rows of the buffer that don't hold a sample yet.
+
+    Parameters
+    ----------
+    array_lengths : `dict`[`str`, `int` | None]
+        The array length of each telemetry item, by name, or None for scalar
+        telemetry items.
+    size : `int`
+        The maximum number of samples kept.
+    """
+
+    def __init__(self, array_lengths: dict[str, int | None], size: int) -> None:
+        self.size = size
+        # The column slice of each telemetry item.
+        self.columns: dict[str, slice] = {}
+        num_columns = 0
+        for name, array_length in array_lengths.items():
+            width = 1 if array_length is None else array_length
+            self.columns[name] = slice(num_columns, num_columns + width)
+            num_columns += width
+        self.is_array = {
+            name: array_length is not None
+            for name, array_length in array_lengths.items()
+        }
+
+        self.samples = np.full((size, num_columns), np.nan)
+        self.row = np.full(num_columns, np.nan)
+        self.num_samples = 0
+
+    def add(self, telemetry_dict: dict[str, typing.Any]) -> None:
+        """Add a sample, replacing the oldest one if the window is full.
+
+        Parameters
+        ----------
+        telemetry_dict : `dict`[`str`, `typing.Any`]
+            The telemetry items and their values. Telemetry items that are not
+            in the window are ignored and missing ones are NaN.
+        """
+        self.row[:] = np.nan
+        for name, columns in self.columns.items():
+            if name in telemetry_dict:
+                self.row[columns] = telemetry_dict[name]
+        self.samples[self.num_samples % self.size] = self.row
+        self.num_samples += 1
+
+    def get_statistics(self) -> dict[str, dict[str, float | list[float]]]:
+        """Get the statistics of the telemetry items over the samples in the
+        window.
+
+        Returns
+        -------
+        dict[str, dict[str, float | list[float]]]
+            The value of each telemetry item, by name, for each statistic in
+            `WINDOW_STATISTICS`. The values are NaN if the window has no
+            samples of the telemetry item.
+        """
+        with warnings.catch_warnings():
+            # The rows without samples are NaN, as are the columns without
+            # any sample.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            reductions = {
+                "min": np.nanmin(self.samples, axis=0),
+                "max": np.nanmax(self.samples, axis=0),
+                "mean": np.nanmean(self.samples, axis=0),
+            }
+        return {
+            statistic: {
+                name: (
+                    values[columns].tolist()
+                    if self.is_array[name]
+                    else float(values[columns.start])
+                )
+                for name, columns in self.columns.items()
+            }
+            for statistic, values in reductions.items()
+        }
+
+    def reset(self) -> None:
+        """Remove all samples."""
+        self.samples[:] = np.nan
+        self.num_samples = 0
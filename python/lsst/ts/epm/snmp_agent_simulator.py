@@ -0,0 +1,300 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = ["SnmpAgentSimulator"]
+
+import asyncio
+import bisect
+import logging
+import random
+import typing
+
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pysnmp.proto import api
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchObject
+
+from .snmp_server_simulator import SnmpServerSimulator
+
+# SNMPv1 reports unknown OIDs and the end of the MIB view with the noSuchName
+# error status.
+NO_SUCH_NAME = 2
+
+
+class SnmpAgentSimulator(asyncio.DatagramProtocol):
+    """SNMP agent that answers GET, GETNEXT and GETBULK requests over UDP.
+
+    Unlike `SnmpServerSimulator`, which replaces the request methods of the
+    data clients, this agent is reached over a real UDP socket. The requests
+    and responses are BER encoded and can be delayed or lost, so the data
+    clients can be tested and benchmarked end to end against localhost, with
+    the asyncio and the blocking transport alike.
+
+    The values are generated by a `SnmpServerSimulator` from the same MIB tree
+    the data clients use. The agent serves the system description and the
+    subtree of a single device type.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    device_type : `str`
+        The type of SNMP device to simulate.
+    community : `str`, optional
+        The SNMP community. Requests for other communities are ignored, like
+        a real agent does.
+    latency : `float`, optional
+        The time [s] before each response is sent.
+    jitter : `float`, optional
+        The maximum random deviation [s] from the latency.
+    packet_loss : `float`, optional
+        The fraction of requests that is dropped without a response.
+    table_size : `int` | None, optional
+        The number of rows of each table, or None (the default) for the
+        number of rows of the device type.
+    seed : `int` | None, optional
+        The seed of the random generators of the values, the latency jitter
+        and the packet loss, or None (the default) for a random seed.
+    replay_length : `int`, optional
+        If larger than 0, the number of values per OID that are generated once
+        and then replayed over and over again, see `SnmpServerSimulator`.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        device_type: str,
+        community: str = "public",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        packet_loss: float = 0.0,
+        table_size: int | None = None,
+        seed: int | None = None,
+        replay_length: int = 0,
+    ) -> None:
+        self.log = log.getChild(type(self).__name__)
+        self.community = community
+        self.latency = latency
+        self.jitter = jitter
+        self.packet_loss = packet_loss
+        self.random = random.Random(seed)
+
+        self.snmp_server_simulator = SnmpServerSimulator(
+            log=self.log,
+            device_type=device_type,
+            table_size=table_size,
+            seed=seed,
+            replay_length=replay_length,
+        )
+        mib_tree = self.snmp_server_simulator.mib_tree_holder.mib_tree
+        if device_type not in mib_tree:
+            raise ValueError(f"Unknown device type {device_type!r}.")
+        # The instance OIDs of the MIB view of the agent, in lexicographic
+        # order, to find the successors of the OIDs of the GETNEXT and GETBULK
+        # requests.
+        self.instance_oids = sorted(
+            self.snmp_server_simulator.get_instance_oids(mib_tree["system"].oid)
+            + self.snmp_server_simulator.get_instance_oids(mib_tree[device_type].oid)
+        )
+
+        self.transport: asyncio.DatagramTransport | None = None
+        self.num_requests = 0
+        self.num_dropped_requests = 0
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The host and port the agent listens on.
+
+        Raises
+        ------
+        RuntimeError
+            In case the agent isn't started.
+        """
+        if self.transport is None:
+            raise RuntimeError("The SNMP agent isn't started.")
+        return self.transport.get_extra_info("sockname")[:2]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start listening for requests.
+
+        Parameters
+        ----------
+        host : `str`, optional
+            The host to listen on.
+        port : `int`, optional
+            The port to listen on, or 0 (the default) for a free port.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+
+    def close(self) -> None:
+        """Stop listening for requests."""
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = typing.cast(asyncio.DatagramTransport, transport)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.transport = None
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self.num_requests += 1
+        try:
+            version = int(api.decodeMessageVersion(data))
+            p_mod = api.protoModules[version]
+            msg, _ = decoder.decode(data, asn1Spec=p_mod.Message())
+        except (KeyError, PyAsn1Error) as e:
+            self.log.debug(f"Received undecodable datagram from {addr}: {e!r}.")
+            return
+        if str(p_mod.apiMessage.getCommunity(msg)) != self.community:
+            self.log.debug(f"Received request for unknown community from {addr}.")
+            return
+        if self.random.random() < self.packet_loss:
+            self.num_dropped_requests += 1
+            return
+
+        p_mod.apiMessage.setPDU(msg, self.get_response_pdu(version, msg))
+        response = encoder.encode(msg)
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._send, response, addr)
+        else:
+            self._send(response, addr)
+
+    def get_response_pdu(self, version: int, msg: typing.Any) -> typing.Any:
+        """Get the response PDU to the request PDU of a message.
+
+        Parameters
+        ----------
+        version : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+        msg : `typing.Any`
+            The request message.
+
+        Returns
+        -------
+        typing.Any
+            The response PDU.
+        """
+        p_mod = api.protoModules[version]
+        request_pdu = p_mod.apiMessage.getPDU(msg)
+        response_pdu = p_mod.apiPDU.getResponse(request_pdu)
+        p_mod.apiPDU.setErrorStatus(response_pdu, 0)
+        p_mod.apiPDU.setErrorIndex(response_pdu, 0)
+        request_oids = [
+            oid.asTuple() for oid, _ in p_mod.apiPDU.getVarBinds(request_pdu)
+        ]
+
+        if request_pdu.isSameTypeWith(p_mod.GetRequestPDU()):
+            oids = [(oid, True) for oid in request_oids]
+        elif request_pdu.isSameTypeWith(p_mod.GetNextRequestPDU()):
+            oids = [self.get_next_oid(oid) for oid in request_oids]
+        elif version == api.protoVersion2c and request_pdu.isSameTypeWith(
+            p_mod.GetBulkRequestPDU()
+        ):
+            oids = self.get_bulk_oids(
+                int(p_mod.apiBulkPDU.getNonRepeaters(request_pdu)),
+                int(p_mod.apiBulkPDU.getMaxRepetitions(request_pdu)),
+                request_oids,
+            )
+        else:
+            self.log.debug(f"Unsupported request PDU {request_pdu.__class__.__name__}.")
+            p_mod.apiPDU.setVarBinds(response_pdu, [])
+            return response_pdu
+
+        var_binds = self.snmp_server_simulator.get_var_binds(
+            [oid for oid, in_view in oids if in_view]
+        )
+        values = iter(value for _, value in var_binds)
+        response_var_binds = []
+        for i, (oid, in_view) in enumerate(oids):
+            value = next(values) if in_view else EndOfMibView("")
+            if version == 0 and isinstance(value, (NoSuchObject, EndOfMibView)):
+                # SNMPv1 reports the first unknown OID in the error status and
+                # returns the var binds of the request.
+                p_mod.apiPDU.setErrorStatus(response_pdu, NO_SUCH_NAME)
+                p_mod.apiPDU.setErrorIndex(response_pdu, i + 1)
+                response_var_binds = p_mod.apiPDU.getVarBinds(request_pdu)
+                break
+            response_var_binds.append((oid, value))
+        p_mod.apiPDU.setVarBinds(response_pdu, response_var_binds)
+        return response_pdu
+
+    def get_next_oid(self, oid: tuple[int, ...]) -> tuple[tuple[int, ...], bool]:
+        """Get the lexicographic successor of an OID.
+
+        Parameters
+        ----------
+        oid : `tuple`[`int`, ...]
+            The OID.
+
+        Returns
+        -------
+        tuple[tuple[int, ...], bool]
+            The first instance OID after the OID and True, or the OID itself
+            and False at the end of the MIB view.
+        """
+        i = bisect.bisect_right(self.instance_oids, oid)
+        if i < len(self.instance_oids):
+            return self.instance_oids[i], True
+        return oid, False
+
+    def get_bulk_oids(
+        self,
+        non_repeaters: int,
+        max_repetitions: int,
+        oids: list[tuple[int, ...]],
+    ) -> list[tuple[tuple[int, ...], bool]]:
+        """Get the OIDs of the var binds of a GETBULK response.
+
+        Parameters
+        ----------
+        non_repeaters : `int`
+            The number of leading OIDs for which only a single successor is
+            requested.
+        max_repetitions : `int`
+            The maximum number of successors requested for the other OIDs.
+        oids : `list`[`tuple`[`int`, ...]]
+            The OIDs of the request.
+
+        Returns
+        -------
+        list[tuple[tuple[int, ...], bool]]
+            The successor OIDs, each with False if it is at the end of the MIB
+            view. The successors of the repeated OIDs are interleaved, like
+            RFC 3416 prescribes.
+        """
+        bulk_oids = [self.get_next_oid(oid) for oid in oids[:non_repeaters]]
+        repeated_oids = oids[non_repeaters:]
+        for _ in range(max_repetitions if repeated_oids else 0):
+            next_oids = [self.get_next_oid(oid) for oid in repeated_oids]
+            bulk_oids += next_oids
+            if not any(in_view for _, in_view in next_oids):
+                break
+            repeated_oids = [oid for oid, _ in next_oids]
+        return bulk_oids
+
+    def _send(self, data: bytes, addr: tuple[str, int]) -> None:
+        if self.transport is not None:
+            self.transport.sendto(data, addr)
@@ -0,0 +1,245 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+__all__ = [
+    "SnmpCaptureRecord",
+    "SnmpCaptureReplayer",
+    "SnmpCaptureWriter",
+    "read_snmp_capture",
+]
+
+import asyncio
+import pathlib
+import struct
+import time
+import typing
+from dataclasses import dataclass
+
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pysnmp.proto import api
+from pysnmp.proto.rfc1902 import ObjectName, OctetString
+
+# The first bytes of a binary capture file, which include the version of the
+# file format.
+CAPTURE_MAGIC = b"TSEPMCAP\x01"
+
+# The header of each record: the UTC time [unix seconds] of the poll and the
+# length of the BER encoded var binds that follow.
+RECORD_HEADER = struct.Struct("<dI")
+
+# The var binds are BER encoded as those of an SNMPv2c response PDU.
+_P_MOD = api.protoModules[api.protoVersion2c]
+
+
+@dataclass(frozen=True)
+class SnmpCaptureRecord:
+    """The var binds of a single poll of an SNMP device, as captured."""
+
+    timestamp: float
+    var_binds: list[tuple[ObjectName, typing.Any]]
+
+
+class SnmpCaptureWriter:
+    """Append the var binds of polls to a binary capture file.
+
+    The file starts with `CAPTURE_MAGIC`, followed by one record per poll.
+    Each record consists of a `RECORD_HEADER`, with the time of the poll and
+    the length of the var binds, and the var binds, BER encoded like those of
+    an SNMPv2c response PDU. Appending to an existing capture file continues
+    the capture.
+
+    Parameters
+    ----------
+    path : `str` | `pathlib.Path`
+        The path of the capture file.
+    """
+
+    def __init__(self, path: str | pathlib.Path) -> None:
+        self.path = pathlib.Path(path)
+        self.file = open(self.path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(CAPTURE_MAGIC)
+        self.num_records = 0
+
+    def write(
+        self,
+        var_binds: typing.Iterable[tuple[typing.Any, typing.Any]],
+        timestamp: float | None = None,
+    ) -> None:
+        """Append the var binds of a poll.
+
+        Parameters
+        ----------
+        var_binds : `typing.Iterable`
+            The OID and the pysnmp value of each var bind. The OIDs can be
+            strings, tuples of ints or `ObjectName` instances.
+        timestamp : `float` | None, optional
+            The UTC time [unix seconds] of the poll, or None (the default)
+            for the current time.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        pdu = _P_MOD.ResponsePDU()
+        _P_MOD.apiPDU.setDefaults(pdu)
+        _P_MOD.apiPDU.setVarBinds(pdu, list(var_binds))
+        data = encoder.encode(_P_MOD.apiPDU.getVarBindList(pdu))
+        self.file.write(RECORD_HEADER.pack(timestamp, len(data)) + data)
+        self.file.flush()
+        self.num_records += 1
+
+    def close(self) -> None:
+        """Close the capture file."""
+        self.file.close()
+
+
+def read_snmp_capture(path: str | pathlib.Path) -> list[SnmpCaptureRecord]:
+    """Read a capture file.
+
+    Both binary capture files, written by `SnmpCaptureWriter`, and text
+    captures, with a line "<OID>:<value>" per var bind, can be read. A text
+    capture contains a single poll without time, so its timestamp is 0 and
+    all values are octet strings.
+
+    Parameters
+    ----------
+    path : `str` | `pathlib.Path`
+        The path of the capture file.
+
+    Returns
+    -------
+    list[SnmpCaptureRecord]
+        The records, one per poll.
+
+    Raises
+    ------
+    ValueError
+        In case the file is not a valid capture file.
+    """
+    data = pathlib.Path(path).read_bytes()
+    if not data.startswith(CAPTURE_MAGIC):
+        return [_parse_text_capture(data.decode("utf-8"), path)]
+
+    records: list[SnmpCaptureRecord] = []
+    offset = len(CAPTURE_MAGIC)
+    var_bind_list_spec = _P_MOD.apiPDU.getVarBindList(_P_MOD.ResponsePDU())
+    while offset < len(data):
+        if offset + RECORD_HEADER.size > len(data):
+            raise ValueError(f"Truncated record header at byte {offset} of {path}.")
+        timestamp, length = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        if offset + length > len(data):
+            raise ValueError(f"Truncated record at byte {offset} of {path}.")
+        try:
+            var_bind_list, _ = decoder.decode(
+                data[offset : offset + length], asn1Spec=var_bind_list_spec
+            )
+        except PyAsn1Error as e:
+            raise ValueError(f"Invalid record at byte {offset} of {path}: {e!r}.")
+        offset += length
+        records.append(
+            SnmpCaptureRecord(
+                timestamp=timestamp,
+                var_binds=[
+                    _P_MOD.apiVarBind.getOIDVal(var_bind) for var_bind in var_bind_list
+                ],
+            )
+        )
+    return records
+
+
+def _parse_text_capture(text: str, path: str | pathlib.Path) -> SnmpCaptureRecord:
+    """Parse a text capture, with a line "<OID>:<value>" per var bind."""
+    var_binds: list[tuple[ObjectName, typing.Any]] = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        oid, separator, value = line.partition(":")
+        try:
+            if not separator:
+                raise ValueError("Missing ':'.")
+            var_binds.append((ObjectName(oid), OctetString(value)))
+        except (PyAsn1Error, ValueError) as e:
+            raise ValueError(f"Invalid line {line_number} of {path}: {e!r}.")
+    return SnmpCaptureRecord(timestamp=0.0, var_binds=var_binds)
+
+
+class SnmpCaptureReplayer:
+    """Replay the polls of a capture file.
+
+    The polls are replayed in order, over and over again. Each time the
+    capture starts over, the time offsets restart as well.
+
+    Parameters
+    ----------
+    path : `str` | `pathlib.Path`
+        The path of the capture file, see `read_snmp_capture`.
+    speed : `float`, optional
+        The replay speed relative to the time of the polls in the capture; 1
+        (the default) to replay at the real-time rate of the capture and 0 to
+        replay as fast as possible.
+
+    Raises
+    ------
+    ValueError
+        In case the file is not a valid capture file or contains no polls.
+    """
+
+    def __init__(self, path: str | pathlib.Path, speed: float = 1.0) -> None:
+        self.path = pathlib.Path(path)
+        self.speed = speed
+        self.records = read_snmp_capture(self.path)
+        if not self.records:
+            raise ValueError(f"No polls in capture file {self.path}.")
+        self.record_index = 0
+        # The monotonic time at which the capture was started over last.
+        self.start_time: float | None = None
+
+    @property
+    def starts_over(self) -> bool:
+        """Whether the next record starts the capture over, after it was
+        replayed before, in which case the capture doesn't tell when the
+        next poll is due."""
+        return self.start_time is not None and self.record_index >= len(self.records)
+
+    async def next_record(self) -> SnmpCaptureRecord:
+        """Wait until the next poll is due and return it.
+
+        Returns
+        -------
+        SnmpCaptureRecord
+            The record of the poll.
+        """
+        if self.record_index >= len(self.records):
+            self.record_index = 0
+        record = self.records[self.record_index]
+        if self.record_index == 0:
+            self.start_time = time.monotonic()
+        elif self.speed > 0:
+            assert self.start_time is not None
+            offset = (record.timestamp - self.records[0].timestamp) / self.speed
+            delay = self.start_time + offset - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self.record_index += 1
+        return record
@@ -22,10 +22,14 @@
 __all__ = ["SnmpDataClient"]
 
 import asyncio
+import collections
 import concurrent
+import functools
 import logging
 import math
+import operator
 import re
+import time
 import types
 import typing
 
@@ -33,19 +37,40 @@ import yaml
 from lsst.ts import salobj
 from lsst.ts.ess import common
 from lsst.ts.salobj.topics import WriteTopic
+from pyasn1.type import univ
 from pysnmp.hlapi import (
-    CommunityData,
     ContextData,
     ObjectIdentity,
     ObjectType,
     SnmpEngine,
     UdpTransportTarget,
+    bulkCmd,
+    getCmd,
     nextCmd,
 )
+from pysnmp.proto.rfc1902 import ObjectName
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
 
-from .mib_tree_holder import MibTreeHolder
+from .circuit_breaker import CircuitBreaker, CircuitBreakerState
+from .deadband_filter import DeadbandFilter
+from .field_group_scheduler import FieldGroupScheduler
+from .mib_tree_holder import get_shared_mib_tree_holder
+from .poll_scheduler import PollScheduler
+from .poll_timings import PollTimings, report_poll_timings
+from .sample_window import SampleWindow
+from .snmp_capture import SnmpCaptureReplayer, SnmpCaptureWriter
+from .snmp_engine_pool import get_shared_snmp_engine_pool
 from .snmp_server_simulator import SnmpServerSimulator
-from .utils import FREQUENCY_OID_LIST, TelemetryItemName, TelemetryItemType
+from .snmp_transport import TIMEOUT_ERROR_INDICATION, SnmpResponse, SnmpTransport
+from .utils import (
+    FREQUENCY_OID_LIST,
+    TelemetryItemName,
+    TelemetryItemType,
+    TelemetryPlanItem,
+)
+
+# SNMP error status of a response that doesn't fit in a single message.
+TOO_BIG = 1
 
 hex_const_pattern = r"([a-zA-Z0-9]*)"
 hx = re.compile(hex_const_pattern)
@@ -73,6 +98,10 @@ class SnmpDataClient(common.data_client.BaseReadLoopDataClient):
         Logger.
     simulation_mode : `int`, optional
         Simulation mode; 0 for normal operation.
+    snmp_transport : `SnmpTransport` | None, optional
+        The transport to send the asyncio SNMP requests with, or None (the
+        default) to borrow the transport of the shared `SnmpEnginePool`. A
+        transport that is passed in is not closed by `disconnect`.
 
     Notes
     -----
@@ -86,6 +115,7 @@ class SnmpDataClient(common.data_client.BaseReadLoopDataClient):
         topics: salobj.Controller | types.SimpleNamespace,
         log: logging.Logger,
         simulation_mode: int = 0,
+        snmp_transport: SnmpTransport | None = None,
     ) -> None:
         super().__init__(
             config=config,
@@ -94,26 +124,155 @@ class SnmpDataClient(common.data_client.BaseReadLoopDataClient):
             simulation_mode=simulation_mode,
         )
 
-        self.mib_tree_holder = MibTreeHolder()
+        self.mib_tree_holder = get_shared_mib_tree_holder(config.device_type)
 
         self.device_type = self.config.device_type
 
-        # Attributes for the SNMP requests.
-        self.snmp_engine = SnmpEngine()
-        self.community_data = CommunityData(self.config.snmp_community, mpModel=0)
-        self.transport_target = UdpTransportTarget((self.config.host, self.config.port))
-        self.context_data = ContextData()
-        self.object_type = ObjectType(
-            ObjectIdentity(self.mib_tree_holder.mib_tree["system"].oid)
+        # The OID of the subtree to walk.
+        self.walk_oid = self.mib_tree_holder.mib_tree["system"].oid
+
+        # Attributes for the asyncio SNMP requests.
+        self.address = (self.config.host, self.config.port)
+        # The SNMP transport and an engine are borrowed from the pool shared
+        # by all data clients while reading.
+        self.snmp_engine_pool = get_shared_snmp_engine_pool()
+        self.borrows_snmp_transport = snmp_transport is None
+        self.snmp_transport_borrowed = False
+        self.snmp_transport = (
+            self.snmp_engine_pool.snmp_transport
+            if snmp_transport is None
+            else snmp_transport
         )
 
-        # Keep track of the nextCmd function so we can override it when in
-        # simulation mode.
+        # Attributes for the blocking SNMP requests. The engine and the
+        # executor are borrowed from the pool in `setup_reading`.
+        self.snmp_engine: SnmpEngine | None = None
+        self.executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self.community_data = self.snmp_engine_pool.get_community_data(
+            self.config.snmp_community, 0
+        )
+        self.bulk_community_data = self.snmp_engine_pool.get_community_data(
+            self.config.snmp_community, 1
+        )
+        self.transport_target: UdpTransportTarget | None = None
+        self.context_data = ContextData()
+
+        # Keep track of the get, walk, getCmd, nextCmd and bulkCmd functions
+        # so we can override them when in simulation mode.
+        self.get = self.snmp_transport.get_cmd
+        self.walk = self.snmp_transport.walk
+        self.bulk_walk = self.snmp_transport.bulk_walk
+        self.get_cmd = getCmd
         self.next_cmd = nextCmd
+        self.bulk_cmd = bulkCmd
+
+        # Walk with SNMPv2c GETBULK requests, until the agent turns out not to
+        # support them. A GETBULK walk that timed out is repeated with GETNEXT
+        # requests by the next walk.
+        self.use_getbulk = self.config.walk_mode == "getbulk"
+        self.retry_walk_with_getnext = False
+
+        # The instance OIDs of the telemetry items, which are requested with
+        # GET requests. None means that they need to be discovered by a walk.
+        self.get_oids: list[tuple[int, ...]] | None = None
+        self.max_get_var_binds = self.config.max_get_var_binds
+
+        # Whether the last walk received the whole subtree, and the number of
+        # times walks were resumed after a timeout.
+        self.walk_complete = False
+        self.num_walk_resumes = 0
+        # Whether the last walk was cancelled before it ended, for instance
+        # because it took longer than the poll interval of
+        # SnmpMultiDataClient, in which case the next walk resumes it.
+        self.walk_interrupted = False
 
-        # Attributes for telemetry processing.
-        self.snmp_result: dict[str, str] = {}
+        # Attributes for telemetry processing. The OIDs are tuples of ints and
+        # the values are the pysnmp values as received.
+        self.snmp_result: dict[tuple[int, ...], typing.Any] = {}
+        # The rows of the table columns of the telemetry items, as (row index,
+        # value) tuples per column OID.
+        self.column_oids: frozenset[tuple[int, ...]] = frozenset()
+        self.snmp_columns: collections.defaultdict[
+            tuple[int, ...], list[tuple[int, typing.Any]]
+        ] = collections.defaultdict(list)
         self.system_description = "No system description set."
+        self.telemetry_topic: WriteTopic | types.SimpleNamespace | None = None
+
+        # Poll at a fixed rate, regardless of how long each poll takes.
+        self.poll_scheduler = PollScheduler(
+            interval=self.config.poll_interval, log=self.log
+        )
+        self.telemetry_plan: tuple[TelemetryPlanItem, ...] = ()
+
+        # The durations of the stages of the polls.
+        self.poll_timings = PollTimings(device_name=self.config.device_name)
+        self.timing_summary_time: float | None = None
+
+        # Only publish telemetry that changed, if so configured.
+        self.deadband_filter: DeadbandFilter | None = None
+        if self.config.publish_mode == "on_change":
+            self.deadband_filter = DeadbandFilter(
+                max_silence=self.config.max_silence,
+                absolute_deadband=self.config.absolute_deadband,
+                relative_deadband=self.config.relative_deadband,
+                deadbands=self.config.deadbands,
+            )
+
+        # Read groups of telemetry items at their own interval, with the last
+        # values read of the other groups.
+        self.field_group_scheduler = FieldGroupScheduler(
+            field_groups=self.config.field_groups,
+            tolerance=self.config.poll_interval / 2,
+        )
+        # The groups read by the current poll.
+        self.polled_groups = self.field_group_scheduler.group_names
+        # The OIDs to get per group, or None for the telemetry items that are
+        # not in any group.
+        self.group_get_oids: dict[str | None, list[tuple[int, ...]]] = {}
+        self.telemetry_cache: dict[str, typing.Any] = {}
+
+        # Sample the float telemetry items every poll and publish statistics
+        # over a window of polls, if so configured.
+        self.sample_window: SampleWindow | None = None
+        self.window_telemetry_statistics: dict[str, dict[str, float | list[float]]] = {}
+
+        # Hold off polling the device while it doesn't respond.
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.config.max_read_timeouts,
+            min_backoff=self.config.min_backoff,
+            max_backoff=self.config.max_backoff,
+            jitter=self.config.backoff_jitter,
+        )
+        # Whether a request of the current poll got no response, and whether
+        # any request of the current poll got one.
+        self.request_failed = False
+        self.poll_responded = False
+        # The loop time [s] after which a walk of the current poll isn't
+        # resumed, or None if it always is resumed.
+        self.poll_deadline: float | None = None
+
+        # Capture the var binds of each poll to a file, or replay them from
+        # one, if so configured.
+        self.snmp_capture_writer: SnmpCaptureWriter | None = None
+        self.snmp_capture_replayer: SnmpCaptureReplayer | None = None
+        if self.config.replay_file:
+            self.snmp_capture_replayer = SnmpCaptureReplayer(
+                self.config.replay_file, speed=self.config.replay_speed
+            )
+
+        # The ways in which float values can be encoded, in the order in
+        # which they are tried, and the one that worked last for each OID.
+        self.float_decoder_strategies: tuple[
+            typing.Callable[[typing.Any], float], ...
+        ] = (
+            self._decode_float_from_integer,
+            self._decode_float_from_octets,
+            self._decode_float_from_text,
+            self._decode_float_from_hex,
+        )
+        self.float_decoders: dict[
+            tuple[int, ...], typing.Callable[[typing.Any], float]
+        ] = {}
 
     @classmethod
     def get_config_schema(cls) -> dict[str, typing.Any]:
@@ -133,7 +292,9 @@ properties:
     type: integer
     default: 161
   max_read_timeouts:
-    description: Maximum number of read timeouts before an exception is raised.
+    description: >-
+      Maximum number of consecutive polls without any response before the
+      device is held off, see min_backoff.
     type: integer
     default: 5
   device_name:
@@ -151,9 +312,213 @@ properties:
     type: string
     default: public
   poll_interval:
-    description: The amount of time [s] between each telemetry poll.
+    description: >-
+      The amount of time [s] between the start of each telemetry poll. If a
+      poll takes longer, the next poll starts right away.
+    type: number
+    default: 1.0
+  snmp_transport:
+    description: >-
+      How the SNMP requests are sent. With asyncio the requests are sent from
+      the event loop. With blocking the pysnmp nextCmd is run in a thread.
+    type: string
+    enum:
+    - asyncio
+    - blocking
+    default: asyncio
+  walk_mode:
+    description: >-
+      How the device subtree is walked. With getnext an SNMPv1 GETNEXT
+      request is sent for each OID. With getbulk SNMPv2c GETBULK requests are
+      sent, each returning up to max_repetitions OIDs. Agents that don't
+      respond to SNMPv2c requests automatically are walked with getnext.
+    type: string
+    enum:
+    - getnext
+    - getbulk
+    default: getbulk
+  non_repeaters:
+    description: >-
+      The number of leading OIDs of each GETBULK request for which only a
+      single successor is requested.
+    type: integer
+    minimum: 0
+    default: 0
+  max_repetitions:
+    description: The maximum number of OIDs returned per GETBULK request.
+    type: integer
+    minimum: 1
+    default: 25
+  read_mode:
+    description: >-
+      How the telemetry is read. With walk the whole device subtree is walked
+      every poll. With get the subtree only is walked to discover the OIDs of
+      the telemetry items, which then are read with GET requests.
+    type: string
+    enum:
+    - walk
+    - get
+    default: get
+  max_get_var_binds:
+    description: The maximum number of OIDs requested per GET request.
+    type: integer
+    minimum: 1
+    default: 20
+  publish_mode:
+    description: >-
+      When the telemetry is published. With every_poll it is published after
+      each poll. With on_change it only is published if a telemetry item
+      changed by more than its deadband, or if it wasn't published for
+      max_silence seconds.
+    type: string
+    enum:
+    - every_poll
+    - on_change
+    default: every_poll
+  absolute_deadband:
+    description: >-
+      The default absolute deadband of the numeric telemetry items, with
+      publish_mode on_change.
+    type: number
+    minimum: 0
+    default: 0
+  relative_deadband:
+    description: >-
+      The default deadband of the numeric telemetry items, as a fraction of
+      the last published value, with publish_mode on_change.
+    type: number
+    minimum: 0
+    default: 0
+  deadbands:
+    description: >-
+      The absolute and relative deadbands of individual telemetry items, by
+      name, which override the default deadbands.
+    type: object
+    additionalProperties:
+      type: object
+      properties:
+        absolute:
+          type: number
+          minimum: 0
+        relative:
+          type: number
+          minimum: 0
+      additionalProperties: false
+    default: {}
+  field_groups:
+    description: >-
+      Groups of telemetry items that are read at their own interval [s], by
+      group name, with read_mode get. A group with an interval of 0 only is
+      read when the OIDs of the telemetry items are discovered, which suits
+      static telemetry items. Telemetry items that are not in any group are
+      read every poll. The last value read of the telemetry items that are not
+      read is published.
+    type: object
+    additionalProperties:
+      type: object
+      properties:
+        interval:
+          type: number
+          minimum: 0
+        items:
+          type: array
+          items:
+            type: string
+      required:
+      - interval
+      - items
+      additionalProperties: false
+    default: {}
+  max_silence:
+    description: >-
+      The maximum amount of time [s] between publishing the telemetry with
+      publish_mode on_change, even if nothing changed.
+    type: number
+    exclusiveMinimum: 0
+    default: 60.0
+  window_size:
+    description: >-
+      The number of polls per published sample. If larger than 1, the float
+      telemetry items are published once every window_size polls, as the
+      statistic in window_statistics over those polls. The other telemetry
+      items are published with their last value.
+    type: integer
+    minimum: 1
+    default: 1
+  window_statistics:
+    description: >-
+      The statistic over the polls of a window that is published for
+      individual float telemetry items, by name. The default is mean.
+    type: object
+    additionalProperties:
+      type: string
+      enum:
+      - min
+      - max
+      - mean
+    default: {}
+  timing_summary_interval:
+    description: >-
+      The amount of time [s] between logging a summary of the durations of the
+      poll stages. 0 means never.
+    type: number
+    minimum: 0
+    default: 600.0
+  timing_prometheus_file:
+    description: >-
+      The path of the file to write the histograms of the durations of the
+      poll stages to, in the Prometheus text format, each time the summary is
+      logged. An empty string means no file is written.
+    type: string
+    default: ""
+  capture_file:
+    description: >-
+      The path of the binary capture file to append the var binds of each
+      poll to, with the time of the poll. An empty string means nothing is
+      captured.
+    type: string
+    default: ""
+  replay_file:
+    description: >-
+      The path of a capture file to replay instead of reading from the SNMP
+      server, either a binary capture file or a text file with a line
+      "<OID>:<value>" per var bind. The polls are replayed over and over
+      again. An empty string means the SNMP server is read.
+    type: string
+    default: ""
+  replay_speed:
+    description: >-
+      The speed at which replay_file is replayed, relative to the time of
+      the captured polls. 1 replays in real time and 0 as fast as possible.
+      The replayed polls only wait for poll_interval when the capture starts
+      over, and not at all if replay_speed is 0.
     type: number
+    minimum: 0
     default: 1.0
+  min_backoff:
+    description: >-
+      The amount of time [s] during which the device is not polled, after
+      max_read_timeouts consecutive polls without any response. Then a single
+      OID is requested as a probe. Each time the probe fails, the amount of
+      time doubles, up to max_backoff.
+    type: number
+    exclusiveMinimum: 0
+    default: 10.0
+  max_backoff:
+    description: >-
+      The maximum amount of time [s] during which a device that doesn't
+      respond is not polled. Needs to be at least min_backoff.
+    type: number
+    exclusiveMinimum: 0
+    default: 300.0
+  backoff_jitter:
+    description: >-
+      The maximum random deviation of the amount of time during which a device
+      that doesn't respond is not polled, as a fraction of that time.
+    type: number
+    minimum: 0
+    maximum: 1
+    default: 0.1
 required:
   - host
   - port
@@ -179,58 +544,273 @@ additionalProperties: false
         In this case the system description is retrieved and stored in memory,
         since this is not expected to change.
         """
-        if self.simulation_mode == 1:
-            snmp_server_simulator = SnmpServerSimulator(log=self.log)
-            self.next_cmd = snmp_server_simulator.snmp_cmd
+        if self.snmp_capture_replayer is not None:
+            # The SNMP server isn't read at all.
+            await self.execute_replay()
+        else:
+            if self.simulation_mode == 1:
+                snmp_server_simulator = SnmpServerSimulator(
+                    log=self.log, device_type=self.device_type
+                )
+                self.get = snmp_server_simulator.get
+                self.walk = snmp_server_simulator.walk
+                self.bulk_walk = snmp_server_simulator.bulk_walk
+                self.get_cmd = snmp_server_simulator.snmp_get_cmd
+                self.next_cmd = snmp_server_simulator.snmp_cmd
+                self.bulk_cmd = snmp_server_simulator.snmp_bulk_cmd
+            elif self.config.snmp_transport == "asyncio":
+                if not self.borrows_snmp_transport:
+                    await self.snmp_transport.connect()
+                elif not self.snmp_transport_borrowed:
+                    await self.snmp_engine_pool.borrow_transport()
+                    self.snmp_transport_borrowed = True
+            if self.config.snmp_transport == "blocking" and self.snmp_engine is None:
+                self.snmp_engine, self.executor = self.snmp_engine_pool.borrow_engine()
+                self.transport_target = self.snmp_engine_pool.get_transport_target(
+                    self.config.host, self.config.port
+                )
 
-        # Call the blocking `execute_next_cmd` method from within the async
-        # loop.
-        loop = asyncio.get_running_loop()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-            await loop.run_in_executor(pool, self.execute_next_cmd)
+            await self.execute_walk(retry_after_timeout=True)
+
+        if self.config.capture_file and self.snmp_capture_writer is None:
+            self.snmp_capture_writer = SnmpCaptureWriter(self.config.capture_file)
+        self.capture_snmp_result()
 
         # Only the sysDescr value is expected at this moment.
-        sys_descr = self.mib_tree_holder.mib_tree["sysDescr"].oid + ".0"
+        sys_descr = self.mib_tree_holder.mib_tree["sysDescr"].oid_tuple + (0,)
         if sys_descr in self.snmp_result:
-            self.system_description = self.snmp_result[sys_descr]
+            self.system_description = self.snmp_result[sys_descr].prettyPrint()
         else:
             self.log.error("Could not retrieve sysDescr. Continuing.")
 
-        # Create the ObjectType for the particular SNMP device type.
+        # Walk the subtree of the particular SNMP device type from now on.
         if self.device_type in self.mib_tree_holder.mib_tree:
-            self.object_type = ObjectType(
-                ObjectIdentity(self.mib_tree_holder.mib_tree[self.device_type].oid)
-            )
+            self.walk_oid = self.mib_tree_holder.mib_tree[self.device_type].oid
         else:
             raise ValueError(
                 f"Unknown device type {self.device_type!r}. "
                 "Continuing querying only for 'sysDescr'."
             )
 
+        self.telemetry_topic = getattr(self.topics, f"tel_{self.device_type}")
+        self.telemetry_plan = self.compile_telemetry_plan(self.telemetry_topic)
+        self.column_oids = frozenset(
+            plan_item.oid for plan_item in self.telemetry_plan if plan_item.is_array
+        )
+        if self.config.window_size > 1:
+            self.sample_window = SampleWindow(
+                array_lengths={
+                    plan_item.name: plan_item.array_length
+                    for plan_item in self.telemetry_plan
+                    if isinstance(plan_item.missing_value, float)
+                },
+                size=self.config.window_size,
+            )
+
     async def read_data(self) -> None:
-        """Read data from the SNMP server."""
-        # Call the blocking `execute_next_cmd` method from within the async
-        # loop.
-        loop = asyncio.get_running_loop()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-            await loop.run_in_executor(pool, self.execute_next_cmd)
-
-        telemetry_topic = getattr(self.topics, f"tel_{self.device_type}")
-        telemetry_dict: dict[str, typing.Any] = {
-            "systemDescription": self.system_description
+        """Read data from the SNMP server.
+
+        Each poll starts at the next tick of `poll_scheduler`, except when
+        replaying a capture file, which is paced by `snmp_capture_replayer`
+        at ``replay_speed``. Since the capture doesn't tell when it is due,
+        the poll that starts the capture over, which always is the case for
+        a capture with a single poll, starts ``poll_interval`` seconds after
+        the previous one, unless ``replay_speed`` is 0.
+        """
+        replayer = self.snmp_capture_replayer
+        if replayer is None:
+            await self.poll_scheduler.wait_for_next_tick()
+        elif replayer.speed > 0 and replayer.starts_over:
+            await asyncio.sleep(self.config.poll_interval)
+        else:
+            # Let other tasks run, even if the replayed poll is due already.
+            await asyncio.sleep(0)
+        await self.poll(deadline=self.poll_scheduler.deadline)
+
+    async def poll(self, deadline: float | None = None) -> None:
+        """Read the telemetry items from the SNMP server once and publish
+        them, unless `deadband_filter` finds that they didn't change.
+
+        The durations of the request, decode and publish stages, and of the
+        whole poll, are added to `poll_timings`.
+
+        Only the field groups that are due are read with GET requests, see
+        `field_group_scheduler`. If `sample_window` is set, the telemetry only
+        is published once the window is complete.
+
+        While `circuit_breaker` is open, the SNMP server isn't polled and
+        nothing is published. Once it is half open, the server only is polled
+        if it responds to a `probe`.
+
+        Parameters
+        ----------
+        deadline : `float` | None, optional
+            The loop time [s] at which the next poll is due, after which a
+            walk that timed out isn't resumed, see `should_resume_walk`, or
+            None (the default) to always resume it.
+        """
+        self.poll_deadline = deadline
+        self.poll_responded = False
+        if not self.circuit_breaker.allow_request():
+            return
+        if self.circuit_breaker.state == CircuitBreakerState.HALF_OPEN:
+            if not await self.probe():
+                return
+
+        with self.poll_timings.time_stage("poll"):
+            with self.poll_timings.time_stage("request"):
+                self.request_failed = False
+                self.polled_groups = self.field_group_scheduler.group_names
+                if self.snmp_capture_replayer is not None:
+                    await self.execute_replay()
+                elif self.config.read_mode == "get" and self.get_oids is not None:
+                    self.polled_groups = self.field_group_scheduler.get_due_groups()
+                    await self.execute_get()
+                else:
+                    await self.execute_walk()
+                    if self.config.read_mode == "get" and self.walk_complete:
+                        self.get_oids = self.get_instance_oids()
+            self.capture_snmp_result()
+            if self.request_failed and not self.snmp_result:
+                self.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+                self.field_group_scheduler.record_poll(self.polled_groups)
+
+            assert self.telemetry_topic is not None
+            with self.poll_timings.time_stage("decode"):
+                telemetry_dict = self.execute_telemetry_plan()
+                # The telemetry to publish, which is None while the sample
+                # window isn't complete.
+                publish_dict: dict[str, typing.Any] | None = telemetry_dict
+                if self.sample_window is not None:
+                    publish_dict = self.get_window_telemetry(telemetry_dict)
+            if publish_dict is not None and (
+                self.deadband_filter is None
+                or self.deadband_filter.should_publish(publish_dict)
+            ):
+                with self.poll_timings.time_stage("publish"):
+                    await self.telemetry_topic.set_write(**publish_dict)
+        self.report_timings_if_due()
+
+    async def probe(self) -> bool:
+        """Request the system description, as a single OID, to determine
+        whether the SNMP server responds, and record the outcome in
+        `circuit_breaker`.
+
+        Returns
+        -------
+        bool
+            True if the SNMP server responded, False otherwise.
+        """
+        oid = self.mib_tree_holder.mib_tree["sysDescr"].oid_tuple + (0,)
+        if self.config.snmp_transport == "blocking":
+            assert self.executor is not None
+            loop = asyncio.get_running_loop()
+            responses = await loop.run_in_executor(
+                self.executor, self.execute_get_cmd, [[oid]]
+            )
+            error_indication = responses[0][0]
+        else:
+            version = 1 if self.use_getbulk else 0
+            response = await self.get(
+                self.address, self.config.snmp_community, version, [oid]
+            )
+            error_indication = response[0]
+
+        if error_indication:
+            self.log.debug(f"Probe failed with {error_indication=}.")
+            self.record_failure()
+            return False
+        self.log.info(f"{self.descr()} responds again. Resuming polls.")
+        self.circuit_breaker.record_success()
+        return True
+
+    def record_failure(self) -> None:
+        """Record a poll or probe without response in `circuit_breaker` and
+        log it if that holds off the polls."""
+        self.circuit_breaker.record_failure()
+        if self.circuit_breaker.state == CircuitBreakerState.OPEN:
+            assert self.circuit_breaker.probe_time is not None
+            self.log.warning(
+                f"{self.descr()} doesn't respond. Holding off polls for "
+                f"{self.circuit_breaker.probe_time - time.monotonic():0.1f} s."
+            )
+
+    def get_timing_statistics(self) -> dict[str, dict[str, float]]:
+        """Get the statistics of the durations of the poll stages and of the
+        poll schedule.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            The count and the mean, percentile and maximum durations [s] of
+            each stage, by stage name, and the overrun and lateness statistics
+            of `poll_scheduler` as stage "schedule".
+        """
+        return {
+            **self.poll_timings.get_statistics(),
+            "schedule": self.poll_scheduler.get_statistics(),
         }
 
+    def report_timings_if_due(self) -> None:
+        """Report the poll timings with `report_poll_timings` every
+        ``timing_summary_interval`` seconds."""
+        if self.config.timing_summary_interval <= 0:
+            return
+        now = time.monotonic()
+        if self.timing_summary_time is None:
+            self.timing_summary_time = now
+        elif now - self.timing_summary_time >= self.config.timing_summary_interval:
+            self.timing_summary_time = now
+            report_poll_timings(
+                [self.poll_timings], self.log, self.config.timing_prometheus_file
+            )
+            self.log.info(
+                f"{self.config.device_name} poll schedule: "
+                f"{self.poll_scheduler.format_summary()}"
+            )
+
+    def compile_telemetry_plan(
+        self, telemetry_topic: WriteTopic | types.SimpleNamespace
+    ) -> tuple[TelemetryPlanItem, ...]:
+        """Compile the plan for reading the items of the telemetry topic.
+
+        All information that doesn't change from poll to poll is looked up
+        here once, so reading the telemetry only needs to execute the plan.
+
+        Parameters
+        ----------
+        telemetry_topic : `WriteTopic` | `types.SimpleNameSpace`
+            The telemetry topic containing the telemetry items.
+
+        Returns
+        -------
+        tuple[TelemetryPlanItem, ...]
+            The plan item of each telemetry item.
+
+        Raises
+        ------
+        ValueError
+            In case a telemetry item is unknown.
+        """
         # Make the code work with both the DDS and Kafka versions of ts_salobj.
         if hasattr(telemetry_topic, "metadata"):
-            fields = telemetry_topic.metadata.field_info
+            array_lengths = {
+                name: field.array_length
+                for name, field in telemetry_topic.metadata.field_info.items()
+            }
         elif hasattr(telemetry_topic, "topic_info"):
-            fields = telemetry_topic.topic_info.fields
+            array_lengths = {
+                name: field.count if field.count > 1 else None
+                for name, field in telemetry_topic.topic_info.fields.items()
+            }
         else:
-            fields = {}
+            array_lengths = {}
 
         telemetry_items = [
             i
-            for i in fields
+            for i in array_lengths
             if not (
                 i.startswith("private_")
                 or i.startswith("_")
@@ -239,107 +819,153 @@ additionalProperties: false
             )
         ]
 
+        # The float decoders also need the OID, see below.
+        decoders: dict[
+            str, tuple[typing.Callable[[typing.Any], typing.Any], typing.Any]
+        ] = {
+            "int": (self._decode_int, 0),
+            "string": (self._decode_string, ""),
+        }
+
+        telemetry_plan: list[TelemetryPlanItem] = []
         for telemetry_item in telemetry_items:
-            await self.process_telemetry_item(
-                telemetry_item, telemetry_dict, telemetry_topic
+            mib_name = TelemetryItemName(telemetry_item).name
+            mib_element = self.mib_tree_holder.mib_tree[mib_name]
+            assert mib_element.parent is not None
+            item_type = TelemetryItemType[mib_name]
+            array_length = array_lengths[telemetry_item]
+            element_oid = mib_element.oid_tuple
+            if mib_element.parent.index and array_length is not None:
+                oid = element_oid
+                fallback_oid = None
+                is_array = True
+            else:
+                oid = element_oid + (0,)
+                fallback_oid = element_oid + (1,)
+                is_array = False
+            if item_type == "float":
+                # Remember the float decoding strategy per telemetry item.
+                decoder: typing.Callable[[typing.Any], typing.Any] = functools.partial(
+                    self._decode_float, oid
+                )
+                missing_value: typing.Any = math.nan
+            else:
+                decoder, missing_value = decoders[item_type]
+            telemetry_plan.append(
+                TelemetryPlanItem(
+                    name=telemetry_item,
+                    mib_name=mib_name,
+                    oid=oid,
+                    fallback_oid=fallback_oid,
+                    decoder=decoder,
+                    missing_value=missing_value,
+                    # Some frequencies are given in tens of Hertz.
+                    scale=0.1 if f"{mib_element.oid}.0" in FREQUENCY_OID_LIST else 1.0,
+                    is_array=is_array,
+                    array_length=array_length,
+                    group=self.field_group_scheduler.groups.get(telemetry_item),
+                )
             )
+        return tuple(telemetry_plan)
 
-        await telemetry_topic.set_write(**telemetry_dict)
-        await asyncio.sleep(self.config.poll_interval)
+    def execute_telemetry_plan(self) -> dict[str, typing.Any]:
+        """Decode the telemetry items from the SNMP result.
 
-    async def process_telemetry_item(
-        self,
-        telemetry_item: str,
-        telemetry_dict: dict[str, typing.Any],
-        telemetry_topic: WriteTopic | types.SimpleNamespace,
-    ) -> None:
-        """Process the value of the provided telemetry item and add it to the
-        provided dictionary.
+        The telemetry items of the field groups that were not read by the
+        current poll get their last decoded value.
 
-        Parameters
-        ----------
-        telemetry_item : `str`
-            The name of ghe telemetry item.
-        telemetry_dict : `dict`[`str`, `typing.Any`]
-            A dictionary that will contain all telemetry items and their
-            values.
-        telemetry_topic : `WriteTopic` | `types.SimpleNameSpace`
-            The telemetry topic containing the telemetry item.
+        Returns
+        -------
+        dict[str, typing.Any]
+            A dictionary that contains all telemetry items and their values.
         """
-        mib_name = TelemetryItemName(telemetry_item).name
-        parent = self.mib_tree_holder.mib_tree[mib_name].parent
-        assert parent is not None
-
-        snmp_value: typing.Any
-        if parent.index and await self._is_single_or_multiple(
-            telemetry_item, telemetry_topic
-        ):
-            mib_oid = self.mib_tree_holder.mib_tree[mib_name].oid
-            snmp_value = []
-            for snmp_result_oid in self.snmp_result:
-                if snmp_result_oid.startswith(mib_oid):
-                    snmp_value.append(
-                        await self.get_telemetry_item_value(
-                            telemetry_item, mib_name, snmp_result_oid
-                        )
+        telemetry_dict: dict[str, typing.Any] = {
+            "systemDescription": self.system_description
+        }
+        for plan_item in self.telemetry_plan:
+            if plan_item.group is not None:
+                if plan_item.group not in self.polled_groups:
+                    telemetry_dict[plan_item.name] = self.telemetry_cache.get(
+                        plan_item.name, plan_item.missing_value
                     )
-        else:
-            if self.mib_tree_holder.mib_tree[mib_name].oid + ".0" in self.snmp_result:
-                mib_oid = self.mib_tree_holder.mib_tree[mib_name].oid + ".0"
+                    continue
+            if plan_item.is_array:
+                assert plan_item.array_length is not None
+                rows = sorted(
+                    self.snmp_columns.get(plan_item.oid, []),
+                    key=operator.itemgetter(0),
+                )
+                snmp_value = [
+                    self.decode_value(plan_item, plan_item.oid, row_value)
+                    for _, row_value in rows[: plan_item.array_length]
+                ]
+                snmp_value += [plan_item.missing_value] * (
+                    plan_item.array_length - len(snmp_value)
+                )
             else:
-                mib_oid = self.mib_tree_holder.mib_tree[mib_name].oid + ".1"
-            snmp_value = await self.get_telemetry_item_value(
-                telemetry_item, mib_name, mib_oid
-            )
-
-            # Some frequencies are given in tens of Hertz.
-            if mib_oid in FREQUENCY_OID_LIST:
-                snmp_value = snmp_value / 10.0
+                mib_oid = plan_item.oid
+                if mib_oid not in self.snmp_result:
+                    assert plan_item.fallback_oid is not None
+                    mib_oid = plan_item.fallback_oid
+                snmp_value = self.decode_value(
+                    plan_item, mib_oid, self.snmp_result.get(mib_oid)
+                )
+            telemetry_dict[plan_item.name] = snmp_value
+            if plan_item.group is not None:
+                self.telemetry_cache[plan_item.name] = snmp_value
+        return telemetry_dict
 
-        telemetry_dict[telemetry_item] = snmp_value
+    def get_window_telemetry(
+        self, telemetry_dict: dict[str, typing.Any]
+    ) -> dict[str, typing.Any] | None:
+        """Add the telemetry of a poll to `sample_window` and get the
+        telemetry to publish once the window is complete.
 
-    async def _is_single_or_multiple(
-        self, telemetry_item: str, telemetry_topic: WriteTopic | types.SimpleNamespace
-    ) -> bool:
-        """Determine if a telemetry item has a single or multiple value.
+        The statistics of all float telemetry items over the window are kept
+        in `window_telemetry_statistics`.
 
         Parameters
         ----------
-        telemetry_item : `str`
-            The name of ghe telemetry item.
-        telemetry_topic : `WriteTopic` | `types.SimpleNameSpace`
-            The telemetry topic containing the telemetry item.
+        telemetry_dict : `dict`[`str`, `typing.Any`]
+            The telemetry items of the poll and their values.
 
         Returns
         -------
-        bool
-            False if single and True if multiple.
+        dict[str, typing.Any] | None
+            The telemetry items with, for the float telemetry items, their
+            statistic in ``window_statistics``, or None if the window is not
+            complete yet.
         """
-        # Make the code work with both the DDS and Kafka versions of ts_salobj.
-        if hasattr(telemetry_topic, "metadata"):
-            is_list = (
-                telemetry_topic.metadata.field_info[telemetry_item].array_length
-                is not None
-            )
-        elif hasattr(telemetry_topic, "topic_info"):
-            is_list = telemetry_topic.topic_info.fields[telemetry_item].count > 1
-        else:
-            is_list = False
-        return is_list
+        assert self.sample_window is not None
+        self.sample_window.add(telemetry_dict)
+        if self.sample_window.num_samples % self.sample_window.size != 0:
+            return None
+
+        self.window_telemetry_statistics = self.sample_window.get_statistics()
+        window_statistics = self.config.window_statistics
+        return telemetry_dict | {
+            name: self.window_telemetry_statistics[window_statistics.get(name, "mean")][
+                name
+            ]
+            for name in self.sample_window.columns
+        }
 
-    async def get_telemetry_item_value(
-        self, telemetry_item: str, mib_name: str, mib_oid: str
+    def decode_value(
+        self,
+        plan_item: TelemetryPlanItem,
+        mib_oid: tuple[int, ...],
+        snmp_value: typing.Any,
     ) -> typing.Any:
-        """Get the value of a telemetry item.
+        """Decode the value of a telemetry item.
 
         Parameters
         ----------
-        telemetry_item : `str`
-            The name of the telemetry item.
-        mib_name : `str`
-            The MIB name of the item.
-        mib_oid : `str`
+        plan_item : `TelemetryPlanItem`
+            The plan item of the telemetry item.
+        mib_oid : `tuple`[`int`, ...]
             The MIB OID of the item.
+        snmp_value : `typing.Any`
+            The pysnmp value, or None if no value was received.
 
         Returns
         -------
@@ -351,48 +977,229 @@ additionalProperties: false
         ValueError
             In case no float value could be gotten.
         """
-        telemetry_type = TelemetryItemType[mib_name]
-        snmp_value: int | float | str
-        match telemetry_type:
-            case "int":
-                if mib_oid in self.snmp_result:
-                    snmp_value = int(self.snmp_result[mib_oid])
-                else:
-                    snmp_value = 0
-                    self.log.debug(
-                        f"Could not find {mib_oid=} for int {telemetry_item=}. "
-                        "Ignoring."
-                    )
-            case "float":
-                if mib_oid in self.snmp_result:
-                    snmp_value = await self._extract_float_from_string(
-                        self.snmp_result[mib_oid]
-                    )
-                else:
-                    snmp_value = math.nan
-                    self.log.debug(
-                        f"Could not find {mib_oid=} for float {telemetry_item=}. "
-                        "Ignoring."
-                    )
-            case "string":
-                if mib_oid in self.snmp_result:
-                    snmp_value = self.snmp_result[mib_oid]
-                else:
-                    snmp_value = ""
-                    self.log.debug(
-                        f"Could not find {mib_oid=} for str {telemetry_item=}. "
-                        "Ignoring."
-                    )
-            case _:
-                snmp_value = self.snmp_result[mib_oid]
-        return snmp_value
+        if snmp_value is None:
+            self.log.debug(
+                f"Could not find {mib_oid=} for {plan_item.name=}. Ignoring."
+            )
+            return plan_item.missing_value
+        value = plan_item.decoder(snmp_value)
+        if plan_item.scale != 1.0:
+            value *= plan_item.scale
+        return value
+
+    def get_instance_oids(self) -> list[tuple[int, ...]]:
+        """Get the instance OIDs of the telemetry items from a walk result.
+
+        The instance OIDs also are sorted into `group_get_oids`.
+
+        Returns
+        -------
+        list[tuple[int, ...]]
+            The instance OIDs, in the order of the walk result.
+        """
+        oid_groups: dict[tuple[int, ...], str | None] = {}
+        for plan_item in self.telemetry_plan:
+            if plan_item.is_array:
+                oid_groups[plan_item.oid] = plan_item.group
+            else:
+                assert plan_item.fallback_oid is not None
+                oid_groups[plan_item.oid] = plan_item.group
+                oid_groups[plan_item.fallback_oid] = plan_item.group
+
+        instance_oids: list[tuple[int, ...]] = []
+        self.group_get_oids = collections.defaultdict(list)
+        for oid in self.snmp_result:
+            if oid in oid_groups:
+                group = oid_groups[oid]
+            elif oid[:-1] in self.column_oids:
+                group = oid_groups[oid[:-1]]
+            else:
+                continue
+            instance_oids.append(oid)
+            self.group_get_oids[group].append(oid)
+        return instance_oids
+
+    def _decode_int(self, snmp_value: typing.Any) -> int:
+        """Decode an int value.
+
+        Parameters
+        ----------
+        snmp_value : `typing.Any`
+            The pysnmp value.
+
+        Returns
+        -------
+        int
+            The int value.
+        """
+        if isinstance(snmp_value, univ.Integer):
+            return int(snmp_value)
+        return int(snmp_value.prettyPrint())
+
+    def _decode_float(self, oid: tuple[int, ...], snmp_value: typing.Any) -> float:
+        """Decode a float value.
+
+        The values of an OID are encoded in the same way in each poll, so the
+        strategy that decoded the previous value of the OID is tried first.
+        Only if that fails, or if no value was decoded yet, the strategies in
+        `float_decoder_strategies` are tried in order and the first one that
+        succeeds is remembered for the OID.
+
+        Parameters
+        ----------
+        oid : `tuple`[`int`, ...]
+            The OID of the telemetry item.
+        snmp_value : `typing.Any`
+            The pysnmp value.
 
-    async def _extract_float_from_string(self, float_string: str) -> float:
+        Returns
+        -------
+        float
+            The float value.
+
+        Raises
+        ------
+        ValueError
+            In case no single float value could be extracted from the value.
+        """
+        float_decoder = self.float_decoders.get(oid)
+        if float_decoder is not None:
+            try:
+                return float_decoder(snmp_value)
+            except (TypeError, ValueError):
+                pass
+
+        for float_decoder in self.float_decoder_strategies:
+            try:
+                float_value = float_decoder(snmp_value)
+            except (TypeError, ValueError):
+                continue
+            self.float_decoders[oid] = float_decoder
+            return float_value
+        raise ValueError(
+            f"Could not extract a float value from {snmp_value.prettyPrint()!r}."
+        )
+
+    def _decode_float_from_integer(self, snmp_value: typing.Any) -> float:
+        """Decode a float value from an integer value.
+
+        Parameters
+        ----------
+        snmp_value : `typing.Any`
+            The pysnmp value.
+
+        Returns
+        -------
+        float
+            The float value.
+
+        Raises
+        ------
+        TypeError
+            In case the value is not an integer.
+        """
+        if not isinstance(snmp_value, univ.Integer):
+            raise TypeError(f"{type(snmp_value).__name__} is not an Integer.")
+        return float(int(snmp_value))
+
+    def _decode_float_from_octets(self, snmp_value: typing.Any) -> float:
+        """Decode a float value from an octet string that only contains the
+        ASCII representation of a float.
+
+        Parameters
+        ----------
+        snmp_value : `typing.Any`
+            The pysnmp value.
+
+        Returns
+        -------
+        float
+            The float value.
+
+        Raises
+        ------
+        TypeError
+            In case the value is not an octet string.
+        ValueError
+            In case the octet string doesn't contain a float.
+        """
+        if not isinstance(snmp_value, univ.OctetString):
+            raise TypeError(f"{type(snmp_value).__name__} is not an OctetString.")
+        return float(snmp_value.asOctets())
+
+    def _decode_float_from_text(self, snmp_value: typing.Any) -> float:
+        """Decode a float value from text that contains a single float value,
+        like "230.1 V".
+
+        Parameters
+        ----------
+        snmp_value : `typing.Any`
+            The pysnmp value.
+
+        Returns
+        -------
+        float
+            The float value.
+
+        Raises
+        ------
+        ValueError
+            In case the text is hexadecimal or doesn't contain a float.
+        """
+        float_string = snmp_value.prettyPrint()
+        if float_string.startswith("0x"):
+            raise ValueError(f"{float_string!r} is hexadecimal.")
+        return self._extract_float_from_string(float_string)
+
+    def _decode_float_from_hex(self, snmp_value: typing.Any) -> float:
+        """Decode a float value from hexadecimal encoded text.
+
+        Octet strings with non-printable characters, like a terminating null
+        character, are printed in hexadecimal notation by pysnmp. Some devices
+        also send the hexadecimal notation as text.
+
+        Parameters
+        ----------
+        snmp_value : `typing.Any`
+            The pysnmp value.
+
+        Returns
+        -------
+        float
+            The float value.
+
+        Raises
+        ------
+        ValueError
+            In case the text isn't hexadecimal or doesn't contain a float.
+        """
+        float_string = snmp_value.prettyPrint()
+        if not float_string.startswith("0x"):
+            raise ValueError(f"{float_string!r} is not hexadecimal.")
+        hex_values = hx.findall(float_string[2:])
+        float_value_as_bytes = bytes.fromhex(hex_values[0])
+        return self._extract_float_from_string(float_value_as_bytes.decode("utf-8"))
+
+    def _decode_string(self, snmp_value: typing.Any) -> str:
+        """Decode a string value.
+
+        Parameters
+        ----------
+        snmp_value : `typing.Any`
+            The pysnmp value.
+
+        Returns
+        -------
+        str
+            The string value, with binary octet strings in hexadecimal notation.
+        """
+        return snmp_value.prettyPrint()
+
+    def _extract_float_from_string(self, float_string: str) -> float:
         """Extract a float value from a string.
 
         It is assumed here that there only is a single float value in the
-        string. If no or more than one float value is found, a ValueError is
-        raised.
+        string. If no float value is found, a ValueError is raised.
 
         Parameters
         ----------
@@ -402,61 +1209,435 @@ additionalProperties: false
         Raises
         ------
         ValueError
-            In case no single float value could be extracted from the string.
+            In case no float value could be extracted from the string.
         """
+        float_values = rx.findall(float_string)
+        if len(float_values) == 0:
+            raise ValueError(f"No float value found in {float_string!r}.")
+        return float(float_values[0])
+
+    async def disconnect(self) -> None:
+        """Release the SNMP transport or engine back to the pool, close the
+        capture file and restart the poll schedule."""
+        await super().disconnect()
+        self.poll_scheduler.restart()
+        self.walk_interrupted = False
+        if self.snmp_capture_writer is not None:
+            self.snmp_capture_writer.close()
+            self.snmp_capture_writer = None
+        if self.snmp_transport_borrowed:
+            self.snmp_engine_pool.release_transport()
+            self.snmp_transport_borrowed = False
+        if self.snmp_engine is not None:
+            self.snmp_engine_pool.release_engine(self.snmp_engine)
+            self.snmp_engine = None
+            self.executor = None
+
+    async def execute_walk(self, retry_after_timeout: bool = False) -> None:
+        """Walk the subtree of `walk_oid` and store the result.
+
+        Depending on the configuration, the walk either is done from within
+        the asyncio loop or by calling the blocking `execute_next_cmd` method
+        in a thread.
+
+        If a GETBULK walk doesn't return anything, the walk is repeated with
+        GETNEXT requests, see `_execute_getnext_walk`. An agent that
+        doesn't support SNMPv2c may not respond at all, but so doesn't an
+        agent that is down. Therefore, if the GETBULK walk timed out, the
+        GETNEXT walk only is done by the next call, unless
+        ``retry_after_timeout`` is True, so a device that is down only costs
+        a single timeout per poll.
+
+        Parameters
+        ----------
+        retry_after_timeout : `bool`, optional
+            Repeat a GETBULK walk that timed out with GETNEXT requests right
+            away? Defaults to False.
+        """
+        if self.retry_walk_with_getnext:
+            self.retry_walk_with_getnext = False
+            await self._execute_getnext_walk()
+            return
+
+        error_response = await self._execute_walk()
+        if self.use_getbulk and not self.snmp_result:
+            if (
+                error_response is not None
+                and str(error_response[0]) == TIMEOUT_ERROR_INDICATION
+                and not retry_after_timeout
+            ):
+                self.retry_walk_with_getnext = True
+                return
+            await self._execute_getnext_walk()
+
+    async def _execute_getnext_walk(self) -> None:
+        """Walk the subtree of `walk_oid` with GETNEXT requests instead of
+        GETBULK requests.
+
+        If that returns data, the GETBULK walk is tried again, since the
+        GETBULK walk that failed before may have been done while the agent
+        was briefly unreachable. Only if the agent still doesn't respond to
+        it, the agent doesn't support SNMPv2c and GETNEXT requests are used
+        from then on.
+        """
+        self.use_getbulk = False
         try:
-            float_value = float(float_string)
-        except ValueError as e:
-            # Some values are passed on as hex strings.
-            if float_string.startswith("0x"):
-                float_string = float_string[2:]
-                hex_values = hx.findall(float_string)
-                if len(hex_values) > 0:
-                    float_value_as_bytes = bytes.fromhex(hex_values[0])
-                    float_string = float_value_as_bytes.decode("utf-8")
-            float_values = rx.findall(float_string)
-            if len(float_values) > 0:
-                float_value = float(float_values[0])
-            else:
-                raise e
-        return float_value
+            await self._execute_walk()
+        finally:
+            self.use_getbulk = True
+        if not self.snmp_result:
+            return
+
+        await self._execute_walk()
+        if self.snmp_result:
+            return
+        self.log.info(
+            f"{self.descr()} doesn't respond to GETBULK requests. "
+            "Falling back to GETNEXT."
+        )
+        self.use_getbulk = False
+        await self._execute_walk()
+
+    async def execute_get(self) -> None:
+        """Get the values of those `get_oids` that are in `polled_groups` or
+        not in any group and store the result.
+
+        The OIDs are packed into as few GET requests as `max_get_var_binds`
+        allows, which are sent concurrently. If not all values are returned,
+        for instance because the size of a table changed, the OIDs are
+        discovered again during the next poll.
+        """
+        assert self.get_oids is not None
+        if self.field_group_scheduler.intervals:
+            oids = [
+                oid
+                for group, group_oids in self.group_get_oids.items()
+                if group is None or group in self.polled_groups
+                for oid in group_oids
+            ]
+        else:
+            oids = self.get_oids
+        chunks = [
+            oids[i : i + self.max_get_var_binds]
+            for i in range(0, len(oids), self.max_get_var_binds)
+        ]
 
-    def execute_next_cmd(self) -> None:
-        """Execute the SNMP nextCmd command.
+        self.clear_snmp_result()
+        if self.config.snmp_transport == "blocking":
+            assert self.executor is not None
+            loop = asyncio.get_running_loop()
+            responses = await loop.run_in_executor(
+                self.executor, self.execute_get_cmd, chunks
+            )
+        else:
+            version = 1 if self.use_getbulk else 0
+            responses = await asyncio.gather(
+                *[
+                    self.get(self.address, self.config.snmp_community, version, chunk)
+                    for chunk in chunks
+                ]
+            )
+
+        for response in responses:
+            error_status = response[1]
+            if error_status and int(error_status) == TOO_BIG:
+                self.max_get_var_binds = max(1, self.max_get_var_binds // 2)
+                self.log.info(
+                    f"GET response too big. Reducing to {self.max_get_var_binds} "
+                    "OIDs per GET request."
+                )
+            self.process_snmp_response(*response)
+
+        if len(self.snmp_result) < len(oids):
+            self.get_oids = None
+
+    def execute_get_cmd(
+        self, chunks: list[list[tuple[int, ...]]]
+    ) -> list[SnmpResponse]:
+        """Execute an SNMP getCmd command for each chunk of OIDs.
 
         This is a **blocking** method that needs to be called with the asyncio
         `run_in_executor` method.
 
-        Raises
-        ------
-        RuntimeError
-            In case an SNMP error happens, for instance the server cannot be
-            reached.
+        Parameters
+        ----------
+        chunks : `list`[`list`[`tuple`[`int`, ...]]]
+            The OIDs to get, one list per GET request.
+
+        Returns
+        -------
+        list[SnmpResponse]
+            The response to each GET request.
         """
-        iterator = self.next_cmd(
-            self.snmp_engine,
-            self.community_data,
-            self.transport_target,
-            self.context_data,
-            self.object_type,
-            lookupMib=False,
-            lexicographicMode=False,
+        community_data = (
+            self.bulk_community_data if self.use_getbulk else self.community_data
         )
+        return [
+            next(
+                self.get_cmd(
+                    self.snmp_engine,
+                    community_data,
+                    self.transport_target,
+                    self.context_data,
+                    *[ObjectType(ObjectIdentity(oid)) for oid in chunk],
+                    lookupMib=False,
+                )
+            )
+            for chunk in chunks
+        ]
 
-        self.snmp_result = {}
+    async def _execute_walk(self) -> SnmpResponse | None:
+        """Walk the subtree of `walk_oid` once, with GETBULK requests if
+        `use_getbulk` is True or with GETNEXT requests otherwise.
+
+        The var binds received so far are kept if the walk fails. If the walk
+        times out after it received part of the subtree, it is resumed from
+        the last OID received, as long as the next poll isn't due yet. If the
+        walk is cancelled, the next walk resumes it from the last OID
+        received. `walk_complete` tells whether the whole subtree was
+        received.
+
+        Returns
+        -------
+        SnmpResponse | None
+            The response that ended the walk with an error, or None if the
+            walk reached the end of the subtree.
+        """
+        start_oid: tuple[int, ...] | None = None
+        if self.walk_interrupted and self.snmp_result:
+            start_oid = max(self.snmp_result)
+            self.num_walk_resumes += 1
+            self.log.info(
+                f"Walk of {self.descr()} was interrupted. Resuming after "
+                f"{'.'.join(str(i) for i in start_oid)}."
+            )
+        else:
+            self.clear_snmp_result()
+        self.walk_complete = False
+        # Only reset once the walk ends, and not if it is cancelled.
+        self.walk_interrupted = True
+        while True:
+            num_var_binds = len(self.snmp_result)
+            error_response = await self._walk_from(start_oid)
+            if error_response is None:
+                self.walk_interrupted = False
+                self.walk_complete = True
+                return None
+            if not self.should_resume_walk(error_response, num_var_binds):
+                self.walk_interrupted = False
+                self.process_snmp_response(*error_response)
+                return error_response
+            start_oid = max(self.snmp_result)
+            self.num_walk_resumes += 1
+            self.log.info(
+                f"Walk of {self.descr()} timed out. Resuming after "
+                f"{'.'.join(str(i) for i in start_oid)}."
+            )
+
+    async def _walk_from(
+        self, start_oid: tuple[int, ...] | None
+    ) -> SnmpResponse | None:
+        """Walk the subtree of `walk_oid` from the provided OID on and store
+        the var binds.
+
+        Parameters
+        ----------
+        start_oid : `tuple`[`int`, ...] | None
+            The OID after which the walk starts, or None to walk the whole
+            subtree.
+
+        Returns
+        -------
+        SnmpResponse | None
+            The response that ended the walk with an error, or None if the
+            walk reached the end of the subtree.
+        """
+        if self.config.snmp_transport == "blocking":
+            assert self.executor is not None
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, self.execute_next_cmd, start_oid
+            )
+
+        if self.use_getbulk:
+            responses = self.bulk_walk(
+                self.address,
+                self.config.snmp_community,
+                self.walk_oid,
+                self.config.non_repeaters,
+                self.config.max_repetitions,
+                start_oid=start_oid,
+            )
+        else:
+            responses = self.walk(
+                self.address,
+                self.config.snmp_community,
+                0,
+                self.walk_oid,
+                start_oid=start_oid,
+            )
+        async for response in responses:
+            if response[0] or response[1]:
+                return response
+            self.process_snmp_response(*response)
+        return None
+
+    def should_resume_walk(
+        self, error_response: SnmpResponse, num_var_binds: int
+    ) -> bool:
+        """Determine whether a walk that ended with an error is resumed.
+
+        Only walks that timed out are resumed, provided that they received
+        new var binds since they were started or resumed, so a device that
+        stopped responding isn't walked over and over, and provided that
+        `poll_deadline` didn't pass yet.
+
+        Parameters
+        ----------
+        error_response : `SnmpResponse`
+            The response that ended the walk.
+        num_var_binds : `int`
+            The number of var binds before the walk was started or resumed.
+
+        Returns
+        -------
+        bool
+            True if the walk is resumed, False otherwise.
+        """
+        error_indication = error_response[0]
+        if str(error_indication) != TIMEOUT_ERROR_INDICATION:
+            return False
+        if len(self.snmp_result) <= num_var_binds:
+            return False
+        if self.poll_deadline is None:
+            return True
+        return asyncio.get_running_loop().time() < self.poll_deadline
+
+    def execute_next_cmd(
+        self, start_oid: tuple[int, ...] | None = None
+    ) -> SnmpResponse | None:
+        """Execute the SNMP nextCmd or bulkCmd command.
+
+        This is a **blocking** method that needs to be called with the asyncio
+        `run_in_executor` method.
+
+        The bulkCmd command is executed in lexicographic mode and stopped as
+        soon as an OID outside of the subtree is returned, since pysnmp drops
+        the last row of the subtree otherwise. The same goes for a nextCmd
+        command that resumes a walk, since pysnmp stops it at the end of the
+        subtree of ``start_oid`` otherwise.
+
+        Parameters
+        ----------
+        start_oid : `tuple`[`int`, ...] | None
+            The OID after which the walk starts, or None (the default) to walk
+            the whole subtree.
+
+        Returns
+        -------
+        SnmpResponse | None
+            The response that ended the walk with an error, for instance
+            because the server cannot be reached, or None if the walk reached
+            the end of the subtree.
+        """
+        first_oid = self.walk_oid if start_oid is None else start_oid
+        if self.use_getbulk:
+            iterator = self.bulk_cmd(
+                self.snmp_engine,
+                self.bulk_community_data,
+                self.transport_target,
+                self.context_data,
+                self.config.non_repeaters,
+                self.config.max_repetitions,
+                ObjectType(ObjectIdentity(first_oid)),
+                lookupMib=False,
+                lexicographicMode=True,
+            )
+        else:
+            iterator = self.next_cmd(
+                self.snmp_engine,
+                self.community_data,
+                self.transport_target,
+                self.context_data,
+                ObjectType(ObjectIdentity(first_oid)),
+                lookupMib=False,
+                lexicographicMode=start_oid is not None,
+            )
+
+        root = ObjectName(self.walk_oid)
         for error_indication, error_status, error_index, var_binds in iterator:
-            if error_indication:
-                self.log.warning(
-                    f"Exception contacting SNMP server with {error_indication=}. Ignoring."
-                )
-            elif error_status:
-                self.log.exception(
-                    "Exception contacting SNMP server with "
-                    f"{error_status.prettyPrint()} at "
-                    f"{error_index and var_binds[int(error_index) - 1][0] or '?'}. Ignoring."
-                )
-            else:
-                for var_bind in var_binds:
-                    self.snmp_result[var_bind[0].prettyPrint()] = var_bind[
-                        1
-                    ].prettyPrint()
+            if error_indication or error_status:
+                # The pysnmp bulkCmd keeps on retrying after a timeout.
+                return error_indication, error_status, error_index, var_binds
+
+            subtree_var_binds = [vb for vb in var_binds if root.isPrefixOf(vb[0])]
+            self.process_snmp_response(
+                error_indication, error_status, error_index, subtree_var_binds
+            )
+            if len(subtree_var_binds) < len(var_binds):
+                break
+        return None
+
+    async def execute_replay(self) -> None:
+        """Store the var binds of the next poll of `snmp_capture_replayer`,
+        once the poll is due."""
+        assert self.snmp_capture_replayer is not None
+        record = await self.snmp_capture_replayer.next_record()
+        self.clear_snmp_result()
+        self.process_snmp_response(None, 0, 0, record.var_binds)
+
+    def capture_snmp_result(self) -> None:
+        """Append the SNMP result to the capture file, if any."""
+        if self.snmp_capture_writer is not None:
+            self.snmp_capture_writer.write(self.snmp_result.items())
+
+    def clear_snmp_result(self) -> None:
+        """Clear the SNMP result and the table column rows."""
+        self.snmp_result = {}
+        self.snmp_columns.clear()
+
+    def process_snmp_response(
+        self,
+        error_indication: typing.Any,
+        error_status: typing.Any,
+        error_index: typing.Any,
+        var_binds: list,
+    ) -> None:
+        """Store the var binds of an SNMP response or log its error.
+
+        Parameters
+        ----------
+        error_indication : `typing.Any`
+            The SNMP engine error, if any.
+        error_status : `typing.Any`
+            The SNMP PDU error status.
+        error_index : `typing.Any`
+            The index of the var bind that caused the error.
+        var_binds : `list`
+            The var binds of the response.
+        """
+        if error_indication:
+            self.request_failed = True
+            self.log.warning(
+                f"Exception contacting SNMP server with {error_indication=}. Ignoring."
+            )
+            return
+
+        self.poll_responded = True
+        if error_status:
+            self.log.exception(
+                "Exception contacting SNMP server with "
+                f"{error_status.prettyPrint()} at "
+                f"{error_index and var_binds[int(error_index) - 1][0] or '?'}. Ignoring."
+            )
+        else:
+            for var_bind in var_binds:
+                if isinstance(
+                    var_bind[1], (NoSuchObject, NoSuchInstance, EndOfMibView)
+                ):
+                    continue
+                oid = var_bind[0].asTuple()
+                value = var_bind[1]
+                self.snmp_result[oid] = value
+                if oid[:-1] in self.column_oids:
+                    self.snmp_columns[oid[:-1]].append((oid[-1], value))
@@ -0,0 +1,188 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["SnmpEnginePool", "get_shared_snmp_engine_pool"]
+
+import concurrent.futures
+import logging
+
+from pysnmp.hlapi import CommunityData, SnmpEngine, UdpTransportTarget
+
+from .snmp_transport import SnmpTransport
+
+
+class SnmpEnginePool:
+    """Pool of SNMP resources that are shared by all data clients.
+
+    The pool holds a single `SnmpTransport` for the asyncio requests, which is
+    borrowed by the data clients while reading and released when
+    disconnecting. The socket of the transport only exists while borrowed.
+
+    For the blocking requests each borrower gets its own pysnmp `SnmpEngine`,
+    with its own thread to run the requests in, so a device that doesn't
+    respond only blocks the requests to that device. The pysnmp engine isn't
+    thread safe, so it is only used in that thread. The engine with its
+    thread is closed when released.
+
+    The pysnmp transport targets and community data are shared, per
+    (host, port) and per (community, message processing model) respectively.
+    """
+
+    def __init__(self) -> None:
+        self.log = logging.getLogger(type(self).__name__)
+
+        self.snmp_transport = SnmpTransport(log=self.log)
+        self.num_transport_borrowers = 0
+
+        # The executor with the request thread of each borrowed engine.
+        self.engine_executors: dict[
+            SnmpEngine, concurrent.futures.ThreadPoolExecutor
+        ] = {}
+
+        self.transport_targets: dict[tuple[str, int], UdpTransportTarget] = {}
+        self.community_data: dict[tuple[str, int], CommunityData] = {}
+
+    async def borrow_transport(self) -> SnmpTransport:
+        """Borrow the SNMP transport, which is connected if needed.
+
+        Returns
+        -------
+        SnmpTransport
+            The connected SNMP transport.
+        """
+        await self.snmp_transport.connect()
+        self.num_transport_borrowers += 1
+        return self.snmp_transport
+
+    def release_transport(self) -> None:
+        """Release the SNMP transport, which is closed if no longer borrowed.
+
+        Raises
+        ------
+        RuntimeError
+            In case the transport isn't borrowed.
+        """
+        if self.num_transport_borrowers == 0:
+            raise RuntimeError("The SNMP transport isn't borrowed.")
+        self.num_transport_borrowers -= 1
+        if self.num_transport_borrowers == 0:
+            self.snmp_transport.close()
+
+    @property
+    def num_engine_borrowers(self) -> int:
+        """The number of borrowed SNMP engines."""
+        return len(self.engine_executors)
+
+    def borrow_engine(self) -> tuple[SnmpEngine, concurrent.futures.ThreadPoolExecutor]:
+        """Borrow a new SNMP engine and the thread to run the blocking
+        requests with.
+
+        Returns
+        -------
+        tuple[SnmpEngine, concurrent.futures.ThreadPoolExecutor]
+            The SNMP engine and the executor with the request thread.
+        """
+        snmp_engine = SnmpEngine()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.engine_executors[snmp_engine] = executor
+        return snmp_engine, executor
+
+    def release_engine(self, snmp_engine: SnmpEngine) -> None:
+        """Release an SNMP engine, which is closed with its thread.
+
+        Parameters
+        ----------
+        snmp_engine : `SnmpEngine`
+            The SNMP engine returned by `borrow_engine`.
+
+        Raises
+        ------
+        RuntimeError
+            In case the engine isn't borrowed.
+        """
+        executor = self.engine_executors.pop(snmp_engine, None)
+        if executor is None:
+            raise RuntimeError("The SNMP engine isn't borrowed.")
+
+        transport_dispatcher = snmp_engine.transportDispatcher
+        if transport_dispatcher is not None:
+            # Close the sockets in the request thread, after any request that
+            # still is running there.
+            executor.submit(transport_dispatcher.closeDispatcher)
+        executor.shutdown(wait=False)
+
+    def get_transport_target(self, host: str, port: int) -> UdpTransportTarget:
+        """Get the transport target of an SNMP agent.
+
+        Parameters
+        ----------
+        host : `str`
+            The host name of the SNMP agent.
+        port : `int`
+            The port of the SNMP agent.
+
+        Returns
+        -------
+        UdpTransportTarget
+            The transport target.
+        """
+        if (host, port) not in self.transport_targets:
+            self.transport_targets[(host, port)] = UdpTransportTarget((host, port))
+        return self.transport_targets[(host, port)]
+
+    def get_community_data(self, community: str, mp_model: int) -> CommunityData:
+        """Get the community data of an SNMP community.
+
+        Parameters
+        ----------
+        community : `str`
+            The SNMP community.
+        mp_model : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+
+        Returns
+        -------
+        CommunityData
+            The community data.
+        """
+        if (community, mp_model) not in self.community_data:
+            self.community_data[(community, mp_model)] = CommunityData(
+                community, mpModel=mp_model
+            )
+        return self.community_data[(community, mp_model)]
+
+
+# The SNMP engine pool shared by all data clients in this process.
+_shared_snmp_engine_pool: SnmpEnginePool | None = None
+
+
+def get_shared_snmp_engine_pool() -> SnmpEnginePool:
+    """Get the SNMP engine pool shared by all data clients in this process.
+
+    Returns
+    -------
+    SnmpEnginePool
+        The shared SNMP engine pool.
+    """
+    global _shared_snmp_engine_pool
+    if _shared_snmp_engine_pool is None:
+        _shared_snmp_engine_pool = SnmpEnginePool()
+    return _shared_snmp_engine_pool
@@ -0,0 +1,328 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["SnmpMultiDataClient"]
+
+import asyncio
+import logging
+import time
+import types
+import typing
+
+import yaml
+from lsst.ts import salobj
+from lsst.ts.ess import common
+
+from .poll_scheduler import PollScheduler
+from .poll_timings import report_poll_timings
+from .snmp_data_client import SnmpDataClient
+from .snmp_transport import SnmpTransport
+
+# The configuration items of SnmpDataClient that are configured per device.
+DEVICE_CONFIG_ITEMS = ("host", "port", "device_name", "device_type", "snmp_community")
+
+# The configuration items of SnmpDataClient that SnmpMultiDataClient doesn't
+# support, with their value for all devices.
+UNSUPPORTED_CONFIG_ITEMS = {
+    "snmp_transport": "asyncio",
+    "capture_file": "",
+    "replay_file": "",
+    "replay_speed": 1.0,
+}
+
+
+class SnmpMultiDataClient(common.data_client.BaseReadLoopDataClient):
+    """Read SNMP data from many servers and publish it as EPM telemetry.
+
+    The requests to all devices are sent over a single asyncio UDP endpoint,
+    with a limit on the number of requests that wait for a response at the
+    same time. Each device is polled by its own `SnmpDataClient`, which
+    publishes the telemetry of the device, with the system description of the
+    device, exactly like a separately configured `SnmpDataClient` would.
+
+    Parameters
+    ----------
+    config : `types.SimpleNamespace`
+        The configuration, after validation by the schema returned
+        by `get_config_schema` and conversion to a types.SimpleNamespace.
+    topics : `salobj.Controller`
+        The telemetry topics this model can write, as a struct with attributes
+        such as ``tel_temperature``.
+    log : `logging.Logger`
+        Logger.
+    simulation_mode : `int`, optional
+        Simulation mode; 0 for normal operation.
+
+    Raises
+    ------
+    ValueError
+        In case the device names are not unique.
+    """
+
+    def __init__(
+        self,
+        config: types.SimpleNamespace,
+        topics: salobj.Controller | types.SimpleNamespace,
+        log: logging.Logger,
+        simulation_mode: int = 0,
+    ) -> None:
+        super().__init__(
+            config=config,
+            topics=topics,
+            log=log,
+            simulation_mode=simulation_mode,
+        )
+
+        self.snmp_transport = SnmpTransport(
+            log=self.log,
+            max_outstanding_requests=self.config.max_outstanding_requests,
+        )
+
+        # The data client of each device, by device name.
+        self.data_clients: dict[str, SnmpDataClient] = {}
+        for device in self.config.devices:
+            device_name = device["device_name"]
+            if device_name in self.data_clients:
+                raise ValueError(f"Duplicate device name {device_name!r}.")
+            self.data_clients[device_name] = SnmpDataClient(
+                config=self.get_device_config(device),
+                topics=topics,
+                log=self.log.getChild(device_name),
+                simulation_mode=simulation_mode,
+                snmp_transport=self.snmp_transport,
+            )
+
+        # Poll all devices at a fixed rate, regardless of how long each poll
+        # takes.
+        self.poll_scheduler = PollScheduler(
+            interval=self.config.poll_interval, log=self.log
+        )
+        self.timing_summary_time: float | None = None
+
+    @classmethod
+    def get_config_schema(cls) -> dict[str, typing.Any]:
+        """Get the config schema as jsonschema dict.
+
+        The configuration items of `SnmpDataClient` are taken over from its
+        schema, either for all devices together or, in ``devices``, per
+        device.
+        """
+        schema = yaml.safe_load(
+            """
+$schema: http://json-schema.org/draft-07/schema#
+description: Schema for SnmpMultiDataClient.
+type: object
+properties:
+  poll_interval:
+    description: >-
+      The amount of time [s] between the start of each poll of all devices.
+      If a poll takes longer, the next poll starts right away.
+    type: number
+    default: 1.0
+  max_outstanding_requests:
+    description: >-
+      The maximum number of SNMP requests, to all devices together, that wait
+      for a response at the same time.
+    type: integer
+    minimum: 1
+    default: 50
+  devices:
+    description: The devices to poll.
+    type: array
+    minItems: 1
+    items:
+      type: object
+      properties:
+        device_name:
+          description: The name of the device, which needs to be unique.
+          type: string
+      required:
+        - host
+        - port
+        - device_name
+        - device_type
+      additionalProperties: false
+required:
+  - max_read_timeouts
+  - poll_interval
+  - devices
+additionalProperties: false
+"""
+        )
+        data_client_properties = SnmpDataClient.get_config_schema()["properties"]
+        device_properties = schema["properties"]["devices"]["items"]["properties"]
+        schema["properties"]["devices"]["items"]["properties"] = {
+            name: data_client_properties[name] for name in DEVICE_CONFIG_ITEMS
+        } | device_properties
+        schema["properties"] = {
+            name: data_client_properties[name]
+            for name in data_client_properties
+            if name not in DEVICE_CONFIG_ITEMS and name not in UNSUPPORTED_CONFIG_ITEMS
+        } | schema["properties"]
+        return schema
+
+    def descr(self) -> str:
+        """Return a brief description, without the class name.
+
+        This should be just enough information to distinguish
+        one instance of this client from another.
+        """
+        return f"[num_devices={len(self.data_clients)}]"
+
+    def get_device_config(self, device: dict[str, typing.Any]) -> types.SimpleNamespace:
+        """Get the `SnmpDataClient` configuration of a device.
+
+        Parameters
+        ----------
+        device : `dict`[`str`, `typing.Any`]
+            The configuration of the device.
+
+        Returns
+        -------
+        types.SimpleNamespace
+            The configuration of the data client of the device.
+        """
+        device_properties = self.get_config_schema()["properties"]["devices"]["items"][
+            "properties"
+        ]
+        device_config = {
+            name: getattr(self.config, name)
+            for name in SnmpDataClient.get_config_schema()["properties"]
+            if name not in DEVICE_CONFIG_ITEMS and name not in UNSUPPORTED_CONFIG_ITEMS
+        }
+        device_config.update(
+            {
+                name: device.get(name, device_properties[name].get("default"))
+                for name in DEVICE_CONFIG_ITEMS
+            }
+        )
+        device_config.update(UNSUPPORTED_CONFIG_ITEMS)
+        # The timings of all devices are reported together.
+        device_config.update(timing_summary_interval=0, timing_prometheus_file="")
+        return types.SimpleNamespace(**device_config)
+
+    async def setup_reading(self) -> None:
+        """Open the SNMP transport and set up reading all devices."""
+        if self.simulation_mode == 0:
+            await self.snmp_transport.connect()
+        await asyncio.gather(
+            *[data_client.setup_reading() for data_client in self.data_clients.values()]
+        )
+
+    async def read_data(self) -> None:
+        """Poll all devices concurrently and publish their telemetry.
+
+        Each poll starts at the next tick of `poll_scheduler`. A device that
+        fails to be polled, or that isn't polled within a poll interval,
+        doesn't keep the other devices from being published.
+        """
+        await self.poll_scheduler.wait_for_next_tick()
+        results = await asyncio.gather(
+            *[
+                self.poll_device(data_client)
+                for data_client in self.data_clients.values()
+            ],
+            return_exceptions=True,
+        )
+        for device_name, result in zip(self.data_clients, results):
+            if isinstance(result, Exception):
+                self.log.warning(f"Failed to poll {device_name}: {result!r}.")
+        self.report_timings_if_due()
+
+    async def poll_device(self, data_client: SnmpDataClient) -> None:
+        """Poll a device, but for no longer than ``poll_interval``.
+
+        A poll that takes longer is cancelled. A walk that is cancelled is
+        resumed by the next poll, so a device that needs more than one poll
+        interval to be walked still is discovered. Only if the device didn't
+        respond at all, the poll is recorded as a failure in the circuit
+        breaker of the device, so a device that doesn't respond is held off
+        like a device that is polled on its own.
+
+        Parameters
+        ----------
+        data_client : `SnmpDataClient`
+            The data client of the device.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            In case the poll takes longer than ``poll_interval``.
+        """
+        timeout = self.config.poll_interval if self.config.poll_interval > 0 else None
+        try:
+            await asyncio.wait_for(
+                data_client.poll(deadline=self.poll_scheduler.deadline), timeout
+            )
+        except asyncio.TimeoutError:
+            if not data_client.poll_responded:
+                data_client.record_failure()
+            raise
+
+    def get_timing_statistics(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Get the statistics of the durations of the poll stages of all
+        devices and of the poll schedule.
+
+        Returns
+        -------
+        dict[str, dict[str, dict[str, float]]]
+            The count and the mean, percentile and maximum durations [s] of
+            each stage, by stage name, by device name. The overrun and
+            lateness statistics of `poll_scheduler`, which all devices share,
+            are included as stage "schedule".
+        """
+        schedule_statistics = self.poll_scheduler.get_statistics()
+        return {
+            device_name: {
+                **data_client.poll_timings.get_statistics(),
+                "schedule": schedule_statistics,
+            }
+            for device_name, data_client in self.data_clients.items()
+        }
+
+    def report_timings_if_due(self) -> None:
+        """Report the poll timings of all devices with `report_poll_timings`
+        every ``timing_summary_interval`` seconds."""
+        if self.config.timing_summary_interval <= 0:
+            return
+        now = time.monotonic()
+        if self.timing_summary_time is None:
+            self.timing_summary_time = now
+        elif now - self.timing_summary_time >= self.config.timing_summary_interval:
+            self.timing_summary_time = now
+            report_poll_timings(
+                [
+                    data_client.poll_timings
+                    for data_client in self.data_clients.values()
+                ],
+                self.log,
+                self.config.timing_prometheus_file,
+            )
+            self.log.info(f"Poll schedule: {self.poll_scheduler.format_summary()}")
+
+    async def disconnect(self) -> None:
+        """Disconnect all devices, close the SNMP transport and restart the
+        poll schedule."""
+        await super().disconnect()
+        self.poll_scheduler.restart()
+        for data_client in self.data_clients.values():
+            await data_client.disconnect()
+        self.snmp_transport.close()
@@ -19,13 +19,18 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+
 __all__ = ["SnmpServerSimulator", "SIMULATED_SYS_DESCR"]
 
+import bisect
+import collections
+import enum
 import logging
-import random
 import string
 import typing
 
+import numpy as np
+import numpy.typing as npt
 from pysnmp.hlapi import (
     CommunityData,
     ContextData,
@@ -37,8 +42,10 @@ from pysnmp.hlapi import (
 )
 from pysnmp.proto.rfc1155 import ObjectName
 from pysnmp.proto.rfc1902 import OctetString
+from pysnmp.proto.rfc1905 import NoSuchObject
 
-from .mib_tree_holder import MibTreeHolder
+from .mib_tree_holder import get_shared_mib_tree_holder
+from .snmp_transport import SnmpResponse
 from .utils import (
     FREQUENCY_OID_LIST,
     PDU_HEX_OID_LIST,
@@ -57,20 +64,90 @@ MISC_LIST_START_OID = 1
 
 FIFTY_HZ_IN_TENS = 500
 
+# The characters and the length of the simulated strings.
+STRING_CHARACTERS = np.array(list(string.ascii_uppercase + string.digits))
+STRING_LENGTH = 20
+
+
+class ValueKind(enum.Enum):
+    """The kinds of simulated values, which each are generated and encoded
+    in their own way."""
+
+    INTEGER = enum.auto()
+    # SNMP doesn't have floats. Instead an int is used which needs to be cast
+    # to a float by the reader.
+    FLOAT_AS_INTEGER = enum.auto()
+    # Certain PDU values are floats encoded as hexadecimal strings of the
+    # format "0x<hex value>00".
+    FLOAT_AS_HEX = enum.auto()
+    # Certain Schneider UPS values are strings that represent float values.
+    FLOAT_AS_TEXT = enum.auto()
+    FREQUENCY = enum.auto()
+    STRING = enum.auto()
 
-class SnmpServerSimulator:
-    """SNMP server simulator."""
 
-    def __init__(self, log: logging.Logger) -> None:
+class SnmpServerSimulator:
+    """SNMP server simulator.
+
+    The instance OIDs of each subtree are determined once, when the subtree
+    is requested first. The values of all OIDs of a request are generated
+    together, per kind of value, with a NumPy random generator.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    device_type : `str` | None, optional
+        The type of device to load the MIB files for, or None (the default)
+        to load the MIB files of all device types.
+    table_size : `int` | None, optional
+        The number of rows of each table, or None (the default) for the
+        number of rows of the device type.
+    seed : `int` | None, optional
+        The seed of the random generator, or None (the default) for a random
+        seed. With a seed, the same requests always get the same values.
+    replay_length : `int`, optional
+        If larger than 0, the values of each OID are generated once for this
+        many requests and then replayed in the same order, over and over
+        again. That makes the simulated values periodic and the simulator as
+        cheap as possible, for instance for soak tests.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        device_type: str | None = None,
+        table_size: int | None = None,
+        seed: int | None = None,
+        replay_length: int = 0,
+    ) -> None:
         self.log = log.getChild(type(self).__name__)
-        self.mib_tree_holder = MibTreeHolder()
-        self.snmp_items: list[list] = []
+        self.table_size = table_size
+        self.replay_length = replay_length
+        self.random_generator = np.random.default_rng(seed)
+        self.mib_tree_holder = get_shared_mib_tree_holder(device_type)
         self.SYS_DESCR = [
             (
                 ObjectName(value=self.mib_tree_holder.mib_tree["sysDescr"].oid + ".0"),
                 OctetString(value=SIMULATED_SYS_DESCR),
             )
         ]
+        self.no_error = Integer(0)
+
+        # The instance OID, element name and object name of the instances of
+        # each subtree, by OID of the root of the subtree.
+        self.subtree_instances: dict[str, list[tuple[str, str, ObjectName]]] = {}
+        # The instance OIDs of each subtree, in the same lexicographic order,
+        # to look up the successor of an OID.
+        self.subtree_instance_oids: dict[str, list[tuple[int, ...]]] = {}
+        # The kind of value of each instance OID.
+        self.value_kinds: dict[str, ValueKind] = {}
+        # The current value of each instance OID.
+        self.values: dict[str, typing.Any] = {}
+        # With replay, the values of each instance OID and the number of times
+        # the OID was requested.
+        self.replay_values: dict[str, list[typing.Any]] = {}
+        self.num_replays: dict[str, int] = {}
 
     def snmp_cmd(
         self,
@@ -97,88 +174,518 @@ class SnmpServerSimulator:
         # noinspection PyProtectedMember
         object_identity = var_binds[0]._ObjectType__args[0]._ObjectIdentity__args[0]
 
+        return iter(self._get_snmp_items(object_identity))
+
+    def snmp_get_cmd(
+        self,
+        snmp_engine: SnmpEngine,
+        auth_data: CommunityData,
+        transport_target: UdpTransportTarget,
+        context_data: ContextData,
+        *var_binds: typing.Any,
+        **options: typing.Any,
+    ) -> typing.Iterator:
+        """Handle the SNMP getCmd command."""
+        assert snmp_engine is not None
+        assert auth_data is not None
+        assert transport_target is not None
+        assert context_data is not None
+        assert len(options) == 1
+
+        # noinspection PyProtectedMember
+        oids = [
+            var_bind._ObjectType__args[0]._ObjectIdentity__args[0]
+            for var_bind in var_binds
+        ]
+        return iter([[None, Integer(0), Integer(0), self.get_var_binds(oids)]])
+
+    async def get(
+        self,
+        address: tuple[str, int],
+        community: str,
+        version: int,
+        oids: typing.Sequence[str | tuple[int, ...] | ObjectName],
+    ) -> SnmpResponse:
+        """Simulate `SnmpTransport.get_cmd`.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        version : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+        oids : `typing.Sequence`
+            The OIDs to get.
+
+        Returns
+        -------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        assert address is not None
+        assert community is not None
+        assert version in (0, 1)
+
+        return None, Integer(0), Integer(0), self.get_var_binds(oids)
+
+    def get_var_binds(
+        self, oids: typing.Sequence[str | tuple[int, ...] | ObjectName]
+    ) -> list[tuple]:
+        """Generate the var binds for the provided instance OIDs.
+
+        Parameters
+        ----------
+        oids : `typing.Sequence`
+            The instance OIDs to generate values for.
+
+        Returns
+        -------
+        list[tuple]
+            The var binds, with a `NoSuchObject` value for unknown OIDs.
+        """
+        object_names = [ObjectName(oid) for oid in oids]
+        instances: list[tuple[str, str | None]] = []
+        for object_name in object_names:
+            oid = str(object_name)
+            elt: str | None = None
+            match = self.mib_tree_holder.match_oid(object_name.asTuple())
+            # Only the instances of objects, with a single index, are known.
+            if match is not None and len(match[1]) == 1:
+                elt = match[0].name
+                if self._get_value_kind(oid, elt) is None:
+                    elt = None
+            instances.append((oid, elt))
+        self.generate_values([oid for oid, elt in instances if elt is not None])
+
+        var_binds: list[tuple] = []
+        for object_name, (oid, elt) in zip(object_names, instances):
+            if object_name == self.SYS_DESCR[0][0]:
+                value = self.SYS_DESCR[0][1]
+            else:
+                value = NoSuchObject("")
+                if elt is not None:
+                    try:
+                        value = self._generate_random_value(oid, elt)
+                    except KeyError:
+                        # Deliberately ignored.
+                        pass
+            var_binds.append((object_name, value))
+        return var_binds
+
+    async def walk(
+        self,
+        address: tuple[str, int],
+        community: str,
+        version: int,
+        oid: str,
+        start_oid: str | tuple[int, ...] | ObjectName | None = None,
+    ) -> typing.AsyncIterator[SnmpResponse]:
+        """Simulate `SnmpTransport.walk`.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        version : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+        oid : `str`
+            The OID of the root of the subtree.
+        start_oid : `str` | `tuple`[`int`, ...] | `ObjectName` | None
+            The OID after which the walk starts, or None (the default) to walk
+            the whole subtree.
+
+        Yields
+        ------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        assert address is not None
+        assert community is not None
+        assert version in (0, 1)
+
+        for snmp_item in self._get_snmp_items(oid, start_oid):
+            yield tuple(snmp_item)
+
+    def snmp_bulk_cmd(
+        self,
+        snmp_engine: SnmpEngine,
+        auth_data: CommunityData,
+        transport_target: UdpTransportTarget,
+        context_data: ContextData,
+        non_repeaters: int,
+        max_repetitions: int,
+        *var_binds: typing.Any,
+        **options: typing.Any,
+    ) -> typing.Iterator:
+        """Handle the SNMP bulkCmd command."""
+        assert non_repeaters >= 0
+        assert max_repetitions > 0
+        return self.snmp_cmd(
+            snmp_engine,
+            auth_data,
+            transport_target,
+            context_data,
+            *var_binds,
+            **options,
+        )
+
+    async def bulk_walk(
+        self,
+        address: tuple[str, int],
+        community: str,
+        oid: str,
+        non_repeaters: int,
+        max_repetitions: int,
+        start_oid: str | tuple[int, ...] | ObjectName | None = None,
+    ) -> typing.AsyncIterator[SnmpResponse]:
+        """Simulate `SnmpTransport.bulk_walk`.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        oid : `str`
+            The OID of the root of the subtree.
+        non_repeaters : `int`
+            The number of leading OIDs for which only a single successor is
+            requested.
+        max_repetitions : `int`
+            The maximum number of successors requested per GETBULK request.
+        start_oid : `str` | `tuple`[`int`, ...] | `ObjectName` | None
+            The OID after which the walk starts, or None (the default) to walk
+            the whole subtree.
+
+        Yields
+        ------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        assert address is not None
+        assert community is not None
+        assert non_repeaters >= 0
+
+        snmp_items = self._get_snmp_items(oid, start_oid)
+        for i in range(0, len(snmp_items), max_repetitions):
+            error_indication, error_status, error_index, _ = snmp_items[i]
+            var_binds = [
+                var_bind
+                for snmp_item in snmp_items[i : i + max_repetitions]
+                for var_bind in snmp_item[3]
+            ]
+            yield error_indication, error_status, error_index, var_binds
+
+    def get_instance_oids(self, oid: str) -> list[tuple[int, ...]]:
+        """Get the instance OIDs of the subtree of the provided OID.
+
+        Parameters
+        ----------
+        oid : `str`
+            The OID of the root of the subtree.
+
+        Returns
+        -------
+        list[tuple[int, ...]]
+            The instance OIDs, in lexicographic order.
+        """
+        if oid == self.mib_tree_holder.mib_tree["system"].oid:
+            return [self.SYS_DESCR[0][0].asTuple()]
+        if self.mib_tree_holder.get_element(ObjectName(oid).asTuple()) is None:
+            return []
+        self._get_subtree_instances(oid)
+        return list(self.subtree_instance_oids[oid])
+
+    def _get_snmp_items(
+        self,
+        object_identity: str,
+        start_oid: str | tuple[int, ...] | ObjectName | None = None,
+    ) -> list[list]:
+        """Get the SNMP items for the subtree of the provided OID.
+
+        Parameters
+        ----------
+        object_identity : `str`
+            The OID of the root of the subtree.
+        start_oid : `str` | `tuple`[`int`, ...] | `ObjectName` | None
+            The OID after which the SNMP items start, or None (the default)
+            for all SNMP items of the subtree.
+
+        Returns
+        -------
+        list[list]
+            The error indication, error status, error index and var binds of
+            each SNMP item.
+        """
         if object_identity == self.mib_tree_holder.mib_tree["system"].oid:
             # Handle the getCmd call for the system description.
-            return iter([[None, Integer(0), Integer(0), self.SYS_DESCR]])
-        else:
-            oid_branch = [
-                t
-                for t in self.mib_tree_holder.mib_tree
-                if self.mib_tree_holder.mib_tree[t].oid == object_identity
+            return [[None, self.no_error, self.no_error, self.SYS_DESCR]]
+        if (
+            self.mib_tree_holder.get_element(ObjectName(object_identity).asTuple())
+            is None
+        ):
+            return [
+                [
+                    f"Unknown OID {object_identity}.",
+                    self.no_error,
+                    self.no_error,
+                    "",
+                ]
             ]
-            if len(oid_branch) != 1:
-                return iter(
-                    [[f"Unknown OID {object_identity}.", Integer(0), Integer(0), ""]]
-                )
 
-        self.snmp_items = []
-        self._generate_snmp_values(object_identity)
-        self.log.debug(f"Returning {self.snmp_items=}")
-        return iter(self.snmp_items)
+        instances = self._get_subtree_instances(object_identity)
+        if start_oid is not None:
+            start = bisect.bisect_right(
+                self.subtree_instance_oids[object_identity],
+                ObjectName(start_oid).asTuple(),
+            )
+            instances = instances[start:]
+        self.generate_values([oid for oid, _, _ in instances])
+        snmp_items = []
+        for oid, elt, object_name in instances:
+            try:
+                value = self._generate_random_value(oid, elt)
+            except KeyError:
+                # Deliberately ignored.
+                continue
+            snmp_items.append(
+                [None, self.no_error, self.no_error, [(object_name, value)]]
+            )
+        self.log.debug(f"Returning {snmp_items=}")
+        return snmp_items
+
+    def _get_subtree_instances(self, oid: str) -> list[tuple[str, str, ObjectName]]:
+        """Get the instances of the subtree of the provided OID.
 
-    def _generate_snmp_values(self, oid: str) -> None:
-        """Helper method to generate SNMP values.
+        The instances are determined when the subtree is requested first, by
+        walking the subtree in the MIB tree, and also stored in
+        `subtree_instance_oids`.
 
         Parameters
         ----------
         oid : `str`
-            The OID to generate a nested list of SNMP values for.
+            The OID of the root of the subtree.
+
+        Returns
+        -------
+        list[tuple[str, str, ObjectName]]
+            The instance OID, element name and object name of each instance,
+            in lexicographic order.
         """
-        for elt in self.mib_tree_holder.mib_tree:
-            elt_oid = self.mib_tree_holder.mib_tree[elt].oid
-            if elt_oid.startswith(oid):
-                try:
-                    parent = self.mib_tree_holder.mib_tree[elt].parent
-                    assert parent is not None
-                    if not parent.index:
-                        self._append_random_value(elt_oid + ".0", elt)
-                    else:
-                        self._handle_indexed_item(elt)
-                except KeyError:
-                    # Deliberately ignored.
-                    pass
-
-    def _handle_indexed_item(self, elt: str) -> None:
-        """Helper method to handle indexed items.
-
-        Indexed items represent list items and for each index in the list an
-        SNMP value needs to be created.
+        if oid not in self.subtree_instances:
+            instances: list[tuple[str, str, ObjectName]] = []
+            root = self.mib_tree_holder.get_element(ObjectName(oid).asTuple())
+            assert root is not None
+            for mib_tree_elt in self.mib_tree_holder.iter_subtree(root):
+                elt = mib_tree_elt.name
+                if elt not in TelemetryItemType.__members__:
+                    continue
+                elt_oid = mib_tree_elt.oid
+                parent = mib_tree_elt.parent
+                assert parent is not None
+                if not parent.index:
+                    instance_oids = [elt_oid + ".0"]
+                else:
+                    instance_oids = self._get_table_instance_oids(elt)
+                for instance_oid in instance_oids:
+                    self._get_value_kind(instance_oid, elt)
+                    instances.append((instance_oid, elt, ObjectName(instance_oid)))
+            self.subtree_instances[oid] = instances
+            self.subtree_instance_oids[oid] = [
+                object_name.asTuple() for _, _, object_name in instances
+            ]
+        return self.subtree_instances[oid]
+
+    def _get_table_instance_oids(self, elt: str) -> list[str]:
+        """Get the instance OIDs of a table column.
 
         Parameters
         ----------
         elt : `str`
-            The name of the indexed item.
+            The name of the table column.
+
+        Returns
+        -------
+        list[str]
+            The instance OID of each row.
         """
-        oid = self.mib_tree_holder.mib_tree[elt].oid
+        mib_tree = self.mib_tree_holder.mib_tree
+        oid_tuple = mib_tree[elt].oid_tuple
+        oid = mib_tree[elt].oid
 
-        if oid.startswith(self.mib_tree_holder.mib_tree["pdu"].oid):
+        if self._is_in_subtree("pdu", oid_tuple):
             # Handle PDU indexed items.
-            for i in range(PDU_LIST_START_OID, PDU_LIST_START_OID + PDU_LIST_NUM_OIDS):
-                self._append_random_value(oid + f".{i}", elt)
-        elif oid.startswith(self.mib_tree_holder.mib_tree["xups"].oid):
+            start_index, num_rows = PDU_LIST_START_OID, PDU_LIST_NUM_OIDS
+        elif self._is_in_subtree("xups", oid_tuple):
             # Handle XUPS indexed items.
-            for i in range(
-                XUPS_LIST_START_OID, XUPS_LIST_START_OID + XUPS_LIST_NUM_OIDS
-            ):
-                self._append_random_value(oid + f".{i}", elt)
+            start_index, num_rows = XUPS_LIST_START_OID, XUPS_LIST_NUM_OIDS
         else:
             self.log.warning(f"Unexpected list item for {oid=!r}.")
             # Handle all other indexed items.
-            for i in range(
-                MISC_LIST_START_OID, MISC_LIST_START_OID + MISC_LIST_NUM_OIDS
-            ):
-                self._append_random_value(oid + f".{i}", elt)
+            start_index, num_rows = MISC_LIST_START_OID, MISC_LIST_NUM_OIDS
+        if self.table_size is not None:
+            num_rows = self.table_size
+        return [oid + f".{i}" for i in range(start_index, start_index + num_rows)]
+
+    def _is_in_subtree(self, name: str, oid_tuple: tuple[int, ...]) -> bool:
+        """Determine whether an OID is in the subtree of a MIB element.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the MIB element, which may not be loaded if it belongs
+            to another device type.
+        oid_tuple : `tuple`[`int`, ...]
+            The OID.
+
+        Returns
+        -------
+        bool
+            True if the element is loaded and the OID is in its subtree.
+        """
+        mib_element = self.mib_tree_holder.mib_tree.get(name)
+        return mib_element is not None and mib_element.is_prefix_of(oid_tuple)
 
-    def _append_random_value(self, oid: str, elt: str) -> None:
-        """Helper method to generate a random value and append it to the
-        existing list of SNMP values.
+    def _get_value_kind(self, oid: str, elt: str) -> ValueKind | None:
+        """Get the kind of value of an instance OID.
 
         Parameters
         ----------
         oid : `str`
-            The OID to generate a value for.
+            The instance OID.
         elt : `str`
             The item name which is used for looking up the data type.
+
+        Returns
+        -------
+        ValueKind | None
+            The kind of value, or None if the item has no data type.
+        """
+        if oid in self.value_kinds:
+            return self.value_kinds[oid]
+        if elt not in TelemetryItemType.__members__:
+            return None
+
+        match TelemetryItemType[elt]:
+            case "int":
+                value_kind = ValueKind.INTEGER
+            case "string":
+                value_kind = ValueKind.STRING
+            case _:
+                if self._is_in_subtree(
+                    "pdu", self.mib_tree_holder.mib_tree[elt].oid_tuple
+                ):
+                    value_kind = (
+                        ValueKind.FLOAT_AS_HEX
+                        if oid in PDU_HEX_OID_LIST
+                        else ValueKind.FLOAT_AS_INTEGER
+                    )
+                elif oid in FREQUENCY_OID_LIST:
+                    value_kind = ValueKind.FREQUENCY
+                elif oid in SCHNEIDER_FLOAT_AS_STRING_OID_LIST:
+                    value_kind = ValueKind.FLOAT_AS_TEXT
+                else:
+                    value_kind = ValueKind.FLOAT_AS_INTEGER
+        self.value_kinds[oid] = value_kind
+        return value_kind
+
+    def generate_values(self, oids: typing.Sequence[str]) -> None:
+        """Generate new values for the provided instance OIDs and store them
+        in `values`.
+
+        With replay, the next values are taken from the replayed values
+        instead, which are generated when an OID is requested first.
+
+        Parameters
+        ----------
+        oids : `typing.Sequence`[`str`]
+            The instance OIDs, which need to have a kind of value.
+        """
+        if self.replay_length <= 0:
+            for oid, oid_values in self._generate_raw_values(oids, 1).items():
+                self.values[oid] = oid_values[0]
+            return
+
+        new_oids = [oid for oid in oids if oid not in self.replay_values]
+        if new_oids:
+            self.replay_values.update(
+                self._generate_raw_values(new_oids, self.replay_length)
+            )
+        for oid in oids:
+            num_replays = self.num_replays.get(oid, 0)
+            self.values[oid] = self.replay_values[oid][num_replays % self.replay_length]
+            self.num_replays[oid] = num_replays + 1
+
+    def _generate_raw_values(
+        self, oids: typing.Sequence[str], num_values: int
+    ) -> dict[str, list[typing.Any]]:
+        """Generate raw values for the provided instance OIDs.
+
+        The values are generated in a single batch per kind of value.
+
+        Parameters
+        ----------
+        oids : `typing.Sequence`[`str`]
+            The instance OIDs, which need to have a kind of value.
+        num_values : `int`
+            The number of values per OID.
+
+        Returns
+        -------
+        dict[str, list[typing.Any]]
+            The raw values, by instance OID.
+        """
+        oids_per_kind: dict[ValueKind, list[str]] = collections.defaultdict(list)
+        for oid in oids:
+            oids_per_kind[self.value_kinds[oid]].append(oid)
+
+        raw_values: dict[str, list[typing.Any]] = {}
+        for value_kind, kind_oids in oids_per_kind.items():
+            shape = (len(kind_oids), num_values)
+            # The dtype of the values depends on the kind of value.
+            values: npt.NDArray[typing.Any]
+            match value_kind:
+                case ValueKind.INTEGER:
+                    values = self.random_generator.integers(0, 100, shape)
+                case ValueKind.FLOAT_AS_INTEGER:
+                    values = self.random_generator.integers(100, 1000, shape)
+                case ValueKind.FLOAT_AS_HEX:
+                    values = np.round(
+                        self.random_generator.uniform(0.0, 10.0, shape), 2
+                    )
+                case ValueKind.FLOAT_AS_TEXT:
+                    values = self.random_generator.uniform(0.0, 250.0, shape)
+                case ValueKind.FREQUENCY:
+                    values = np.full(shape, FIFTY_HZ_IN_TENS)
+                case ValueKind.STRING:
+                    characters = STRING_CHARACTERS[
+                        self.random_generator.integers(
+                            0, len(STRING_CHARACTERS), shape + (STRING_LENGTH,)
+                        )
+                    ]
+                    values = characters.view(f"<U{STRING_LENGTH}")[..., 0]
+            raw_values.update(zip(kind_oids, values.tolist()))
+        return raw_values
+
+    def _generate_random_value(self, oid: str, elt: str) -> Integer | OctetString:
+        """Helper method to get the generated value of an instance OID as an
+        SNMP value.
+
+        Parameters
+        ----------
+        oid : `str`
+            The OID to get the value of.
+        elt : `str`
+            The item name which is used for looking up the data type.
+
+        Returns
+        -------
+        Integer | OctetString
+            An SNMP Integer or OctetString object.
         """
         match TelemetryItemType[elt]:
             case "int":
@@ -192,9 +699,7 @@ class SnmpServerSimulator:
                 self.log.error(
                     f"Unknown telemetry item type {TelemetryItemType[elt]} for {elt=}"
                 )
-        self.snmp_items.append(
-            [None, Integer(0), Integer(0), [(ObjectName(value=oid), value)]]
-        )
+        return value
 
     def generate_integer(self, oid: str) -> Integer:
         """Generate an integer value.
@@ -209,7 +714,7 @@ class SnmpServerSimulator:
         Integer
             An SNMP Integer object.
         """
-        return Integer(random.randrange(0, 100, 1))
+        return Integer(self.values[oid])
 
     def generate_float(self, oid: str) -> Integer | OctetString:
         """Generate a float value.
@@ -224,15 +729,19 @@ class SnmpServerSimulator:
         Integer | OctetString
             An SNMP Integer or OctetString object.
         """
-        if oid.startswith(self.mib_tree_holder.mib_tree["pdu"].oid):
-            value = self._generate_pdu_float(oid)
-        elif oid in FREQUENCY_OID_LIST:
-            value = Integer(FIFTY_HZ_IN_TENS)
-        elif oid in SCHNEIDER_FLOAT_AS_STRING_OID_LIST:
-            value = self._generate_schneider_float_string()
-        else:
-            value = self._generate_random_float()
-        return value
+        float_value = self.values[oid]
+        match self.value_kinds[oid]:
+            case ValueKind.FLOAT_AS_HEX:
+                hex_string = (
+                    "0x"
+                    + "".join([format(ord(c), "x") for c in f"{float_value:0.2f}"])
+                    + "00"
+                )
+                return OctetString(value=hex_string)
+            case ValueKind.FLOAT_AS_TEXT:
+                return OctetString(value=f"{float_value}")
+            case _:
+                return Integer(float_value)
 
     def generate_string(self, oid: str) -> OctetString:
         """Generate a string value.
@@ -247,30 +756,4 @@ class SnmpServerSimulator:
         OctetString
             An SNMP OctetString object.
         """
-        return OctetString(
-            value="".join(random.choices(string.ascii_uppercase + string.digits, k=20))
-        )
-
-    def _generate_pdu_float(self, oid: str) -> Integer | OctetString:
-        # Certain PDU values are floats encoded as hexadecimal strings of the
-        # format "0x<hex value>00".
-        if oid in PDU_HEX_OID_LIST:
-            float_value = round(random.uniform(0.0, 10.0), 2)
-            hex_string = (
-                "0x"
-                + "".join([format(ord(c), "x") for c in f"{float_value:0.2f}"])
-                + "00"
-            )
-            return OctetString(value=hex_string)
-        else:
-            return Integer(random.randrange(100, 1000, 1))
-
-    def _generate_schneider_float_string(self) -> OctetString:
-        # Certain Schneider UPS values are strings that represent float values.
-        float_value = random.uniform(0.0, 250.0)
-        return OctetString(value=f"{float_value}")
-
-    def _generate_random_float(self) -> Integer:
-        # SNMP doesn't have floats. Instead an int is used which needs to be
-        # cast to a float by the reader.
-        return Integer(random.randrange(100, 1000, 1))
+        return OctetString(value=self.values[oid])
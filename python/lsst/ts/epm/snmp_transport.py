@@ -0,0 +1,474 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "SnmpTransport",
+    "SnmpResponse",
+    "OID_NOT_INCREASING_ERROR_INDICATION",
+    "TIMEOUT_ERROR_INDICATION",
+]
+
+import asyncio
+import contextlib
+import logging
+import socket
+import typing
+
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pysnmp.proto import api
+from pysnmp.proto.rfc1902 import ObjectName
+from pysnmp.proto.rfc1905 import EndOfMibView
+
+# Same defaults as the pysnmp UdpTransportTarget.
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_RETRIES = 5
+
+# SNMPv1 reports the end of a walk with the noSuchName error status.
+NO_SUCH_NAME = 2
+
+TIMEOUT_ERROR_INDICATION = "No SNMP response received before timeout"
+OID_NOT_INCREASING_ERROR_INDICATION = "OID not increasing"
+
+# The same (error_indication, error_status, error_index, var_binds) tuple that
+# the pysnmp hlapi commands yield.
+SnmpResponse = tuple[typing.Any, typing.Any, typing.Any, list]
+
+
+class SnmpTransport(asyncio.DatagramProtocol):
+    """Send SNMP requests over an asyncio UDP endpoint.
+
+    The SNMP messages are encoded and decoded with the pysnmp protocol API and
+    sent from a single, unconnected UDP socket. Responses are matched to their
+    requests by request ID and by the address of the agent, so many requests,
+    to any number of agents, can be outstanding at the same time without the
+    need for threads.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    timeout : `float`, optional
+        The time [s] to wait for a response before resending a request.
+    retries : `int`, optional
+        The number of times a request is resent before giving up.
+    max_outstanding_requests : `int` | None, optional
+        The maximum number of requests that are waiting for a response at the
+        same time, or None (the default) for no limit. Further requests wait
+        until an earlier request is done.
+    """
+
+    def __init__(
+        self,
+        log: logging.Logger,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        max_outstanding_requests: int | None = None,
+    ) -> None:
+        self.log = log.getChild(type(self).__name__)
+        self.timeout = timeout
+        self.retries = retries
+        self.request_semaphore = (
+            asyncio.Semaphore(max_outstanding_requests)
+            if max_outstanding_requests is not None
+            else None
+        )
+
+        self.transport: asyncio.DatagramTransport | None = None
+        # The address the request was sent to and the future for the response
+        # PDU, by request ID.
+        self.pending_requests: dict[int, tuple[tuple[str, int], asyncio.Future]] = {}
+        # The resolved address by address, until a request to the address
+        # times out or the transport is closed, so a changed DNS entry is
+        # picked up.
+        self.resolved_addresses: dict[tuple[str, int], tuple[str, int]] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self.transport is not None and not self.transport.is_closing()
+
+    async def connect(self) -> None:
+        """Open the UDP endpoint."""
+        if self.connected:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(
+            lambda: self, local_addr=("0.0.0.0", 0), family=socket.AF_INET
+        )
+
+    def close(self) -> None:
+        """Close the UDP endpoint and forget the resolved addresses."""
+        self.resolved_addresses.clear()
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = typing.cast(asyncio.DatagramTransport, transport)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        for _, future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError("SNMP transport closed."))
+        self.transport = None
+
+    def error_received(self, exc: Exception) -> None:
+        # For instance an ICMP port unreachable. The request will time out.
+        self.log.debug(f"Received {exc!r} on the SNMP transport. Ignoring.")
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        try:
+            p_mod = api.protoModules[int(api.decodeMessageVersion(data))]
+            rsp_msg, _ = decoder.decode(data, asn1Spec=p_mod.Message())
+            rsp_pdu = p_mod.apiMessage.getPDU(rsp_msg)
+            request_id = int(p_mod.apiPDU.getRequestID(rsp_pdu))
+        except (KeyError, PyAsn1Error) as e:
+            self.log.debug(f"Received undecodable datagram from {addr}: {e!r}.")
+            return
+        pending_request = self.pending_requests.get(request_id)
+        if pending_request is None or pending_request[1].done():
+            self.log.debug(f"Received unexpected {request_id=} from {addr}.")
+            return
+        address, future = pending_request
+        if tuple(addr[:2]) != address:
+            self.log.debug(
+                f"Received {request_id=} from {addr} instead of {address}. Ignoring."
+            )
+            return
+        future.set_result(rsp_pdu)
+
+    async def get_cmd(
+        self,
+        address: tuple[str, int],
+        community: str,
+        version: int,
+        oids: typing.Sequence[str | tuple[int, ...] | ObjectName],
+    ) -> SnmpResponse:
+        """Send a GET request for the provided OIDs.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        version : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+        oids : `typing.Sequence`
+            The OIDs to get.
+
+        Returns
+        -------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        p_mod = api.protoModules[version]
+        pdu = p_mod.GetRequestPDU()
+        p_mod.apiPDU.setDefaults(pdu)
+        p_mod.apiPDU.setVarBinds(pdu, [(oid, p_mod.Null("")) for oid in oids])
+        return await self.send_request(address, community, version, pdu)
+
+    async def next_cmd(
+        self,
+        address: tuple[str, int],
+        community: str,
+        version: int,
+        oids: typing.Sequence[str | tuple[int, ...] | ObjectName],
+    ) -> SnmpResponse:
+        """Send a GETNEXT request for the provided OIDs.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        version : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+        oids : `typing.Sequence`
+            The OIDs to get the successors of.
+
+        Returns
+        -------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        p_mod = api.protoModules[version]
+        pdu = p_mod.GetNextRequestPDU()
+        p_mod.apiPDU.setDefaults(pdu)
+        p_mod.apiPDU.setVarBinds(pdu, [(oid, p_mod.Null("")) for oid in oids])
+        return await self.send_request(address, community, version, pdu)
+
+    async def walk(
+        self,
+        address: tuple[str, int],
+        community: str,
+        version: int,
+        oid: str,
+        start_oid: str | tuple[int, ...] | ObjectName | None = None,
+    ) -> typing.AsyncIterator[SnmpResponse]:
+        """Walk the subtree of the provided OID with GETNEXT requests.
+
+        Like the pysnmp ``nextCmd`` with ``lexicographicMode=False``, the walk
+        stops as soon as a returned OID is outside of the subtree. In case of
+        an error, the response with the error is yielded and the walk stops.
+        An interrupted walk can be resumed by passing the last OID received
+        as ``start_oid``.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        version : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+        oid : `str`
+            The OID of the root of the subtree.
+        start_oid : `str` | `tuple`[`int`, ...] | `ObjectName` | None
+            The OID after which the walk starts, or None (the default) to walk
+            the whole subtree.
+
+        Yields
+        ------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        root = ObjectName(oid)
+        next_oid = root if start_oid is None else ObjectName(start_oid)
+        while True:
+            response = await self.next_cmd(address, community, version, [next_oid])
+            error_indication, error_status, error_index, var_binds = response
+            if error_indication or error_status:
+                if version == 0 and int(error_status) == NO_SUCH_NAME:
+                    return
+                yield response
+                return
+
+            name, value = var_binds[0]
+            if not root.isPrefixOf(name) or isinstance(value, EndOfMibView):
+                return
+            if name <= next_oid:
+                yield OID_NOT_INCREASING_ERROR_INDICATION, 0, 0, []
+                return
+            yield response
+            next_oid = name
+
+    async def bulk_cmd(
+        self,
+        address: tuple[str, int],
+        community: str,
+        non_repeaters: int,
+        max_repetitions: int,
+        oids: typing.Sequence[str | tuple[int, ...] | ObjectName],
+    ) -> SnmpResponse:
+        """Send an SNMPv2c GETBULK request for the provided OIDs.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        non_repeaters : `int`
+            The number of leading OIDs for which only a single successor is
+            requested.
+        max_repetitions : `int`
+            The maximum number of successors requested for the other OIDs.
+        oids : `typing.Sequence`
+            The OIDs to get the successors of.
+
+        Returns
+        -------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        p_mod = api.protoModules[api.protoVersion2c]
+        pdu = p_mod.GetBulkRequestPDU()
+        p_mod.apiBulkPDU.setDefaults(pdu)
+        p_mod.apiBulkPDU.setNonRepeaters(pdu, non_repeaters)
+        p_mod.apiBulkPDU.setMaxRepetitions(pdu, max_repetitions)
+        p_mod.apiBulkPDU.setVarBinds(pdu, [(oid, p_mod.Null("")) for oid in oids])
+        return await self.send_request(address, community, api.protoVersion2c, pdu)
+
+    async def bulk_walk(
+        self,
+        address: tuple[str, int],
+        community: str,
+        oid: str,
+        non_repeaters: int,
+        max_repetitions: int,
+        start_oid: str | tuple[int, ...] | ObjectName | None = None,
+    ) -> typing.AsyncIterator[SnmpResponse]:
+        """Walk the subtree of the provided OID with SNMPv2c GETBULK requests.
+
+        Each response contains up to ``max_repetitions`` var binds, so the
+        walk takes far fewer round trips than a walk with GETNEXT requests.
+        Var binds outside of the subtree are discarded and end the walk. In
+        case of an error, the response with the error is yielded and the walk
+        stops. An interrupted walk can be resumed by passing the last OID
+        received as ``start_oid``.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        oid : `str`
+            The OID of the root of the subtree.
+        non_repeaters : `int`
+            The number of leading OIDs for which only a single successor is
+            requested.
+        max_repetitions : `int`
+            The maximum number of successors requested per GETBULK request.
+        start_oid : `str` | `tuple`[`int`, ...] | `ObjectName` | None
+            The OID after which the walk starts, or None (the default) to walk
+            the whole subtree.
+
+        Yields
+        ------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+        """
+        root = ObjectName(oid)
+        next_oid = root if start_oid is None else ObjectName(start_oid)
+        while True:
+            response = await self.bulk_cmd(
+                address, community, non_repeaters, max_repetitions, [next_oid]
+            )
+            error_indication, error_status, error_index, var_binds = response
+            if error_indication or error_status:
+                yield response
+                return
+
+            subtree_var_binds = []
+            for name, value in var_binds:
+                if not root.isPrefixOf(name) or isinstance(value, EndOfMibView):
+                    break
+                if name <= next_oid:
+                    yield OID_NOT_INCREASING_ERROR_INDICATION, 0, 0, []
+                    return
+                subtree_var_binds.append((name, value))
+                next_oid = name
+            if subtree_var_binds:
+                yield error_indication, error_status, error_index, subtree_var_binds
+            if not subtree_var_binds or len(subtree_var_binds) < len(var_binds):
+                return
+
+    async def send_request(
+        self,
+        address: tuple[str, int],
+        community: str,
+        version: int,
+        pdu: typing.Any,
+    ) -> SnmpResponse:
+        """Send a request PDU and wait for the response.
+
+        The request is resent if no response arrives within the timeout, until
+        the number of retries is exhausted. If the number of outstanding
+        requests is limited, the request first waits for its turn.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+        community : `str`
+            The SNMP community.
+        version : `int`
+            The SNMP message processing model; 0 for SNMPv1 and 1 for SNMPv2c.
+        pdu : `typing.Any`
+            The request PDU.
+
+        Returns
+        -------
+        SnmpResponse
+            The error indication, error status, error index and var binds.
+
+        Raises
+        ------
+        ConnectionError
+            In case the transport is not connected.
+        """
+        if self.transport is None:
+            raise ConnectionError("SNMP transport not connected.")
+
+        p_mod = api.protoModules[version]
+        msg = p_mod.Message()
+        p_mod.apiMessage.setDefaults(msg)
+        p_mod.apiMessage.setCommunity(msg, community)
+        p_mod.apiMessage.setPDU(msg, pdu)
+        data = encoder.encode(msg)
+
+        resolved_address = await self._resolve(address)
+        request_id = int(p_mod.apiPDU.getRequestID(pdu))
+        async with self.request_semaphore or contextlib.nullcontext():
+            if self.transport is None:
+                raise ConnectionError("SNMP transport not connected.")
+            future = asyncio.get_running_loop().create_future()
+            self.pending_requests[request_id] = (resolved_address, future)
+            try:
+                for _ in range(self.retries + 1):
+                    self.transport.sendto(data, resolved_address)
+                    try:
+                        rsp_pdu = await asyncio.wait_for(
+                            asyncio.shield(future), self.timeout
+                        )
+                        break
+                    except asyncio.TimeoutError:
+                        continue
+                else:
+                    # Resolve the host name again for the next request, in
+                    # case the address of the device changed.
+                    self.resolved_addresses.pop(address, None)
+                    return TIMEOUT_ERROR_INDICATION, 0, 0, []
+            finally:
+                self.pending_requests.pop(request_id, None)
+
+        return (
+            None,
+            p_mod.apiPDU.getErrorStatus(rsp_pdu),
+            p_mod.apiPDU.getErrorIndex(rsp_pdu),
+            list(p_mod.apiPDU.getVarBinds(rsp_pdu)),
+        )
+
+    async def _resolve(self, address: tuple[str, int]) -> tuple[str, int]:
+        """Resolve the host name in the address, unless it already was
+        resolved since the last request to the address timed out.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the SNMP agent.
+
+        Returns
+        -------
+        tuple[str, int]
+            The IP address and port of the SNMP agent.
+        """
+        if address not in self.resolved_addresses:
+            loop = asyncio.get_running_loop()
+            addr_info = await loop.getaddrinfo(
+                *address, family=socket.AF_INET, type=socket.SOCK_DGRAM
+            )
+            host, port = addr_info[0][4][:2]
+            self.resolved_addresses[address] = (str(host), int(port))
+        return self.resolved_addresses[address]
@@ -0,0 +1,58 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["make_data_client_config"]
+
+import copy
+import types
+import typing
+
+from lsst.ts.ess import common
+
+
+def make_data_client_config(
+    data_client_class: type[common.data_client.BaseDataClient],
+    **kwargs: typing.Any,
+) -> types.SimpleNamespace:
+    """Make the configuration of a data client, with the defaults of its
+    config schema applied.
+
+    Parameters
+    ----------
+    data_client_class : `type`[`common.data_client.BaseDataClient`]
+        The class of the data client.
+    **kwargs : `typing.Any`
+        Configuration items that override the defaults. The items without
+        a default, such as ``host``, need to be provided.
+
+    Returns
+    -------
+    types.SimpleNamespace
+        The configuration.
+    """
+    schema = data_client_class.get_config_schema()
+    config = {
+        name: copy.deepcopy(item["default"])
+        for name, item in schema["properties"].items()
+        if "default" in item
+    }
+    config.update(kwargs)
+    return types.SimpleNamespace(**config)
@@ -27,12 +27,15 @@ __all__ = [
     "SCHNEIDER_FLOAT_AS_STRING_OID_LIST",
     "MibTreeElement",
     "MibTreeElementType",
+    "TelemetryPlanItem",
     "TelemetryItemName",
     "TelemetryItemType",
     "TelemetryItemUnit",
+    "intern_oid",
 ]
 
 import enum
+import typing
 from dataclasses import dataclass
 
 # List of OIDs for which the frequency value is given in tens of Hz.
@@ -91,23 +94,103 @@ SCHNEIDER_FLOAT_AS_STRING_OID_LIST = [
 ]
 
 
-@dataclass
+# The interned OIDs, so all equal OIDs share the same tuple.
+_interned_oids: dict[tuple[int, ...], tuple[int, ...]] = {}
+
+
+def intern_oid(oid: str | typing.Iterable[int]) -> tuple[int, ...]:
+    """Get the interned tuple of ints of an OID.
+
+    Parameters
+    ----------
+    oid : `str` | `typing.Iterable`[`int`]
+        The OID, either as dotted string or as ints.
+
+    Returns
+    -------
+    tuple[int, ...]
+        The OID as tuple of ints, which is the same object for all equal OIDs.
+    """
+    oid_tuple = (
+        tuple(int(i) for i in oid.split(".")) if isinstance(oid, str) else tuple(oid)
+    )
+    return _interned_oids.setdefault(oid_tuple, oid_tuple)
+
+
+@dataclass(slots=True, eq=False)
 class MibTreeElement:
     """MIB Tree Element.
 
-    A Tree Element can either be a BRANCH or a LEAF.
+    A Tree Element can either be a BRANCH or a LEAF. The OID is stored as an
+    interned tuple of ints, so OIDs are compared and prefixes are matched by
+    number rather than by text, and elements sort in lexicographic OID order.
+    Elements are equal only if they are the same object. The OID is passed to
+    the constructor as ``oid_tuple``; ``oid`` is a read-only property.
     """
 
     name: str
     description: str
-    oid: str
+    oid_tuple: tuple[int, ...]
     parent: MibTreeElement | None
     type: str
     index: str | None = None
 
+    def __post_init__(self) -> None:
+        # All elements are constructed, also the ones loaded from the MIB
+        # cache, so this interns the OID of every element.
+        self.oid_tuple = intern_oid(self.oid_tuple)
+
     def __repr__(self) -> str:
         return self.oid
 
+    def __lt__(self, other: MibTreeElement) -> bool:
+        return self.oid_tuple < other.oid_tuple
+
+    @property
+    def oid(self) -> str:
+        """The OID as dotted string."""
+        return ".".join(str(i) for i in self.oid_tuple)
+
+    def is_prefix_of(self, oid: tuple[int, ...]) -> bool:
+        """Determine whether the OID of this element is a prefix of the
+        provided OID, which means that the provided OID is in the subtree of
+        this element.
+
+        Parameters
+        ----------
+        oid : `tuple`[`int`, ...]
+            The OID.
+
+        Returns
+        -------
+        bool
+            True if the OID is in the subtree, False otherwise.
+        """
+        return oid[: len(self.oid_tuple)] == self.oid_tuple
+
+
+@dataclass(frozen=True)
+class TelemetryPlanItem:
+    """Precompiled information needed to read a telemetry item.
+
+    For single values ``oid`` is the instance OID and ``fallback_oid`` the
+    instance OID used if the former is not present. For arrays ``oid`` is the
+    OID of the table column. The OIDs are tuples of ints and the decoder
+    converts the pysnmp value to the type of the telemetry item. ``group`` is
+    the name of the field group of the telemetry item, if any.
+    """
+
+    name: str
+    mib_name: str
+    oid: tuple[int, ...]
+    fallback_oid: tuple[int, ...] | None
+    decoder: typing.Callable[[typing.Any], typing.Any]
+    missing_value: typing.Any
+    scale: float
+    is_array: bool
+    array_length: int | None
+    group: str | None = None
+
 
 class MibTreeElementType(enum.StrEnum):
     """MIB Tree Element Type."""
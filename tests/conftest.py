@@ -0,0 +1,44 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import tempfile
+import typing
+
+import pytest
+from lsst.ts.epm import MIB_CACHE_DIR_ENV_VAR
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mib_cache_dir() -> typing.Iterator[str]:
+    """Write the MIB tree cache files to a temporary directory instead of the
+    cache directory of the user."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        old_cache_dir = os.environ.get(MIB_CACHE_DIR_ENV_VAR)
+        os.environ[MIB_CACHE_DIR_ENV_VAR] = cache_dir
+        try:
+            yield cache_dir
+        finally:
+            if old_cache_dir is None:
+                del os.environ[MIB_CACHE_DIR_ENV_VAR]
+            else:
+                os.environ[MIB_CACHE_DIR_ENV_VAR] = old_cache_dir
@@ -0,0 +1,88 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from lsst.ts import epm
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    def test_backoff(self) -> None:
+        circuit_breaker = epm.CircuitBreaker(
+            failure_threshold=2, min_backoff=10.0, max_backoff=25.0
+        )
+        assert circuit_breaker.state == epm.CircuitBreakerState.CLOSED
+
+        # A success resets the number of consecutive failures.
+        circuit_breaker.record_failure(timestamp=0.0)
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure(timestamp=1.0)
+        assert circuit_breaker.state == epm.CircuitBreakerState.CLOSED
+        assert circuit_breaker.allow_request(timestamp=1.0)
+
+        circuit_breaker.record_failure(timestamp=2.0)
+        assert circuit_breaker.state == epm.CircuitBreakerState.OPEN
+        assert not circuit_breaker.allow_request(timestamp=11.9)
+
+        # The backoff time doubles each time the probe fails.
+        probe_time = 12.0
+        for backoff in (20.0, 25.0, 25.0):
+            assert circuit_breaker.allow_request(timestamp=probe_time)
+            assert circuit_breaker.state == epm.CircuitBreakerState.HALF_OPEN
+            circuit_breaker.record_failure(timestamp=probe_time)
+            assert circuit_breaker.state == epm.CircuitBreakerState.OPEN
+            assert not circuit_breaker.allow_request(
+                timestamp=probe_time + backoff - 0.1
+            )
+            probe_time += backoff
+
+        assert circuit_breaker.allow_request(timestamp=probe_time)
+        circuit_breaker.record_success()
+        assert circuit_breaker.state == epm.CircuitBreakerState.CLOSED
+        assert circuit_breaker.num_failures == 0
+
+        # After closing, the backoff time starts over.
+        circuit_breaker.record_failure(timestamp=100.0)
+        circuit_breaker.record_failure(timestamp=100.0)
+        assert circuit_breaker.probe_time == 110.0
+
+    def test_jitter(self) -> None:
+        circuit_breaker = epm.CircuitBreaker(
+            failure_threshold=1, min_backoff=10.0, max_backoff=10.0, jitter=0.2
+        )
+        probe_times = set()
+        for _ in range(20):
+            circuit_breaker.record_success()
+            circuit_breaker.record_failure(timestamp=0.0)
+            assert circuit_breaker.probe_time is not None
+            assert 8.0 <= circuit_breaker.probe_time <= 12.0
+            probe_times.add(circuit_breaker.probe_time)
+        assert len(probe_times) > 1
+
+    def test_invalid_backoff(self) -> None:
+        for min_backoff, max_backoff in ((0.0, 10.0), (-1.0, 10.0), (10.0, 5.0)):
+            with self.subTest(min_backoff=min_backoff, max_backoff=max_backoff):
+                with self.assertRaises(ValueError):
+                    epm.CircuitBreaker(
+                        failure_threshold=1,
+                        min_backoff=min_backoff,
+                        max_backoff=max_backoff,
+                    )
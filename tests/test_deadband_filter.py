@@ -0,0 +1,91 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+import unittest
+
+from lsst.ts import epm
+
+
+class DeadbandFilterTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_absolute_deadband(self) -> None:
+        deadband_filter = epm.DeadbandFilter(max_silence=10.0, absolute_deadband=1.0)
+
+        assert deadband_filter.should_publish({"voltage": 230.0}, timestamp=0.0)
+        assert not deadband_filter.should_publish({"voltage": 230.9}, timestamp=1.0)
+        assert not deadband_filter.should_publish({"voltage": 229.1}, timestamp=2.0)
+        assert deadband_filter.should_publish({"voltage": 231.1}, timestamp=3.0)
+        # The deadband is relative to the last published value.
+        assert not deadband_filter.should_publish({"voltage": 230.5}, timestamp=4.0)
+        assert deadband_filter.num_published == 2
+        assert deadband_filter.num_suppressed == 3
+
+    async def test_relative_deadband(self) -> None:
+        deadband_filter = epm.DeadbandFilter(
+            max_silence=10.0,
+            relative_deadband=0.01,
+            deadbands={"current": {"absolute": 0.5, "relative": 0.0}},
+        )
+
+        assert deadband_filter.should_publish(
+            {"voltage": 200.0, "current": 10.0}, timestamp=0.0
+        )
+        assert not deadband_filter.should_publish(
+            {"voltage": 201.9, "current": 10.4}, timestamp=1.0
+        )
+        assert deadband_filter.should_publish(
+            {"voltage": 202.1, "current": 10.0}, timestamp=2.0
+        )
+        assert deadband_filter.should_publish(
+            {"voltage": 202.1, "current": 10.6}, timestamp=3.0
+        )
+
+    async def test_other_values(self) -> None:
+        deadband_filter = epm.DeadbandFilter(max_silence=10.0, absolute_deadband=1.0)
+        telemetry_dict = {
+            "systemDescription": "UPS",
+            "currents": [1.0, 2.0, math.nan],
+        }
+
+        assert deadband_filter.should_publish(telemetry_dict, timestamp=0.0)
+        # The published values are copies.
+        telemetry_dict["currents"][0] = 1.5
+        assert not deadband_filter.should_publish(telemetry_dict, timestamp=1.0)
+        assert deadband_filter.should_publish(
+            {"systemDescription": "UPS 2", "currents": [1.0, 2.0, math.nan]},
+            timestamp=2.0,
+        )
+        assert deadband_filter.should_publish(
+            {"systemDescription": "UPS 2", "currents": [1.0, 2.0, 3.0]},
+            timestamp=3.0,
+        )
+        assert deadband_filter.should_publish(
+            {"systemDescription": "UPS 2", "currents": [1.0, 3.5, 3.0]},
+            timestamp=4.0,
+        )
+
+    async def test_max_silence(self) -> None:
+        deadband_filter = epm.DeadbandFilter(max_silence=10.0, absolute_deadband=1.0)
+
+        assert deadband_filter.should_publish({"voltage": 230.0}, timestamp=0.0)
+        assert not deadband_filter.should_publish({"voltage": 230.0}, timestamp=9.9)
+        assert deadband_filter.should_publish({"voltage": 230.0}, timestamp=10.0)
+        assert not deadband_filter.should_publish({"voltage": 230.0}, timestamp=19.9)
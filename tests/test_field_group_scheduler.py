@@ -0,0 +1,59 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from lsst.ts import epm
+
+
+class FieldGroupSchedulerTestCase(unittest.TestCase):
+    def test_due_groups(self) -> None:
+        field_group_scheduler = epm.FieldGroupScheduler(
+            field_groups={
+                "fast": {"interval": 1.0, "items": ["loadCurrentA"]},
+                "slow": {"interval": 10.0, "items": ["resetDateTime", "outputLoad"]},
+                "static": {"interval": 0.0, "items": ["serialNumber"]},
+            },
+            tolerance=0.5,
+        )
+        assert field_group_scheduler.group_names == {"fast", "slow", "static"}
+        assert field_group_scheduler.groups["outputLoad"] == "slow"
+
+        # Groups that were never polled are due, except static groups.
+        assert field_group_scheduler.get_due_groups(timestamp=0.0) == {"fast", "slow"}
+        field_group_scheduler.record_poll(
+            field_group_scheduler.group_names, timestamp=0.0
+        )
+
+        # Polls that are slightly early still are on time.
+        assert field_group_scheduler.get_due_groups(timestamp=0.6) == {"fast"}
+        field_group_scheduler.record_poll({"fast"}, timestamp=0.6)
+        assert field_group_scheduler.get_due_groups(timestamp=1.0) == set()
+        assert field_group_scheduler.get_due_groups(timestamp=9.6) == {"fast", "slow"}
+
+    def test_duplicate_item(self) -> None:
+        with self.assertRaises(ValueError):
+            epm.FieldGroupScheduler(
+                field_groups={
+                    "fast": {"interval": 1.0, "items": ["loadCurrentA"]},
+                    "slow": {"interval": 10.0, "items": ["loadCurrentA"]},
+                }
+            )
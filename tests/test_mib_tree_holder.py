@@ -19,7 +19,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
+import pathlib
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from lsst.ts import epm
 
@@ -45,3 +49,243 @@ class MibTreeTestCase(unittest.IsolatedAsyncioTestCase):
         assert mib_tree_holder.mib_tree["xups"].parent.name == "eaton"
 
         assert len(mib_tree_holder.pending_modules) == 0
+
+    async def test_mib_tree_element_oid(self) -> None:
+        mib_tree_holder = epm.MibTreeHolder()
+        mib_tree = mib_tree_holder.mib_tree
+        assert mib_tree["sysDescr"].oid_tuple == (1, 3, 6, 1, 2, 1, 1, 1)
+        assert mib_tree["sysDescr"].oid_tuple is epm.intern_oid("1.3.6.1.2.1.1.1")
+        assert not hasattr(mib_tree["sysDescr"], "__dict__")
+
+        # OIDs are matched and sorted by number, not by text.
+        xups_ident = mib_tree["xupsIdent"]
+        assert xups_ident.oid == "1.3.6.1.4.1.534.1.1"
+        assert xups_ident.is_prefix_of(xups_ident.oid_tuple + (1, 0))
+        assert mib_tree["xupsConfig"].oid.startswith(xups_ident.oid)
+        assert not xups_ident.is_prefix_of(mib_tree["xupsConfig"].oid_tuple)
+        assert sorted([mib_tree["xupsConfig"], mib_tree["xupsBattery"]]) == [
+            mib_tree["xupsBattery"],
+            mib_tree["xupsConfig"],
+        ]
+
+    async def test_oid_lookup(self) -> None:
+        mib_tree_holder = epm.MibTreeHolder(device_types=["pdu"], use_cache=False)
+        mib_tree = mib_tree_holder.mib_tree
+        assert len(mib_tree_holder.oid_index) == len(mib_tree)
+        assert (
+            mib_tree_holder.get_element((1, 3, 6, 1, 2, 1, 1, 1))
+            is mib_tree["sysDescr"]
+        )
+        assert mib_tree_holder.get_element((1, 3, 6, 1, 2, 1, 1, 1, 0)) is None
+
+        # Instance OIDs map to their object and index.
+        current_draw = mib_tree["currentDrawStatus1"]
+        assert mib_tree_holder.match_oid(current_draw.oid_tuple + (0,)) == (
+            current_draw,
+            (0,),
+        )
+        outlet_status = mib_tree["outletStatus"]
+        assert mib_tree_holder.match_oid(outlet_status.oid_tuple + (2,)) == (
+            outlet_status,
+            (2,),
+        )
+        assert mib_tree_holder.match_oid((1, 2, 3)) is None
+
+        # Loading another device type extends the index.
+        xups_oid = (1, 3, 6, 1, 4, 1, 534, 1, 1, 1, 0)
+        assert mib_tree_holder.match_oid(xups_oid) == (
+            mib_tree["enterprises"],
+            (534, 1, 1, 1, 0),
+        )
+        mib_tree_holder.load_device_type("xups")
+        xups_ident_manufacturer = mib_tree["xupsIdentManufacturer"]
+        assert mib_tree_holder.match_oid(xups_ident_manufacturer.oid_tuple + (0,)) == (
+            xups_ident_manufacturer,
+            (0,),
+        )
+
+    async def test_shadowed_element(self) -> None:
+        # The products branch of the Schneider MIB is shadowed in the MIB tree
+        # by the products branch of the Eaton MIB.
+        mib_tree_holder = epm.MibTreeHolder(use_cache=False)
+        mib_tree = mib_tree_holder.mib_tree
+        products_oid = (1, 3, 6, 1, 4, 1, 3833, 1, 100)
+        assert mib_tree["products"].oid_tuple != products_oid
+
+        products = mib_tree_holder.get_element(products_oid)
+        assert products is not None
+        assert products.name == "products"
+        assert products.parent.parent is mib_tree["scheiderPm5xxx"]
+        assert mib_tree_holder.match_oid(products_oid + (0,)) == (products, (0,))
+        assert mib_tree_holder.get_next_element(products_oid[:-1]) is products
+        assert mib_tree_holder.get_children(products.parent) == [products]
+
+        # All ancestors of the elements in the MIB tree are indexed.
+        for elt in mib_tree.values():
+            assert mib_tree_holder.get_element(elt.oid_tuple) is elt
+            if elt.parent is not None:
+                assert mib_tree_holder.get_element(elt.parent.oid_tuple) is elt.parent
+
+    async def test_subtree(self) -> None:
+        mib_tree_holder = epm.MibTreeHolder(use_cache=False)
+        mib_tree = mib_tree_holder.mib_tree
+
+        # The children are sorted numerically, so .10 follows .9.
+        xups_mib = mib_tree["xups"]
+        children = mib_tree_holder.get_children(xups_mib)
+        assert [child.oid_tuple for child in children] == sorted(
+            child.oid_tuple for child in children
+        )
+        assert mib_tree["xupsConfig"] in children
+        assert mib_tree_holder.get_children(mib_tree["xupsIdentManufacturer"]) == []
+
+        # The subtree walk yields the same elements as a scan of the whole
+        # tree, in lexicographic order.
+        for name in ["xups", "pdu", "scheiderPm5xxx"]:
+            root = mib_tree[name]
+            subtree = list(mib_tree_holder.iter_subtree(root))
+            assert subtree[0] is root
+            assert [elt.oid_tuple for elt in subtree] == sorted(
+                elt.oid_tuple for elt in subtree
+            )
+            in_mib_tree = {
+                elt.oid_tuple
+                for elt in mib_tree.values()
+                if root.is_prefix_of(elt.oid_tuple)
+            }
+            assert in_mib_tree <= {elt.oid_tuple for elt in subtree}
+
+        # GETNEXT order.
+        xups_ident = mib_tree["xupsIdent"]
+        assert (
+            mib_tree_holder.get_next_element(xups_ident.oid_tuple)
+            is mib_tree["xupsIdentManufacturer"]
+        )
+        assert (
+            mib_tree_holder.get_next_element(xups_ident.oid_tuple[:-1] + (0,))
+            is xups_ident
+        )
+        assert mib_tree_holder.get_next_element((9,)) is None
+
+    async def test_mib_tree_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir, patch.dict(
+            os.environ, {epm.MIB_CACHE_DIR_ENV_VAR: cache_dir}
+        ):
+            assert epm.get_mib_cache_dir() == pathlib.Path(cache_dir)
+
+            parsed_holder = epm.MibTreeHolder()
+            cache_files = list(pathlib.Path(cache_dir).glob("mib_tree_*.json"))
+            assert len(cache_files) == 1
+
+            # The second holder is loaded from the cache without parsing.
+            with patch.object(epm.MibTreeHolder, "_add_mib_elements") as add_mock:
+                cached_holder = epm.MibTreeHolder()
+            add_mock.assert_not_called()
+
+            assert cached_holder.mib_tree.keys() == parsed_holder.mib_tree.keys()
+            assert cached_holder.oid_index.keys() == parsed_holder.oid_index.keys()
+            for name, elt in parsed_holder.mib_tree.items():
+                assert cached_holder.mib_tree[name].oid == elt.oid
+                assert cached_holder.mib_tree[name].oid_tuple is elt.oid_tuple
+                assert cached_holder.mib_tree[name].index == elt.index
+            assert (
+                cached_holder.mib_tree["xups"].parent is cached_holder.mib_tree["eaton"]
+            )
+            assert len(cached_holder.pending_modules) == 0
+
+            # A corrupt cache file is ignored and overwritten.
+            cache_files[0].write_bytes(b"corrupt")
+            with patch.object(
+                epm.MibTreeHolder,
+                "_add_mib_elements",
+                autospec=True,
+                side_effect=epm.MibTreeHolder._add_mib_elements,
+            ) as add_mock:
+                reparsed_holder = epm.MibTreeHolder()
+            add_mock.assert_called_once()
+            assert reparsed_holder.mib_tree.keys() == parsed_holder.mib_tree.keys()
+
+            # A cache file that cannot be written leaves no temporary file.
+            cache_files[0].unlink()
+            with patch("json.dump", side_effect=RecursionError("Too deep")):
+                epm.MibTreeHolder()
+            assert list(pathlib.Path(cache_dir).iterdir()) == []
+
+            # Without the cache the MIB files always are parsed.
+            with patch.object(
+                epm.MibTreeHolder,
+                "_add_mib_elements",
+                autospec=True,
+                side_effect=epm.MibTreeHolder._add_mib_elements,
+            ) as add_mock:
+                epm.MibTreeHolder(use_cache=False)
+            add_mock.assert_called_once()
+
+    async def test_device_type_mib_tree(self) -> None:
+        mib_tree_holder = epm.MibTreeHolder(device_types=["pdu"], use_cache=False)
+        assert mib_tree_holder.loaded_mib_files == ["mib_synV4.mib"]
+        assert "sysDescr" in mib_tree_holder.mib_tree
+        assert "pdu" in mib_tree_holder.mib_tree
+        assert "xups" not in mib_tree_holder.mib_tree
+
+        # Loading another device type only parses its MIB files.
+        with patch.object(
+            epm.MibTreeHolder,
+            "_add_mib_elements",
+            autospec=True,
+            side_effect=epm.MibTreeHolder._add_mib_elements,
+        ) as add_mock:
+            mib_tree_holder.load_device_type("xups")
+            mib_tree_holder.load_device_type("pdu")
+        add_mock.assert_called_once()
+        assert [f.name for f in add_mock.call_args.args[1]] == [
+            "eaton-oids.mib",
+            "eaton-xups.mib",
+        ]
+        assert mib_tree_holder.mib_tree["xups"].parent.name == "eaton"
+        assert len(mib_tree_holder.pending_modules) == 0
+
+        with self.assertRaises(ValueError):
+            mib_tree_holder.load_device_type("unknown")
+
+        # A MIB file that fails to be parsed isn't marked as loaded.
+        with patch.object(
+            epm.MibTreeHolder, "_add_mib_elements", side_effect=RuntimeError("Failed")
+        ), self.assertRaises(RuntimeError):
+            mib_tree_holder.load_device_type("scheiderPm5xxx")
+        assert "scheiderPm5xxx" not in mib_tree_holder.mib_tree
+        mib_tree_holder.load_device_type("scheiderPm5xxx")
+        assert "scheiderPm5xxx" in mib_tree_holder.mib_tree
+
+    async def test_device_type_mib_tree_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir, patch.dict(
+            os.environ, {epm.MIB_CACHE_DIR_ENV_VAR: cache_dir}
+        ):
+            epm.MibTreeHolder(device_types=["pdu", "xups"])
+
+            # Loading another device type from the cache keeps the elements
+            # that already were loaded.
+            mib_tree_holder = epm.MibTreeHolder(device_types=["pdu"])
+            mib_tree = mib_tree_holder.mib_tree
+            sys_descr = mib_tree["sysDescr"]
+            outlet_status = mib_tree["outletStatus"]
+            with patch.object(epm.MibTreeHolder, "_add_mib_elements") as add_mock:
+                mib_tree_holder.load_device_type("xups")
+            add_mock.assert_not_called()
+            assert mib_tree_holder.mib_tree is mib_tree
+            assert "xups" in mib_tree
+            assert mib_tree["sysDescr"] is sys_descr
+            assert mib_tree["outletStatus"] is outlet_status
+            assert mib_tree_holder.get_element(outlet_status.oid_tuple) is outlet_status
+            assert mib_tree["xups"].parent is mib_tree["eaton"]
+
+    async def test_shared_mib_tree_holder(self) -> None:
+        pdu_holder = epm.get_shared_mib_tree_holder("pdu")
+        xups_holder = epm.get_shared_mib_tree_holder("xups")
+        assert xups_holder is pdu_holder
+        assert "pdu" in xups_holder.mib_tree
+        assert "xups" in xups_holder.mib_tree
+
+        all_holder = epm.get_shared_mib_tree_holder()
+        assert all_holder is pdu_holder
+        assert "scheiderPm5xxx" in all_holder.mib_tree
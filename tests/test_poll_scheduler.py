@@ -0,0 +1,102 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import unittest
+
+from lsst.ts import epm
+
+INTERVAL = 0.1
+
+
+class PollSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_fixed_rate(self) -> None:
+        poll_scheduler = epm.PollScheduler(interval=INTERVAL, log=logging.getLogger())
+        loop = asyncio.get_running_loop()
+
+        await poll_scheduler.wait_for_next_tick()
+        start_time = loop.time()
+        for _ in range(4):
+            # Polls that take part of the interval don't add to the period.
+            await asyncio.sleep(INTERVAL / 2)
+            await poll_scheduler.wait_for_next_tick()
+        elapsed_time = loop.time() - start_time
+
+        assert elapsed_time >= 4 * INTERVAL
+        assert elapsed_time < 4.5 * INTERVAL
+        assert poll_scheduler.num_ticks == 5
+        assert poll_scheduler.num_overruns == 0
+        assert poll_scheduler.num_skipped_ticks == 0
+
+    async def test_overrun(self) -> None:
+        poll_scheduler = epm.PollScheduler(interval=INTERVAL, log=logging.getLogger())
+        loop = asyncio.get_running_loop()
+
+        await poll_scheduler.wait_for_next_tick()
+        start_time = loop.time()
+
+        # A poll that takes 2.5 intervals misses the ticks at 1 and 2
+        # intervals. The late tick starts right away and the tick at 3
+        # intervals is the next one on schedule.
+        await asyncio.sleep(2.5 * INTERVAL)
+        with self.assertLogs(poll_scheduler.log, level=logging.DEBUG) as logs:
+            await poll_scheduler.wait_for_next_tick()
+        overrun = float(logs.records[0].getMessage().split()[3])
+        assert overrun >= 1.5 * INTERVAL
+        assert poll_scheduler.num_overruns == 1
+        assert poll_scheduler.num_skipped_ticks == 1
+        assert poll_scheduler.lateness >= 0.5 * INTERVAL
+        assert poll_scheduler.max_lateness == poll_scheduler.lateness
+
+        await poll_scheduler.wait_for_next_tick()
+        elapsed_time = loop.time() - start_time
+        assert elapsed_time >= 3 * INTERVAL
+        assert elapsed_time < 3.5 * INTERVAL
+        assert poll_scheduler.num_ticks == 3
+        assert poll_scheduler.num_overruns == 1
+        statistics = poll_scheduler.get_statistics()
+        assert statistics["count"] == 3
+        assert statistics["overruns"] == 1
+        assert statistics["skipped"] == 1
+        assert statistics["max_lateness"] == poll_scheduler.max_lateness
+
+        # Restarting the schedule keeps the statistics.
+        num_ticks = poll_scheduler.num_ticks
+        poll_scheduler.restart()
+        assert poll_scheduler.next_tick_time is None
+        assert poll_scheduler.num_ticks == num_ticks
+        assert poll_scheduler.get_statistics() == statistics
+
+        poll_scheduler.reset()
+        assert poll_scheduler.num_ticks == 0
+        assert poll_scheduler.mean_lateness == 0.0
+
+    async def test_zero_interval(self) -> None:
+        poll_scheduler = epm.PollScheduler(interval=0.0, log=logging.getLogger())
+
+        for _ in range(3):
+            await poll_scheduler.wait_for_next_tick()
+            await asyncio.sleep(0.01)
+        assert poll_scheduler.num_ticks == 3
+        assert poll_scheduler.num_overruns == 0
+        assert poll_scheduler.max_lateness == 0.0
+        assert poll_scheduler.deadline is None
@@ -0,0 +1,91 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import math
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from lsst.ts import epm
+
+
+class PollTimingsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_timing_histogram(self) -> None:
+        histogram = epm.TimingHistogram(buckets=[0.1, 0.2, 0.4])
+        assert math.isnan(histogram.mean)
+        assert math.isnan(histogram.percentile(50))
+
+        for duration in [0.05, 0.15, 0.15, 0.3, 1.0]:
+            histogram.add(duration)
+        assert histogram.bucket_counts == [1, 2, 1, 1]
+        assert histogram.count == 5
+        assert histogram.mean == 1.65 / 5
+        # The median is halfway in the second bucket.
+        assert histogram.percentile(50) == 0.1 + 0.1 * (2.5 - 1) / 2
+        assert histogram.percentile(0) == 0.05
+        assert histogram.percentile(100) == 1.0
+
+        histogram.reset()
+        assert histogram.count == 0
+        assert histogram.bucket_counts == [0, 0, 0, 0]
+
+    async def test_poll_timings(self) -> None:
+        poll_timings = epm.PollTimings(device_name='PDU "1"', buckets=[0.1, 0.2])
+        with poll_timings.time_stage("decode"):
+            pass
+        poll_timings.add("request", 0.15)
+        poll_timings.add("request", 0.5)
+
+        statistics = poll_timings.get_statistics()
+        assert list(statistics) == ["decode", "request"]
+        assert statistics["request"]["count"] == 2
+        assert statistics["request"]["max"] == 0.5
+        for key in ["mean", "p50", "p90", "p99"]:
+            assert key in statistics["request"]
+        assert "request: count=2" in poll_timings.format_summary()
+
+        text = epm.format_prometheus([poll_timings])
+        labels = 'device="PDU \\"1\\"",stage="request"'
+        assert "# TYPE ts_epm_poll_stage_seconds histogram" in text
+        assert f'ts_epm_poll_stage_seconds_bucket{{{labels},le="0.1"}} 0' in text
+        assert f'ts_epm_poll_stage_seconds_bucket{{{labels},le="0.2"}} 1' in text
+        assert f'ts_epm_poll_stage_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"ts_epm_poll_stage_seconds_sum{{{labels}}} 0.65" in text
+        assert f"ts_epm_poll_stage_seconds_count{{{labels}}} 2" in text
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = pathlib.Path(temp_dir) / "ts_epm.prom"
+            with self.assertLogs(level=logging.INFO):
+                epm.report_poll_timings(
+                    [poll_timings], logging.getLogger(), prometheus_file=str(path)
+                )
+            assert path.read_text() == text
+            assert path.stat().st_mode & 0o777 == epm.PROMETHEUS_FILE_MODE
+            assert [p.name for p in pathlib.Path(temp_dir).iterdir()] == [path.name]
+
+            # A file that cannot be replaced leaves no temporary file.
+            path.unlink()
+            with patch("os.replace", side_effect=OSError("Replace failed")):
+                with self.assertLogs(level=logging.WARNING):
+                    epm.write_prometheus_file(path, [poll_timings], logging.getLogger())
+            assert list(pathlib.Path(temp_dir).iterdir()) == []
@@ -0,0 +1,61 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+import unittest
+
+from lsst.ts import epm
+
+
+class SampleWindowTestCase(unittest.TestCase):
+    def test_statistics(self) -> None:
+        sample_window = epm.SampleWindow(
+            array_lengths={"current": None, "voltage": 2, "missing": None}, size=3
+        )
+        statistics = sample_window.get_statistics()
+        assert math.isnan(statistics["mean"]["current"])
+
+        for current, voltage in [
+            (1.0, [10.0, 20.0]),
+            (3.0, [math.nan, 22.0]),
+            (2.0, [14.0, 24.0]),
+        ]:
+            sample_window.add(
+                {"current": current, "voltage": voltage, "status": "unused"}
+            )
+        statistics = sample_window.get_statistics()
+        assert statistics["min"]["current"] == 1.0
+        assert statistics["max"]["current"] == 3.0
+        assert statistics["mean"]["current"] == 2.0
+        # NaN values and missing telemetry items are ignored.
+        assert statistics["mean"]["voltage"] == [12.0, 22.0]
+        assert math.isnan(statistics["max"]["missing"])
+
+        # The oldest sample is replaced.
+        sample_window.add({"current": 7.0, "voltage": [16.0, 26.0]})
+        statistics = sample_window.get_statistics()
+        assert statistics["min"]["current"] == 2.0
+        assert statistics["mean"]["current"] == 4.0
+        assert statistics["min"]["voltage"] == [14.0, 22.0]
+        assert sample_window.num_samples == 4
+
+        sample_window.reset()
+        assert math.isnan(sample_window.get_statistics()["min"]["current"])
@@ -0,0 +1,532 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import math
+import types
+import typing
+import unittest
+from unittest.mock import AsyncMock
+
+from lsst.ts import epm
+from lsst.ts.xml.component_info import ComponentInfo
+from pysnmp.proto import api
+from pysnmp.proto.rfc1905 import EndOfMibView
+
+DEVICE_TYPES = ["pdu", "scheiderPm5xxx", "xups"]
+
+
+class SnmpAgentSimulatorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_data_client(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        for device_type in DEVICE_TYPES:
+            for walk_mode, read_mode in [("getbulk", "get"), ("getnext", "walk")]:
+                with self.subTest(
+                    device_type=device_type, walk_mode=walk_mode, read_mode=read_mode
+                ):
+                    snmp_agent_simulator = epm.SnmpAgentSimulator(
+                        log=logging.getLogger(), device_type=device_type
+                    )
+                    await snmp_agent_simulator.start()
+                    tel_topic = AsyncMock()
+                    tel_topic.topic_info.fields = component_info.topics[
+                        f"tel_{device_type}"
+                    ].fields
+                    del tel_topic.metadata
+                    data_client = epm.SnmpDataClient(
+                        config=self.make_config(
+                            snmp_agent_simulator.address,
+                            device_type,
+                            walk_mode,
+                            read_mode,
+                        ),
+                        topics=types.SimpleNamespace(
+                            **{f"tel_{device_type}": tel_topic}
+                        ),
+                        log=logging.getLogger(),
+                        snmp_transport=epm.SnmpTransport(log=logging.getLogger()),
+                    )
+                    try:
+                        await data_client.setup_reading()
+                        assert data_client.system_description == epm.SIMULATED_SYS_DESCR
+                        await data_client.read_data()
+                        await data_client.read_data()
+                    finally:
+                        await data_client.disconnect()
+                        data_client.snmp_transport.close()
+                        snmp_agent_simulator.close()
+
+                    assert tel_topic.set_write.call_count == 2
+                    telemetry = tel_topic.set_write.call_args.kwargs
+                    assert telemetry["systemDescription"] == epm.SIMULATED_SYS_DESCR
+                    assert snmp_agent_simulator.num_requests > 0
+
+    async def test_requests(self) -> None:
+        snmp_agent_simulator = epm.SnmpAgentSimulator(
+            log=logging.getLogger(), device_type="xups", table_size=4
+        )
+        xups_oid = snmp_agent_simulator.snmp_server_simulator.mib_tree_holder.mib_tree[
+            "xups"
+        ].oid
+        snmp_transport = epm.SnmpTransport(
+            log=logging.getLogger(), timeout=0.1, retries=0
+        )
+        await snmp_agent_simulator.start()
+        await snmp_transport.connect()
+        try:
+            address = snmp_agent_simulator.address
+            instance_oids = snmp_agent_simulator.instance_oids
+            xups_root = tuple(int(i) for i in xups_oid.split("."))
+            xups_instance_oids = [
+                oid for oid in instance_oids if oid[: len(xups_root)] == xups_root
+            ]
+            assert len(xups_instance_oids) > 0
+
+            # An unknown OID is an error with SNMPv1 but not with SNMPv2c.
+            response = await snmp_transport.get_cmd(address, "public", 0, ["1.2.3.0"])
+            assert int(response[1]) == 2
+            response = await snmp_transport.get_cmd(address, "public", 1, ["1.2.3.0"])
+            assert int(response[1]) == 0
+
+            # The walks return all instance OIDs of the subtree in order.
+            walked_oids = [
+                var_bind[0].asTuple()
+                async for response in snmp_transport.walk(
+                    address, "public", 0, xups_oid
+                )
+                for var_bind in response[3]
+            ]
+            assert walked_oids == xups_instance_oids
+            bulk_walked_oids = [
+                var_bind[0].asTuple()
+                async for response in snmp_transport.bulk_walk(
+                    address, "public", xups_oid, 0, 7
+                )
+                for var_bind in response[3]
+            ]
+            assert bulk_walked_oids == walked_oids
+
+            # GETBULK interleaves the successors of the repeated OIDs and stops
+            # at the end of the MIB view.
+            response = await snmp_transport.bulk_cmd(
+                address, "public", 1, 3, [instance_oids[0], instance_oids[-2]]
+            )
+            var_binds = response[3]
+            assert [var_binds[0][0].asTuple(), var_binds[1][0].asTuple()] == [
+                instance_oids[1],
+                instance_oids[-1],
+            ]
+            assert len(var_binds) == 3
+            assert isinstance(var_binds[2][1], EndOfMibView)
+
+            # Requests for another community are ignored.
+            response = await snmp_transport.get_cmd(
+                address, "private", 0, [instance_oids[0]]
+            )
+            assert response[0] == epm.TIMEOUT_ERROR_INDICATION
+        finally:
+            snmp_transport.close()
+            snmp_agent_simulator.close()
+
+    async def test_packet_loss_and_latency(self) -> None:
+        snmp_transport = epm.SnmpTransport(
+            log=logging.getLogger(), timeout=0.1, retries=0
+        )
+        await snmp_transport.connect()
+
+        snmp_agent_simulator = epm.SnmpAgentSimulator(
+            log=logging.getLogger(), device_type="pdu", packet_loss=1.0
+        )
+        await snmp_agent_simulator.start()
+        try:
+            response = await snmp_transport.get_cmd(
+                snmp_agent_simulator.address,
+                "public",
+                1,
+                [snmp_agent_simulator.instance_oids[0]],
+            )
+            assert response[0] == epm.TIMEOUT_ERROR_INDICATION
+            assert snmp_agent_simulator.num_dropped_requests == 1
+        finally:
+            snmp_agent_simulator.close()
+
+        # A response that arrives after the timeout is lost as well.
+        snmp_agent_simulator = epm.SnmpAgentSimulator(
+            log=logging.getLogger(), device_type="pdu", latency=0.3, jitter=0.1
+        )
+        await snmp_agent_simulator.start()
+        try:
+            response = await snmp_transport.get_cmd(
+                snmp_agent_simulator.address,
+                "public",
+                1,
+                [snmp_agent_simulator.instance_oids[0]],
+            )
+            assert response[0] == epm.TIMEOUT_ERROR_INDICATION
+            assert snmp_agent_simulator.num_dropped_requests == 0
+        finally:
+            snmp_transport.close()
+            snmp_agent_simulator.close()
+
+    async def test_circuit_breaker(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        snmp_agent_simulator = epm.SnmpAgentSimulator(
+            log=logging.getLogger(), device_type="pdu"
+        )
+        await snmp_agent_simulator.start()
+        tel_topic = AsyncMock()
+        tel_topic.topic_info.fields = component_info.topics["tel_pdu"].fields
+        del tel_topic.metadata
+        min_backoff = 0.2
+        data_client = epm.SnmpDataClient(
+            config=self.make_config(
+                snmp_agent_simulator.address,
+                "pdu",
+                "getbulk",
+                "get",
+                max_read_timeouts=2,
+                min_backoff=min_backoff,
+                backoff_jitter=0.0,
+            ),
+            topics=types.SimpleNamespace(tel_pdu=tel_topic),
+            log=logging.getLogger(),
+            snmp_transport=epm.SnmpTransport(
+                log=logging.getLogger(), timeout=0.05, retries=0
+            ),
+        )
+        try:
+            await data_client.setup_reading()
+            await data_client.poll()
+            assert tel_topic.set_write.call_count == 1
+
+            # The device stops responding. After max_read_timeouts polls it is
+            # held off.
+            snmp_agent_simulator.packet_loss = 1.0
+            for _ in range(2):
+                await data_client.poll()
+            assert data_client.circuit_breaker.state == epm.CircuitBreakerState.OPEN
+            assert tel_topic.set_write.call_count == 3
+            num_requests = snmp_agent_simulator.num_requests
+            await data_client.poll()
+            assert snmp_agent_simulator.num_requests == num_requests
+            assert tel_topic.set_write.call_count == 3
+
+            # A failed probe doubles the backoff time.
+            await asyncio.sleep(min_backoff)
+            await data_client.poll()
+            assert snmp_agent_simulator.num_requests == num_requests + 1
+            assert data_client.circuit_breaker.state == epm.CircuitBreakerState.OPEN
+            assert data_client.circuit_breaker.backoff == 2 * min_backoff
+            assert tel_topic.set_write.call_count == 3
+
+            # Once the device responds to the probe, it is polled again.
+            snmp_agent_simulator.packet_loss = 0.0
+            await asyncio.sleep(2 * min_backoff)
+            await data_client.poll()
+            assert data_client.circuit_breaker.state == epm.CircuitBreakerState.CLOSED
+            assert tel_topic.set_write.call_count == 4
+            assert not math.isnan(tel_topic.set_write.call_args.kwargs["acMaxDraw"])
+        finally:
+            await data_client.disconnect()
+            data_client.snmp_transport.close()
+            snmp_agent_simulator.close()
+
+    async def test_resume_walk(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        snmp_agent_simulator = LossySnmpAgentSimulator(
+            log=logging.getLogger(), device_type="xups"
+        )
+        await snmp_agent_simulator.start()
+        tel_topic = AsyncMock()
+        tel_topic.topic_info.fields = component_info.topics["tel_xups"].fields
+        del tel_topic.metadata
+        data_client = epm.SnmpDataClient(
+            config=self.make_config(
+                snmp_agent_simulator.address, "xups", "getnext", "walk"
+            ),
+            topics=types.SimpleNamespace(tel_xups=tel_topic),
+            log=logging.getLogger(),
+            snmp_transport=epm.SnmpTransport(
+                log=logging.getLogger(), timeout=0.05, retries=0
+            ),
+        )
+        try:
+            await data_client.setup_reading()
+            await data_client.poll()
+            assert data_client.walk_complete
+            num_var_binds = len(data_client.snmp_result)
+            telemetry = tel_topic.set_write.call_args.kwargs
+
+            # A lost request in the middle of the walk only costs a timeout.
+            snmp_agent_simulator.dropped_requests = {
+                snmp_agent_simulator.num_requests + 10
+            }
+            await data_client.poll()
+            assert data_client.walk_complete
+            assert data_client.num_walk_resumes == 1
+            assert len(data_client.snmp_result) == num_var_binds
+            assert not data_client.circuit_breaker.num_failures
+            assert tel_topic.set_write.call_args.kwargs.keys() == telemetry.keys()
+
+            # If the resumed walk doesn't get any further, the part of the
+            # subtree that was received is kept.
+            snmp_agent_simulator.dropped_requests = {
+                snmp_agent_simulator.num_requests + 10,
+                snmp_agent_simulator.num_requests + 11,
+            }
+            await data_client.poll()
+            assert not data_client.walk_complete
+            assert data_client.num_walk_resumes == 2
+            assert 0 < len(data_client.snmp_result) < num_var_binds
+
+            # A walk isn't resumed after the deadline of the poll.
+            snmp_agent_simulator.dropped_requests = {
+                snmp_agent_simulator.num_requests + 10
+            }
+            await data_client.poll(deadline=asyncio.get_running_loop().time())
+            assert not data_client.walk_complete
+            assert data_client.num_walk_resumes == 2
+        finally:
+            await data_client.disconnect()
+            data_client.snmp_transport.close()
+            snmp_agent_simulator.close()
+
+    async def test_field_groups(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        snmp_agent_simulator = epm.SnmpAgentSimulator(
+            log=logging.getLogger(), device_type="xups"
+        )
+        await snmp_agent_simulator.start()
+        tel_topic = AsyncMock()
+        tel_topic.topic_info.fields = component_info.topics["tel_xups"].fields
+        del tel_topic.metadata
+        slow_items = ["batteryCapacity", "inputVoltage"]
+        static_items = ["outputLoad"]
+        data_client = epm.SnmpDataClient(
+            config=self.make_config(
+                snmp_agent_simulator.address,
+                "xups",
+                "getbulk",
+                "get",
+                field_groups={
+                    "slow": {"interval": 0.3, "items": slow_items},
+                    "static": {"interval": 0.0, "items": static_items},
+                },
+            ),
+            topics=types.SimpleNamespace(tel_xups=tel_topic),
+            log=logging.getLogger(),
+            snmp_transport=epm.SnmpTransport(log=logging.getLogger()),
+        )
+        try:
+            await data_client.setup_reading()
+            await data_client.poll()
+            assert data_client.get_oids is not None
+            num_get_oids = len(data_client.get_oids)
+            first_telemetry = tel_topic.set_write.call_args.kwargs
+
+            # Only the telemetry items that are not in a group are read. The
+            # others get their last value.
+            await data_client.poll()
+            assert 0 < len(data_client.snmp_result) < num_get_oids
+            telemetry = tel_topic.set_write.call_args.kwargs
+            assert telemetry.keys() == first_telemetry.keys()
+            for name in slow_items + static_items:
+                assert telemetry[name] == first_telemetry[name]
+
+            # Once the slow group is due, it is read again.
+            await asyncio.sleep(0.3)
+            await data_client.poll()
+            assert data_client.polled_groups == {"slow"}
+            assert len(data_client.snmp_result) == num_get_oids - len(static_items)
+            telemetry = tel_topic.set_write.call_args.kwargs
+            for name in static_items:
+                assert telemetry[name] == first_telemetry[name]
+        finally:
+            await data_client.disconnect()
+            data_client.snmp_transport.close()
+            snmp_agent_simulator.close()
+
+    async def test_getnext_fallback(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        snmp_agent_simulator = SnmpV1AgentSimulator(
+            log=logging.getLogger(), device_type="pdu"
+        )
+        await snmp_agent_simulator.start()
+        tel_topic = AsyncMock()
+        tel_topic.topic_info.fields = component_info.topics["tel_pdu"].fields
+        del tel_topic.metadata
+        data_client = epm.SnmpDataClient(
+            config=self.make_config(
+                snmp_agent_simulator.address, "pdu", "getbulk", "walk"
+            ),
+            topics=types.SimpleNamespace(tel_pdu=tel_topic),
+            log=logging.getLogger(),
+            snmp_transport=epm.SnmpTransport(
+                log=logging.getLogger(), timeout=0.05, retries=0
+            ),
+        )
+        try:
+            # An agent that ignores SNMPv2c requests is walked with GETNEXT.
+            await data_client.setup_reading()
+            assert data_client.system_description == epm.SIMULATED_SYS_DESCR
+            assert not data_client.use_getbulk
+            await data_client.poll()
+            assert tel_topic.set_write.call_count == 1
+            assert not math.isnan(tel_topic.set_write.call_args.kwargs["acMaxDraw"])
+
+            # An agent that stops responding only costs a single timeout per
+            # poll, alternating between GETBULK and GETNEXT.
+            data_client.use_getbulk = True
+            snmp_agent_simulator.packet_loss = 1.0
+            for use_getbulk in [True, False]:
+                num_requests = snmp_agent_simulator.num_requests
+                await data_client.poll()
+                assert snmp_agent_simulator.num_requests == num_requests + 1
+                assert data_client.retry_walk_with_getnext == use_getbulk
+            assert data_client.use_getbulk
+        finally:
+            await data_client.disconnect()
+            data_client.snmp_transport.close()
+            snmp_agent_simulator.close()
+
+    async def test_getbulk_recovery(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        snmp_agent_simulator = epm.SnmpAgentSimulator(
+            log=logging.getLogger(), device_type="pdu"
+        )
+        await snmp_agent_simulator.start()
+        tel_topic = AsyncMock()
+        tel_topic.topic_info.fields = component_info.topics["tel_pdu"].fields
+        del tel_topic.metadata
+        data_client = epm.SnmpDataClient(
+            config=self.make_config(
+                snmp_agent_simulator.address, "pdu", "getbulk", "walk"
+            ),
+            topics=types.SimpleNamespace(tel_pdu=tel_topic),
+            log=logging.getLogger(),
+            snmp_transport=epm.SnmpTransport(
+                log=logging.getLogger(), timeout=0.05, retries=0
+            ),
+        )
+        try:
+            await data_client.setup_reading()
+            assert data_client.use_getbulk
+
+            # An SNMPv2c agent that is briefly unreachable keeps being walked
+            # with GETBULK once it responds again.
+            snmp_agent_simulator.packet_loss = 1.0
+            await data_client.poll()
+            assert data_client.retry_walk_with_getnext
+            snmp_agent_simulator.packet_loss = 0.0
+            await data_client.poll()
+            assert data_client.use_getbulk
+            assert data_client.walk_complete
+            assert not data_client.retry_walk_with_getnext
+            await data_client.poll()
+            assert data_client.use_getbulk
+        finally:
+            await data_client.disconnect()
+            data_client.snmp_transport.close()
+            snmp_agent_simulator.close()
+
+    def make_config(
+        self,
+        address: tuple[str, int],
+        device_type: str,
+        walk_mode: str,
+        read_mode: str,
+        **kwargs: typing.Any,
+    ) -> types.SimpleNamespace:
+        """Make the configuration of a data client of the agent.
+
+        Parameters
+        ----------
+        address : `tuple`[`str`, `int`]
+            The host and port of the agent.
+        device_type : `str`
+            The type of SNMP device.
+        walk_mode : `str`
+            The walk mode.
+        read_mode : `str`
+            The read mode.
+        **kwargs : `typing.Any`
+            Configuration items that override the defaults.
+
+        Returns
+        -------
+        types.SimpleNamespace
+            The configuration.
+        """
+        return epm.make_data_client_config(
+            epm.SnmpDataClient,
+            host=address[0],
+            port=address[1],
+            device_name="Test",
+            device_type=device_type,
+            poll_interval=0.1,
+            walk_mode=walk_mode,
+            read_mode=read_mode,
+            **kwargs,
+        )
+
+
+class LossySnmpAgentSimulator(epm.SnmpAgentSimulator):
+    """An SNMP agent simulator that drops the requests with the provided
+    numbers.
+
+    Parameters
+    ----------
+    *args : `typing.Any`
+        The arguments of `SnmpAgentSimulator`.
+    **kwargs : `typing.Any`
+        The keyword arguments of `SnmpAgentSimulator`.
+    """
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.dropped_requests: set[int] = set()
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        if self.num_requests + 1 in self.dropped_requests:
+            self.num_requests += 1
+            self.num_dropped_requests += 1
+            return
+        super().datagram_received(data, addr)
+
+
+class SnmpV1AgentSimulator(epm.SnmpAgentSimulator):
+    """An SNMP agent simulator that ignores SNMPv2c requests, like an agent
+    that only supports SNMPv1.
+
+    Parameters
+    ----------
+    *args : `typing.Any`
+        The arguments of `SnmpAgentSimulator`.
+    **kwargs : `typing.Any`
+        The keyword arguments of `SnmpAgentSimulator`.
+    """
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        if int(api.decodeMessageVersion(data)) != api.protoVersion1:
+            self.num_requests += 1
+            return
+        super().datagram_received(data, addr)
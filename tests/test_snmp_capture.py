@@ -0,0 +1,260 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import math
+import pathlib
+import tempfile
+import time
+import types
+import typing
+import unittest
+from unittest.mock import AsyncMock
+
+from lsst.ts import epm
+from lsst.ts.xml.component_info import ComponentInfo
+from pysnmp.proto.rfc1902 import Gauge32, Integer, ObjectName, OctetString
+
+DEVICE_TYPES = ["pdu", "scheiderPm5xxx", "xups"]
+TEST_SNMP_DIR = pathlib.Path(__file__).parent / "data" / "snmp"
+
+
+class SnmpCaptureTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.capture_path = pathlib.Path(self.temp_dir.name) / "capture.bin"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_read_text_capture(self) -> None:
+        records = epm.read_snmp_capture(TEST_SNMP_DIR / "xups_output.txt")
+        assert len(records) == 1
+        assert records[0].timestamp == 0
+        oid, value = records[0].var_binds[0]
+        assert oid == ObjectName("1.3.6.1.2.1.1.1.0")
+        assert value.prettyPrint().startswith("Linux PowerXpert")
+
+    def test_write_and_read(self) -> None:
+        var_binds = [
+            (ObjectName("1.3.6.1.2.1.1.1.0"), OctetString("Test device")),
+            (ObjectName("1.3.6.1.4.1.534.1.2.1.0"), Integer(-5)),
+            (ObjectName("1.3.6.1.4.1.534.1.2.2.0"), Gauge32(7)),
+        ]
+        snmp_capture_writer = epm.SnmpCaptureWriter(self.capture_path)
+        snmp_capture_writer.write(var_binds, timestamp=10.0)
+        snmp_capture_writer.close()
+        # Appending continues the capture.
+        snmp_capture_writer = epm.SnmpCaptureWriter(self.capture_path)
+        snmp_capture_writer.write([((1, 3, 6, 1, 4, 1, 1, 0), Integer(1))])
+        snmp_capture_writer.close()
+
+        records = epm.read_snmp_capture(self.capture_path)
+        assert len(records) == 2
+        assert records[0].timestamp == 10.0
+        assert records[0].var_binds == var_binds
+        assert abs(records[1].timestamp - time.time()) < 10
+        assert records[1].var_binds == [(ObjectName("1.3.6.1.4.1.1.0"), Integer(1))]
+
+        # A truncated capture file is invalid.
+        data = self.capture_path.read_bytes()
+        self.capture_path.write_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            epm.read_snmp_capture(self.capture_path)
+
+    async def test_replayer(self) -> None:
+        snmp_capture_writer = epm.SnmpCaptureWriter(self.capture_path)
+        for timestamp in (100.0, 100.2, 100.4):
+            snmp_capture_writer.write(
+                [((1, 3, 6, 1, 4, 1, 1, 0), Integer(1))], timestamp=timestamp
+            )
+        snmp_capture_writer.close()
+
+        for speed, expected_duration in ((1.0, 0.4), (2.0, 0.2), (0.0, 0.0)):
+            with self.subTest(speed=speed):
+                snmp_capture_replayer = epm.SnmpCaptureReplayer(
+                    self.capture_path, speed=speed
+                )
+                start_time = time.monotonic()
+                timestamps = [
+                    (await snmp_capture_replayer.next_record()).timestamp
+                    for _ in range(4)
+                ]
+                duration = time.monotonic() - start_time
+                # The capture is replayed over and over again.
+                assert timestamps == [100.0, 100.2, 100.4, 100.0]
+                assert expected_duration <= duration < expected_duration + 0.15
+
+    async def test_capture_and_replay(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        for device_type in DEVICE_TYPES:
+            with self.subTest(device_type=device_type):
+                capture_path = pathlib.Path(self.temp_dir.name) / f"{device_type}.bin"
+
+                # Capture the simulated polls.
+                tel_topic = self.make_topic(component_info, device_type)
+                data_client = epm.SnmpDataClient(
+                    config=self.make_config(
+                        device_type, capture_file=str(capture_path)
+                    ),
+                    topics=types.SimpleNamespace(**{f"tel_{device_type}": tel_topic}),
+                    log=logging.getLogger(),
+                    simulation_mode=1,
+                )
+                await data_client.setup_reading()
+                for _ in range(2):
+                    await data_client.read_data()
+                await data_client.disconnect()
+                captured_telemetry = [
+                    call.kwargs for call in tel_topic.set_write.call_args_list
+                ]
+                # The setup walk is captured as well.
+                assert len(epm.read_snmp_capture(capture_path)) == 3
+
+                # Replay them as fast as possible, regardless of the poll
+                # interval.
+                tel_topic = self.make_topic(component_info, device_type)
+                data_client = epm.SnmpDataClient(
+                    config=self.make_config(
+                        device_type,
+                        replay_file=str(capture_path),
+                        replay_speed=0.0,
+                        poll_interval=10.0,
+                    ),
+                    topics=types.SimpleNamespace(**{f"tel_{device_type}": tel_topic}),
+                    log=logging.getLogger(),
+                )
+                await data_client.setup_reading()
+                start_time = time.monotonic()
+                for _ in range(2):
+                    await data_client.read_data()
+                assert time.monotonic() - start_time < 1.0
+                await data_client.disconnect()
+                replayed_telemetry = [
+                    call.kwargs for call in tel_topic.set_write.call_args_list
+                ]
+                assert replayed_telemetry == captured_telemetry
+
+    async def test_replay_text_capture(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        for device_type in DEVICE_TYPES:
+            with self.subTest(device_type=device_type):
+                replay_file = TEST_SNMP_DIR / f"{device_type}_output.txt"
+                tel_topic = self.make_topic(component_info, device_type)
+                data_client = epm.SnmpDataClient(
+                    config=self.make_config(device_type, replay_file=str(replay_file)),
+                    topics=types.SimpleNamespace(**{f"tel_{device_type}": tel_topic}),
+                    log=logging.getLogger(),
+                )
+                await data_client.setup_reading()
+                await data_client.read_data()
+                await data_client.disconnect()
+
+                telemetry = tel_topic.set_write.call_args.kwargs
+                sys_descr = epm.read_snmp_capture(replay_file)[0].var_binds[0][1]
+                assert telemetry["systemDescription"] == sys_descr.prettyPrint()
+                assert any(
+                    not math.isnan(value)
+                    for value in telemetry.values()
+                    if isinstance(value, float)
+                )
+
+    async def test_replay_pacing(self) -> None:
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        tel_topic = self.make_topic(component_info, "xups")
+        data_client = epm.SnmpDataClient(
+            config=self.make_config(
+                "xups",
+                replay_file=str(TEST_SNMP_DIR / "xups_output.txt"),
+                poll_interval=0.1,
+            ),
+            topics=types.SimpleNamespace(tel_xups=tel_topic),
+            log=logging.getLogger(),
+        )
+        await data_client.setup_reading()
+        num_ticks = 0
+
+        async def tick() -> None:
+            nonlocal num_ticks
+            while True:
+                await asyncio.sleep(0.01)
+                num_ticks += 1
+
+        async def read_loop() -> None:
+            while True:
+                await data_client.read_data()
+
+        # A capture with a single poll is replayed every poll interval and
+        # lets other tasks run.
+        tasks = [asyncio.create_task(tick()), asyncio.create_task(read_loop())]
+        await asyncio.sleep(0.5)
+        for task in tasks:
+            task.cancel()
+        await data_client.disconnect()
+        assert num_ticks > 10
+        assert 4 <= tel_topic.set_write.call_count <= 6
+
+    def make_topic(self, component_info: ComponentInfo, device_type: str) -> AsyncMock:
+        """Make a telemetry topic.
+
+        Parameters
+        ----------
+        component_info : `ComponentInfo`
+            The component info derived from the EPM XML files.
+        device_type : `str`
+            The type of SNMP device.
+
+        Returns
+        -------
+        AsyncMock
+            The telemetry topic.
+        """
+        tel_topic = AsyncMock()
+        tel_topic.topic_info.fields = component_info.topics[f"tel_{device_type}"].fields
+        del tel_topic.metadata
+        return tel_topic
+
+    def make_config(
+        self, device_type: str, **kwargs: typing.Any
+    ) -> types.SimpleNamespace:
+        """Make the configuration of a data client.
+
+        Parameters
+        ----------
+        device_type : `str`
+            The type of SNMP device.
+        **kwargs : `typing.Any`
+            Configuration items that override the defaults.
+
+        Returns
+        -------
+        types.SimpleNamespace
+            The configuration.
+        """
+        config = dict(
+            host="localhost",
+            device_name="Test",
+            device_type=device_type,
+            poll_interval=0.0,
+        )
+        config.update(kwargs)
+        return epm.make_data_client_config(epm.SnmpDataClient, **config)
@@ -20,17 +20,36 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import math
 import types
 import typing
 import unittest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 from lsst.ts import epm
 from lsst.ts.xml.component_info import ComponentInfo
+from pysnmp.proto.rfc1902 import Integer, ObjectName, OctetString
 
 
 class SnmpDataClientTestCase(unittest.IsolatedAsyncioTestCase):
     async def test_snmp_data_client(self) -> None:
+        for snmp_transport in ["asyncio", "blocking"]:
+            for walk_mode in ["getnext", "getbulk"]:
+                for read_mode in ["walk", "get"]:
+                    with self.subTest(
+                        snmp_transport=snmp_transport,
+                        walk_mode=walk_mode,
+                        read_mode=read_mode,
+                    ):
+                        await self.check_snmp_data_client(
+                            snmp_transport=snmp_transport,
+                            walk_mode=walk_mode,
+                            read_mode=read_mode,
+                        )
+
+    async def check_snmp_data_client(
+        self, snmp_transport: str, walk_mode: str, read_mode: str
+    ) -> None:
         log = logging.getLogger()
         for device_type in ["pdu", "scheiderPm5xxx", "xups"]:
             component_info = ComponentInfo(name="EPM", topic_subname="")
@@ -39,15 +58,18 @@ class SnmpDataClientTestCase(unittest.IsolatedAsyncioTestCase):
             tel_topic.topic_info.fields = component_info.topics[
                 f"tel_{device_type}"
             ].fields
+            # Make sure that the fields are read from topic_info.
+            del tel_topic.metadata
             topics = types.SimpleNamespace(**{f"tel_{device_type}": tel_topic})
-            config = types.SimpleNamespace(
+            config = epm.make_data_client_config(
+                epm.SnmpDataClient,
                 host="localhost",
-                port=161,
-                max_read_timeouts=5,
                 device_name="TestDevice",
                 device_type=device_type,
-                snmp_community="public",
                 poll_interval=0.1,
+                snmp_transport=snmp_transport,
+                walk_mode=walk_mode,
+                read_mode=read_mode,
             )
             snmp_data_client = epm.SnmpDataClient(
                 config=config, topics=topics, log=log, simulation_mode=1
@@ -59,6 +81,180 @@ class SnmpDataClientTestCase(unittest.IsolatedAsyncioTestCase):
             tel_topic = getattr(topics, f"tel_{config.device_type}")
             tel_topic.set_write.assert_called_once()
 
+            # The second poll only gets the OIDs of the telemetry items.
+            await snmp_data_client.read_data()
+            assert tel_topic.set_write.call_count == 2
+            if read_mode == "get":
+                assert snmp_data_client.get_oids is not None
+                assert len(snmp_data_client.get_oids) > 0
+                assert len(snmp_data_client.snmp_result) == len(
+                    snmp_data_client.get_oids
+                )
+            else:
+                assert snmp_data_client.get_oids is None
+            timing_statistics = snmp_data_client.get_timing_statistics()
+            for stage in ["request", "decode", "publish", "poll"]:
+                assert timing_statistics[stage]["count"] == 2
+            assert timing_statistics["schedule"]["count"] == 2
+            await snmp_data_client.disconnect()
+            # The schedule restarts after a reconnect, but its statistics are
+            # kept.
+            assert snmp_data_client.poll_scheduler.next_tick_time is None
+            assert snmp_data_client.get_timing_statistics()["schedule"]["count"] == 2
+
+    async def test_column_rows_order(self) -> None:
+        snmp_data_client = await self.make_simulated_data_client(device_type="pdu")
+        plan_item = next(
+            plan_item
+            for plan_item in snmp_data_client.telemetry_plan
+            if plan_item.is_array
+        )
+        assert plan_item.array_length is not None
+
+        # Return the rows in reversed order and with a sibling column that
+        # shares the prefix of the column OID.
+        rows = list(range(plan_item.array_length))
+        column_oid = ".".join(str(i) for i in plan_item.oid)
+        var_binds = [
+            (ObjectName(f"{column_oid}{i}.{row}"), Integer(99))
+            for i in range(10, 12)
+            for row in rows
+        ] + [(ObjectName(f"{column_oid}.{row}"), Integer(row)) for row in rows[::-1]]
+        snmp_data_client.clear_snmp_result()
+        snmp_data_client.process_snmp_response(None, 0, 0, var_binds)
+
+        telemetry_dict = snmp_data_client.execute_telemetry_plan()
+        assert telemetry_dict[plan_item.name] == rows
+        await snmp_data_client.disconnect()
+
+    async def test_decode_values(self) -> None:
+        snmp_data_client = await self.make_simulated_data_client(device_type="pdu")
+
+        assert snmp_data_client._decode_int(Integer(12)) == 12
+        assert snmp_data_client._decode_int(OctetString("12")) == 12
+        oid = (1, 3, 6, 1, 4, 1, 0)
+        assert snmp_data_client._decode_float(oid, Integer(12)) == 12.0
+        assert snmp_data_client._decode_float(oid, OctetString("12.5")) == 12.5
+        assert snmp_data_client._decode_float(oid, OctetString("12.5 V")) == 12.5
+        # A float as binary string and as hexadecimal text.
+        assert snmp_data_client._decode_float(oid, OctetString(b"1.25\x00")) == 1.25
+        assert snmp_data_client._decode_float(oid, OctetString("0x312e323500")) == 1.25
+        with self.assertRaises(ValueError):
+            snmp_data_client._decode_float(oid, OctetString("no float"))
+        assert snmp_data_client._decode_string(OctetString("text")) == "text"
+        assert snmp_data_client._decode_string(Integer(12)) == "12"
+        await snmp_data_client.disconnect()
+
+    async def test_float_decoder_cache(self) -> None:
+        snmp_data_client = await self.make_simulated_data_client(device_type="pdu")
+        oid = (1, 3, 6, 1, 4, 1, 0)
+
+        # The strategy that worked is remembered for the OID.
+        assert snmp_data_client._decode_float(oid, OctetString("0x312e3500")) == 1.5
+        assert (
+            snmp_data_client.float_decoders[oid]
+            == snmp_data_client._decode_float_from_hex
+        )
+        with patch.object(
+            snmp_data_client,
+            "_decode_float_from_integer",
+            wraps=snmp_data_client._decode_float_from_integer,
+        ) as integer_mock:
+            snmp_data_client.float_decoder_strategies = (
+                integer_mock,
+            ) + snmp_data_client.float_decoder_strategies[1:]
+            assert snmp_data_client._decode_float(oid, OctetString("0x322e3500")) == 2.5
+            integer_mock.assert_not_called()
+
+            # If the remembered strategy fails, the strategies are tried again.
+            assert snmp_data_client._decode_float(oid, Integer(3)) == 3.0
+            integer_mock.assert_called_once()
+        assert snmp_data_client.float_decoders[oid] == integer_mock
+
+        # The float items in the plan use the cache.
+        telemetry_dict = snmp_data_client.execute_telemetry_plan()
+        snmp_data_client.float_decoders.clear()
+        await snmp_data_client.read_data()
+        assert len(snmp_data_client.float_decoders) > 0
+        assert telemetry_dict.keys() == snmp_data_client.execute_telemetry_plan().keys()
+        await snmp_data_client.disconnect()
+
+    async def test_sample_window(self) -> None:
+        snmp_data_client = await self.make_simulated_data_client(
+            device_type="scheiderPm5xxx",
+            window_size=3,
+            window_statistics={"loadCurrentA": "max"},
+        )
+        assert snmp_data_client.sample_window is not None
+        assert "serialNumber" not in snmp_data_client.sample_window.columns
+        tel_topic = snmp_data_client.telemetry_topic
+        assert tel_topic is not None
+
+        samples: list[dict[str, typing.Any]] = []
+        execute_telemetry_plan = snmp_data_client.execute_telemetry_plan
+
+        def record_sample() -> dict[str, typing.Any]:
+            samples.append(execute_telemetry_plan())
+            return samples[-1]
+
+        with patch.object(
+            snmp_data_client, "execute_telemetry_plan", side_effect=record_sample
+        ):
+            for _ in range(2):
+                await snmp_data_client.poll()
+            tel_topic.set_write.assert_not_called()
+            await snmp_data_client.poll()
+        tel_topic.set_write.assert_called_once()
+
+        # The float telemetry items get the statistic over the window and the
+        # others their last value.
+        telemetry = tel_topic.set_write.call_args.kwargs
+        assert telemetry["loadCurrentA"] == max(
+            sample["loadCurrentA"] for sample in samples
+        )
+        assert math.isclose(
+            telemetry["activePowerA"],
+            sum(sample["activePowerA"] for sample in samples) / 3,
+        )
+        assert telemetry["serialNumber"] == samples[-1]["serialNumber"]
+        await snmp_data_client.disconnect()
+
+    async def make_simulated_data_client(
+        self, device_type: str, **kwargs: typing.Any
+    ) -> epm.SnmpDataClient:
+        """Make a data client in simulation mode and set up reading.
+
+        Parameters
+        ----------
+        device_type : `str`
+            The type of SNMP device.
+        **kwargs : `typing.Any`
+            Configuration items that override the defaults.
+
+        Returns
+        -------
+        epm.SnmpDataClient
+            The data client.
+        """
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        tel_topic = AsyncMock()
+        tel_topic.topic_info.fields = component_info.topics[f"tel_{device_type}"].fields
+        del tel_topic.metadata
+        topics = types.SimpleNamespace(**{f"tel_{device_type}": tel_topic})
+        config = epm.make_data_client_config(
+            epm.SnmpDataClient,
+            host="localhost",
+            device_name="TestDevice",
+            device_type=device_type,
+            poll_interval=0.1,
+        )
+        vars(config).update(kwargs)
+        snmp_data_client = epm.SnmpDataClient(
+            config=config, topics=topics, log=logging.getLogger(), simulation_mode=1
+        )
+        await snmp_data_client.setup_reading()
+        return snmp_data_client
+
     async def mock_data_type(
         self, component_info: ComponentInfo, device_type: str
     ) -> types.SimpleNamespace:
@@ -0,0 +1,121 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import types
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from lsst.ts import epm
+from lsst.ts.xml.component_info import ComponentInfo
+
+
+class SnmpEnginePoolTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_borrow_transport(self) -> None:
+        snmp_engine_pool = epm.SnmpEnginePool()
+
+        snmp_transport = await snmp_engine_pool.borrow_transport()
+        assert snmp_transport is snmp_engine_pool.snmp_transport
+        assert await snmp_engine_pool.borrow_transport() is snmp_transport
+        assert snmp_transport.connected
+
+        # The transport only is closed when it isn't borrowed anymore.
+        snmp_engine_pool.release_transport()
+        assert snmp_transport.connected
+        snmp_engine_pool.release_transport()
+        assert not snmp_transport.connected
+        with self.assertRaises(RuntimeError):
+            snmp_engine_pool.release_transport()
+
+        # A transport that fails to connect isn't borrowed.
+        with patch.object(
+            snmp_transport, "connect", side_effect=OSError("Connect failed")
+        ), self.assertRaises(OSError):
+            await snmp_engine_pool.borrow_transport()
+        assert snmp_engine_pool.num_transport_borrowers == 0
+        assert not snmp_transport.connected
+
+    async def test_borrow_engine(self) -> None:
+        snmp_engine_pool = epm.SnmpEnginePool()
+
+        # Each borrower gets its own engine and request thread.
+        snmp_engine, executor = snmp_engine_pool.borrow_engine()
+        other_snmp_engine, other_executor = snmp_engine_pool.borrow_engine()
+        assert other_snmp_engine is not snmp_engine
+        assert other_executor is not executor
+        assert snmp_engine_pool.num_engine_borrowers == 2
+
+        snmp_engine_pool.release_engine(snmp_engine)
+        assert snmp_engine_pool.num_engine_borrowers == 1
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+        other_executor.submit(print).result()
+        with self.assertRaises(RuntimeError):
+            snmp_engine_pool.release_engine(snmp_engine)
+        snmp_engine_pool.release_engine(other_snmp_engine)
+        assert snmp_engine_pool.num_engine_borrowers == 0
+
+        assert snmp_engine_pool.get_transport_target(
+            "localhost", 161
+        ) is snmp_engine_pool.get_transport_target("localhost", 161)
+        assert snmp_engine_pool.get_community_data(
+            "public", 1
+        ) is snmp_engine_pool.get_community_data("public", 1)
+
+    async def test_shared_snmp_engine_pool(self) -> None:
+        snmp_engine_pool = epm.get_shared_snmp_engine_pool()
+        assert epm.get_shared_snmp_engine_pool() is snmp_engine_pool
+
+        # Data clients borrow their own engine from the pool while reading.
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        data_clients = []
+        for device_type in ["pdu", "xups"]:
+            tel_topic = AsyncMock()
+            tel_topic.topic_info.fields = component_info.topics[
+                f"tel_{device_type}"
+            ].fields
+            del tel_topic.metadata
+            config = epm.make_data_client_config(
+                epm.SnmpDataClient,
+                host="localhost",
+                device_name="TestDevice",
+                device_type=device_type,
+                poll_interval=0.1,
+                snmp_transport="blocking",
+            )
+            data_client = epm.SnmpDataClient(
+                config=config,
+                topics=types.SimpleNamespace(**{f"tel_{device_type}": tel_topic}),
+                log=logging.getLogger(),
+                simulation_mode=1,
+            )
+            await data_client.setup_reading()
+            data_clients.append(data_client)
+
+        assert data_clients[0].snmp_engine is not None
+        assert data_clients[1].snmp_engine is not None
+        assert data_clients[0].snmp_engine is not data_clients[1].snmp_engine
+        assert data_clients[0].community_data is data_clients[1].community_data
+        assert snmp_engine_pool.num_engine_borrowers == 2
+        for data_client in data_clients:
+            await data_client.disconnect()
+        assert snmp_engine_pool.num_engine_borrowers == 0
+        assert data_clients[0].snmp_engine is None
@@ -0,0 +1,203 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import time
+import types
+import typing
+import unittest
+from unittest.mock import AsyncMock
+
+from lsst.ts import epm
+from lsst.ts.xml.component_info import ComponentInfo
+
+DEVICE_TYPES = ["pdu", "scheiderPm5xxx", "xups"]
+
+
+class SnmpMultiDataClientTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_snmp_multi_data_client(self) -> None:
+        topics = self.make_topics()
+        devices = [
+            dict(
+                host=f"device{i}.example.com",
+                port=161,
+                device_name=f"Device{i}",
+                device_type=device_type,
+                snmp_community="public",
+            )
+            for i, device_type in enumerate(DEVICE_TYPES + ["pdu"])
+        ]
+        config = self.make_config(devices)
+        multi_data_client = epm.SnmpMultiDataClient(
+            config=config, topics=topics, log=logging.getLogger(), simulation_mode=1
+        )
+        assert list(multi_data_client.data_clients) == [
+            device["device_name"] for device in devices
+        ]
+        for data_client in multi_data_client.data_clients.values():
+            assert data_client.snmp_transport is multi_data_client.snmp_transport
+
+        await multi_data_client.setup_reading()
+        await multi_data_client.read_data()
+
+        # Each device publishes its own telemetry.
+        assert topics.tel_pdu.set_write.call_count == 2
+        assert topics.tel_scheiderPm5xxx.set_write.call_count == 1
+        assert topics.tel_xups.set_write.call_count == 1
+        for call in topics.tel_pdu.set_write.call_args_list:
+            assert call.kwargs["systemDescription"] == epm.SIMULATED_SYS_DESCR
+
+        # The devices are polled with the deadline of the multi device poll.
+        polled_data_client = multi_data_client.data_clients["Device1"]
+        assert polled_data_client.poll_deadline is not None
+        assert (
+            polled_data_client.poll_deadline
+            == multi_data_client.poll_scheduler.next_tick_time
+        )
+
+        # A device that fails doesn't keep the others from being published.
+        failing_data_client = multi_data_client.data_clients["Device0"]
+        failing_data_client.poll = AsyncMock(side_effect=RuntimeError("Failed"))
+        await multi_data_client.read_data()
+        assert topics.tel_pdu.set_write.call_count == 3
+        assert topics.tel_xups.set_write.call_count == 2
+
+        # Neither does a device that doesn't respond within a poll interval,
+        # which is recorded as a failure.
+        async def hanging_poll(deadline: float | None = None) -> None:
+            failing_data_client.poll_responded = False
+            await asyncio.sleep(10)
+
+        failing_data_client.poll = hanging_poll
+        start_time = time.monotonic()
+        await multi_data_client.read_data()
+        assert time.monotonic() - start_time < 2 * config.poll_interval
+        assert topics.tel_pdu.set_write.call_count == 4
+        assert topics.tel_xups.set_write.call_count == 3
+        assert failing_data_client.circuit_breaker.num_failures == 1
+
+        timing_statistics = multi_data_client.get_timing_statistics()
+        assert list(timing_statistics) == list(multi_data_client.data_clients)
+        assert timing_statistics["Device1"]["poll"]["count"] == 3
+        assert (
+            timing_statistics["Device1"]["schedule"]["count"]
+            == multi_data_client.poll_scheduler.num_ticks
+        )
+
+        await multi_data_client.disconnect()
+        assert not multi_data_client.snmp_transport.connected
+
+    async def test_slow_walk(self) -> None:
+        snmp_agent_simulator = epm.SnmpAgentSimulator(
+            log=logging.getLogger(), device_type="xups", latency=0.002
+        )
+        await snmp_agent_simulator.start()
+        topics = self.make_topics()
+        config = self.make_config(
+            [
+                dict(
+                    host=snmp_agent_simulator.address[0],
+                    port=snmp_agent_simulator.address[1],
+                    device_name="Device",
+                    device_type="xups",
+                )
+            ]
+        )
+        config.poll_interval = 0.02
+        config.walk_mode = "getnext"
+        multi_data_client = epm.SnmpMultiDataClient(
+            config=config, topics=topics, log=logging.getLogger()
+        )
+        data_client = multi_data_client.data_clients["Device"]
+        try:
+            await multi_data_client.setup_reading()
+
+            # A device that responds, but that takes more than a poll interval
+            # to be walked, is walked over several polls without failures.
+            data_client.get_oids = None
+            for _ in range(100):
+                await multi_data_client.read_data()
+                if data_client.get_oids is not None:
+                    break
+            assert data_client.get_oids is not None
+            assert data_client.num_walk_resumes > 0
+            assert data_client.circuit_breaker.num_failures == 0
+        finally:
+            await multi_data_client.disconnect()
+            snmp_agent_simulator.close()
+
+    async def test_duplicate_device_names(self) -> None:
+        device = dict(
+            host="localhost",
+            port=161,
+            device_name="Device",
+            device_type="pdu",
+            snmp_community="public",
+        )
+        with self.assertRaises(ValueError):
+            epm.SnmpMultiDataClient(
+                config=self.make_config([device, device]),
+                topics=self.make_topics(),
+                log=logging.getLogger(),
+                simulation_mode=1,
+            )
+
+    def make_config(
+        self, devices: list[dict[str, typing.Any]]
+    ) -> types.SimpleNamespace:
+        """Make the configuration of a multi device data client.
+
+        Parameters
+        ----------
+        devices : `list`[`dict`[`str`, `typing.Any`]]
+            The configuration of the devices.
+
+        Returns
+        -------
+        types.SimpleNamespace
+            The configuration.
+        """
+        return epm.make_data_client_config(
+            epm.SnmpMultiDataClient,
+            poll_interval=0.1,
+            max_outstanding_requests=10,
+            devices=devices,
+        )
+
+    def make_topics(self) -> types.SimpleNamespace:
+        """Make the telemetry topics of all device types.
+
+        Returns
+        -------
+        types.SimpleNamespace
+            The telemetry topics.
+        """
+        component_info = ComponentInfo(name="EPM", topic_subname="")
+        topics = types.SimpleNamespace()
+        for device_type in DEVICE_TYPES:
+            tel_topic = AsyncMock()
+            tel_topic.topic_info.fields = component_info.topics[
+                f"tel_{device_type}"
+            ].fields
+            del tel_topic.metadata
+            setattr(topics, f"tel_{device_type}", tel_topic)
+        return topics
@@ -0,0 +1,133 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import logging
+import unittest
+from unittest.mock import patch
+
+from lsst.ts import epm
+from pysnmp.proto.rfc1902 import OctetString
+
+DEVICE_TYPES = ["pdu", "scheiderPm5xxx", "xups"]
+
+
+class SnmpServerSimulatorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_seed(self) -> None:
+        for device_type in DEVICE_TYPES:
+            with self.subTest(device_type=device_type):
+                snmp_server_simulators = [
+                    epm.SnmpServerSimulator(log=logging.getLogger(), seed=seed)
+                    for seed in (1, 1, 2)
+                ]
+                walks = [
+                    await self.walk(snmp_server_simulator, device_type)
+                    for snmp_server_simulator in snmp_server_simulators
+                ]
+                assert len(walks[0]) > 0
+                assert walks[0] == walks[1]
+                assert walks[0] != walks[2]
+                assert [oid for oid, _ in walks[0]] == [oid for oid, _ in walks[2]]
+
+    async def test_replay(self) -> None:
+        replay_length = 3
+        snmp_server_simulator = epm.SnmpServerSimulator(
+            log=logging.getLogger(), replay_length=replay_length
+        )
+        walks = [
+            await self.walk(snmp_server_simulator, "xups")
+            for _ in range(2 * replay_length)
+        ]
+        assert walks[:replay_length] == walks[replay_length:]
+        assert walks[0] != walks[1]
+
+        # GET requests replay the values of the same OIDs.
+        oids = [oid for oid, _ in walks[0]]
+        response = await snmp_server_simulator.get(
+            ("localhost", 161), "public", 1, oids
+        )
+        values = [var_bind[1].prettyPrint() for var_bind in response[3]]
+        assert values == [value for _, value in walks[0]]
+
+    async def test_get_var_binds(self) -> None:
+        snmp_server_simulator = epm.SnmpServerSimulator(
+            log=logging.getLogger(), table_size=4
+        )
+        mib_tree = snmp_server_simulator.mib_tree_holder.mib_tree
+        instance_oids = snmp_server_simulator.get_instance_oids(mib_tree["pdu"].oid)
+        assert instance_oids == sorted(instance_oids)
+        assert len(instance_oids) == len(set(instance_oids))
+
+        unknown_oid = mib_tree["pdu"].oid + ".123.0"
+        var_binds = snmp_server_simulator.get_var_binds(
+            [mib_tree["sysDescr"].oid + ".0", unknown_oid, instance_oids[0]]
+        )
+        assert var_binds[0][1] == OctetString(epm.SIMULATED_SYS_DESCR)
+        assert str(var_binds[1][0]) == unknown_oid
+        assert var_binds[1][1].__class__.__name__ == "NoSuchObject"
+        assert var_binds[2][0].asTuple() == instance_oids[0]
+
+        # Each table has the configured number of rows.
+        mib_tree_holder = snmp_server_simulator.mib_tree_holder
+        num_rows = collections.Counter(
+            oid[:-1]
+            for oid in instance_oids
+            if mib_tree_holder.oid_index[oid[:-1]].parent.index
+        )
+        assert len(num_rows) > 0
+        assert set(num_rows.values()) == {4}
+
+    async def test_single_device_type(self) -> None:
+        # A simulator only needs the MIB files of its own device type.
+        with patch("lsst.ts.epm.mib_tree_holder._shared_mib_tree_holder", None):
+            snmp_server_simulator = epm.SnmpServerSimulator(
+                log=logging.getLogger(), device_type="xups"
+            )
+            assert "pdu" not in snmp_server_simulator.mib_tree_holder.mib_tree
+            assert len(await self.walk(snmp_server_simulator, "xups")) > 0
+
+    async def walk(
+        self, snmp_server_simulator: epm.SnmpServerSimulator, device_type: str
+    ) -> list[tuple[tuple[int, ...], str]]:
+        """Walk the subtree of a device type.
+
+        Parameters
+        ----------
+        snmp_server_simulator : `epm.SnmpServerSimulator`
+            The simulator to walk.
+        device_type : `str`
+            The type of SNMP device.
+
+        Returns
+        -------
+        list[tuple[tuple[int, ...], str]]
+            The OID and the printed value of each var bind.
+        """
+        return [
+            (var_bind[0].asTuple(), var_bind[1].prettyPrint())
+            async for response in snmp_server_simulator.walk(
+                ("localhost", 161),
+                "public",
+                0,
+                snmp_server_simulator.mib_tree_holder.mib_tree[device_type].oid,
+            )
+            for var_bind in response[3]
+        ]
@@ -0,0 +1,138 @@
+# This file is part of ts_epm.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the Vera Rubin Observatory
+# Project (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import socket
+import unittest
+
+from lsst.ts import epm
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api
+
+
+class SnmpTransportTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_timeout(self) -> None:
+        # Reserve a local port that nobody listens on.
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            address = sock.getsockname()
+
+        snmp_transport = epm.SnmpTransport(
+            log=logging.getLogger(), timeout=0.1, retries=1
+        )
+        await snmp_transport.connect()
+        try:
+            error_indication, _, _, var_binds = await snmp_transport.get_cmd(
+                address, "public", 0, ["1.3.6.1.2.1.1.1.0"]
+            )
+            assert error_indication == epm.TIMEOUT_ERROR_INDICATION
+            assert var_binds == []
+            assert len(snmp_transport.pending_requests) == 0
+            # The address is resolved again after a timeout.
+            assert address not in snmp_transport.resolved_addresses
+
+            responses = [
+                response
+                async for response in snmp_transport.walk(
+                    address, "public", 0, "1.3.6.1.2"
+                )
+            ]
+            assert len(responses) == 1
+            assert responses[0][0] == epm.TIMEOUT_ERROR_INDICATION
+
+            await snmp_transport._resolve(("localhost", 161))
+            assert ("localhost", 161) in snmp_transport.resolved_addresses
+        finally:
+            snmp_transport.close()
+        assert not snmp_transport.connected
+        assert not snmp_transport.resolved_addresses
+
+    async def test_max_outstanding_requests(self) -> None:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            address = sock.getsockname()
+
+        timeout = 0.1
+        snmp_transport = epm.SnmpTransport(
+            log=logging.getLogger(),
+            timeout=timeout,
+            retries=0,
+            max_outstanding_requests=1,
+        )
+        await snmp_transport.connect()
+        try:
+            # The second request only is sent after the first one timed out.
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
+            responses = await asyncio.gather(
+                *[
+                    snmp_transport.get_cmd(address, "public", 0, ["1.3.6.1.2.1.1.1.0"])
+                    for _ in range(2)
+                ]
+            )
+            assert loop.time() - start_time >= 2 * timeout
+            for response in responses:
+                assert response[0] == epm.TIMEOUT_ERROR_INDICATION
+        finally:
+            snmp_transport.close()
+
+    async def test_response_address(self) -> None:
+        # An agent that answers from the wrong port first and then from the
+        # address the request was sent to.
+        loop = asyncio.get_running_loop()
+        with socket.socket(
+            socket.AF_INET, socket.SOCK_DGRAM
+        ) as agent_sock, socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as spoof_sock:
+            agent_sock.bind(("127.0.0.1", 0))
+            agent_sock.setblocking(False)
+            spoof_sock.bind(("127.0.0.1", 0))
+            spoof_sock.setblocking(False)
+
+            async def answer() -> None:
+                data, addr = await loop.sock_recvfrom(agent_sock, 65535)
+                p_mod = api.protoModules[int(api.decodeMessageVersion(data))]
+                req_msg, _ = decoder.decode(data, asn1Spec=p_mod.Message())
+                for sock, value in [(spoof_sock, "Spoofed"), (agent_sock, "Test")]:
+                    rsp_msg = p_mod.apiMessage.getResponse(req_msg)
+                    p_mod.apiPDU.setVarBinds(
+                        p_mod.apiMessage.getPDU(rsp_msg),
+                        [("1.3.6.1.2.1.1.1.0", p_mod.OctetString(value))],
+                    )
+                    await loop.sock_sendto(sock, encoder.encode(rsp_msg), addr)
+                    await asyncio.sleep(0.05)
+
+            snmp_transport = epm.SnmpTransport(
+                log=logging.getLogger(), timeout=1.0, retries=0
+            )
+            await snmp_transport.connect()
+            try:
+                response, _ = await asyncio.gather(
+                    snmp_transport.get_cmd(
+                        agent_sock.getsockname(), "public", 0, ["1.3.6.1.2.1.1.1.0"]
+                    ),
+                    answer(),
+                )
+            finally:
+                snmp_transport.close()
+        error_indication, _, _, var_binds = response
+        assert error_indication is None
+        assert str(var_binds[0][1]) == "Test"